@@ -0,0 +1,77 @@
+"""
+Times the bucketed chart renderer against scanning every sample for every row.
+
+    python bench/bench_chart.py [--rows 30] [--samples 1440] [--width 80] [--repeat 50]
+
+Reports milliseconds per chart for a profile of --samples evenly spaced samples,
+rendered at full width and downsampled to --width columns, and for the row scan
+the chart used before, which tests every sample against every row.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uplook.solar.chart import get_solar_chart  # noqa: E402
+from uplook.solar.profile import SolarProfile  # noqa: E402
+
+
+def row_scan_chart(daily_profile, chart_rows, data_char, current_char, current_hour):
+    """The previous renderer: rows x samples, with a branch per cell."""
+    ceiling = math.ceil(max(p['angle_deg'] for p in daily_profile) / 10.0) * 10
+    height_interval = ceiling / chart_rows
+    lines = []
+    for row_index in range(chart_rows):
+        angle_low = (chart_rows - 1 - row_index) * height_interval
+        angle_high = angle_low + height_interval
+        row_content = []
+        for hour_data in daily_profile:
+            if angle_low < hour_data['angle_deg'] <= angle_high:
+                row_content.append(current_char if hour_data['hour'] == current_hour else data_char)
+            else:
+                row_content.append(' ')
+        lines.append(' '.join(row_content))
+    return lines
+
+
+def timed(repeat, render):
+    render()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render()
+    return round((time.perf_counter() - started) / repeat * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=30)
+    parser.add_argument("--samples", type=int, default=1440)
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    minutes = [i * 1440 // args.samples for i in range(args.samples)]
+    profile = SolarProfile(minutes, [60 * math.sin(math.pi * (m - 360) / 720) for m in minutes])
+
+    row_scan_ms = timed(args.repeat, lambda: row_scan_chart(profile, args.rows, ".", "O", 12))
+    full_ms = timed(args.repeat, lambda: get_solar_chart(profile, args.rows, ".", "O", current_hour=12))
+    narrow_ms = timed(args.repeat, lambda: get_solar_chart(profile, args.rows, ".", "O", current_hour=12, width=args.width))
+
+    results = {
+        "rows": args.rows,
+        "samples": args.samples,
+        "width": args.width,
+        "row_scan_ms": row_scan_ms,
+        "bucketed_full_width_ms": full_ms,
+        "bucketed_downsampled_ms": narrow_ms,
+        "speedup_full_width": round(row_scan_ms / full_ms, 1),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compares the accuracy and speed of the solar profile engines against pyephem.
+
+    python bench/bench_engines.py [--samples 20000] [--days 50]
+
+Accuracy: elevations at random times from 1900 to 2100 and random longitudes, by
+latitude band (including both polar regions) and by 50-year date band, reported as
+the largest and RMS difference from pyephem in degrees, with the Sun above -1° and
+below it. Speed: milliseconds to build one site's daily profile, hourly and
+per-minute, for each engine.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ephem  # noqa: E402
+
+from uplook.solar.analytic import solar_elevation  # noqa: E402
+from uplook.solar.context import SolarDay  # noqa: E402
+
+# Julian date of 1900-01-01 00:00 UTC, and the length of the range in days
+_START_JD = 2415020.5
+_RANGE_DAYS = 73049
+# Offset between Julian dates and pyephem dates (days since 1899-12-31 12:00)
+_EPHEM_JD = 2415020.0
+
+_LATITUDE_BANDS = [(-90, -66.5), (-66.5, -23.5), (-23.5, 23.5), (23.5, 66.5), (66.5, 90)]
+_DATE_BANDS = [(1900, 1950), (1950, 2000), (2000, 2050), (2050, 2100)]
+
+
+def engine_elevations(engine, jds, lons, lats):
+    if engine == "noaa":
+        return [solar_elevation(jd, lon, lat) for jd, lon, lat in zip(jds, lons, lats)]
+    import numpy as np
+    from uplook.solar.vectorized import solar_elevation_array
+    timestamps = np.datetime64("1970-01-01", "us") + np.round(
+        (np.array(jds) - 2440587.5) * 86400e6
+    ).astype(np.int64) * np.timedelta64(1, "us")
+    return solar_elevation_array(timestamps, np.array(lons), np.array(lats)).tolist()
+
+
+def errors_by_band(cases, errors, key, bands):
+    results = {}
+    for low, high in bands:
+        band = {}
+        for horizon, above in (("above_-1", True), ("below_-1", False)):
+            selected = [
+                error for case, error in zip(cases, errors)
+                if low <= key(case) < high and (case[3] >= -1) == above
+            ]
+            if selected:
+                band[horizon] = {
+                    "max": round(max(selected), 4),
+                    "rms": round(math.sqrt(sum(e * e for e in selected) / len(selected)), 4),
+                }
+        results[f"{low}..{high}"] = band
+    return results
+
+
+def accuracy(engines, samples):
+    random.seed(1)
+    observer, sun = ephem.Observer(), ephem.Sun()
+    cases = []
+    for _ in range(samples):
+        jd = _START_JD + random.uniform(0, _RANGE_DAYS)
+        lon, lat = random.uniform(-180, 180), random.uniform(-90, 90)
+        observer.lon, observer.lat = math.radians(lon), math.radians(lat)
+        observer.date = jd - _EPHEM_JD
+        sun.compute(observer)
+        cases.append((jd, lon, lat, math.degrees(sun.alt)))
+
+    jds, lons, lats, expected = zip(*cases)
+    results = {}
+    for engine in engines:
+        errors = [abs(a - b) for a, b in zip(engine_elevations(engine, jds, lons, lats), expected)]
+        results[engine] = {
+            "by_latitude": errors_by_band(cases, errors, lambda case: case[2], _LATITUDE_BANDS),
+            "by_year": errors_by_band(
+                cases, errors, lambda case: 2000 + (case[0] - 2451545.0) / 365.25, _DATE_BANDS
+            ),
+        }
+    return results
+
+
+def speed(engines, days):
+    start = date(2025, 1, 1)
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(days)]
+    results = {}
+    for engine in engines:
+        results[engine] = {}
+        for name, interval in (("hourly_ms", 60), ("per_minute_ms", 1)):
+            started = time.perf_counter()
+            for day in dates:
+                SolarDay(-0.12, 51.51, day, engine=engine, interval=interval).profile
+            results[engine][name] = round((time.perf_counter() - started) * 1000 / days, 3)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=50)
+    args = parser.parse_args()
+
+    results = {
+        "accuracy_deg": accuracy(["noaa", "numpy"], args.samples),
+        "speed": speed(["ephem", "noaa", "numpy"], args.days),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
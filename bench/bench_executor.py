@@ -0,0 +1,111 @@
+"""
+Measures how the chunked site and date range executor scales with worker processes.
+
+    python bench/bench_executor.py [--sites 200] [--days 365] [--workers 1,2,4]
+
+Runs calculate_sites_range on the same job with each number of workers (by default
+1 up to the CPU count, doubling), each in a fresh process so that its peak memory
+is its own (that of the main process), and reports the time, the (site, date) pairs per second, the speedup
+over one worker and the scaling efficiency (speedup / workers). The serial figure
+is the plain loop over sites the command line ran before, for the executor's own
+overhead. Efficiency can only be measured up to the number of cores: beyond that,
+workers share them.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from uplook.solar.batch import calculate_sites_range  # noqa: E402
+from uplook.solar.daterange import calculate_solar_events_range  # noqa: E402
+
+START = "2025-01-01"
+
+
+def _sites(count):
+    """A fixed spread of sites from 60°S to 60°N, the same on every run."""
+    return [(-180 + (i * 137.508) % 360, -60 + 120 * i / count) for i in range(count)]
+
+
+def _end(days):
+    return (date.fromisoformat(START) + timedelta(days=days - 1)).isoformat()
+
+
+def run_one(sites, days, workers):
+    """
+    Runs the job once in this process.
+
+    Returns:
+        dict: "seconds" and the peak resident memory "max_rss_mb"
+    """
+    started = time.perf_counter()
+    if workers == 0:
+        for lon, lat in sites:
+            for _ in calculate_solar_events_range(lon, lat, START, _end(days)):
+                pass
+    else:
+        for _ in calculate_sites_range(sites, START, _end(days), workers=workers):
+            pass
+    seconds = time.perf_counter() - started
+    return {"seconds": seconds, "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)}
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sites", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--workers", default=",".join(map(str, counts)), help="Worker counts to time, comma separated")
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single is not None:
+        print(json.dumps(run_one(_sites(args.sites), args.days, args.single)))
+        return
+
+    def measure(workers):
+        result = subprocess.run(
+            [sys.executable, __file__, "--sites", str(args.sites), "--days", str(args.days), "--single", str(workers)],
+            check=True, stdout=subprocess.PIPE, text=True,
+        )
+        return json.loads(result.stdout)
+
+    pairs = args.sites * args.days
+    serial = measure(0)
+    results = {}
+    for workers in map(int, args.workers.split(",")):
+        result = measure(workers)
+        if not results:
+            one = result["seconds"]
+        speedup = one / result["seconds"]
+        results[workers] = {
+            "seconds": round(result["seconds"], 3),
+            "pairs_per_second": round(pairs / result["seconds"]),
+            "speedup": round(speedup, 2),
+            "efficiency": round(speedup / workers, 2),
+            "max_rss_mb": result["max_rss_mb"],
+        }
+    print(json.dumps({
+        "cpus": cpus,
+        "pairs": pairs,
+        "serial_seconds": round(serial["seconds"], 3),
+        "serial_max_rss_mb": serial["max_rss_mb"],
+        "workers": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
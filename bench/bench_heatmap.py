@@ -0,0 +1,55 @@
+"""
+Times the year heatmap against building it from per-day pyephem profiles.
+
+    python bench/bench_heatmap.py [--interval 60] [--runs 10] [--days 10] [--budget-ms 500]
+
+Reports milliseconds per rendered heatmap at the given interval, and the cost of
+calculate_daily_solar_profile, timed over --days days and scaled up to the year.
+Exits with status 1 if the heatmap takes longer than --budget-ms.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uplook.solar.elevation import calculate_daily_solar_profile  # noqa: E402
+from uplook.solar.heatmap import get_solar_heatmap  # noqa: E402
+
+LON, LAT, YEAR = -0.12, 51.51, 2025
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--interval", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=500.0)
+    args = parser.parse_args()
+
+    get_solar_heatmap(LON, LAT, YEAR, args.interval)
+    started = time.perf_counter()
+    for _ in range(args.runs):
+        get_solar_heatmap(LON, LAT, YEAR, args.interval)
+    heatmap_ms = (time.perf_counter() - started) / args.runs * 1000
+
+    started = time.perf_counter()
+    for day in range(1, args.days + 1):
+        calculate_daily_solar_profile(LON, LAT, f"{YEAR}-01-{day:02d}", args.interval)
+    per_day_s = (time.perf_counter() - started) / args.days
+
+    print(json.dumps({
+        "interval": args.interval,
+        "heatmap_ms": round(heatmap_ms, 2),
+        "per_day_profiles_estimate_ms": round(per_day_s * 365 * 1000, 1),
+        "budget_ms": args.budget_ms,
+    }, indent=2))
+    if heatmap_ms > args.budget_ms:
+        print(f"Heatmap took {heatmap_ms:.1f}ms, over the {args.budget_ms:g}ms budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
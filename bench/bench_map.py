@@ -0,0 +1,57 @@
+"""
+Times the solar elevation map against building it from per-point pyephem calls.
+
+    python bench/bench_map.py [--resolution 1] [--frames 50] [--points 2000]
+
+Reports milliseconds per rendered map (and the refresh rate that allows) at the
+given resolution, and the per-point calculate_solar_elevation cost, timed over
+--points cells and scaled up to the whole grid.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uplook.solar.elevation import calculate_solar_elevation  # noqa: E402
+from uplook.solar.worldmap import get_solar_map, solar_elevation_grid  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resolution", type=float, default=1.0)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--points", type=int, default=2000)
+    args = parser.parse_args()
+
+    date_str, time_str = "2025-06-21", "12:00"
+    get_solar_map(date_str, time_str, args.resolution)
+
+    started = time.perf_counter()
+    for _ in range(args.frames):
+        lines = get_solar_map(date_str, time_str, args.resolution)
+    frame_s = (time.perf_counter() - started) / args.frames
+
+    longitudes, latitudes, _ = solar_elevation_grid(date_str, time_str, args.resolution, 2 * args.resolution)
+    cells = [(lon, lat) for lat in latitudes for lon in longitudes]
+    sample = cells[:: max(1, len(cells) // args.points)]
+    started = time.perf_counter()
+    for lon, lat in sample:
+        calculate_solar_elevation(date_str, time_str, float(lon), float(lat))
+    per_point_s = (time.perf_counter() - started) / len(sample)
+
+    results = {
+        "resolution_deg": args.resolution,
+        "cells": len(cells),
+        "map_lines": len(lines),
+        "map_ms": round(frame_s * 1000, 2),
+        "frames_per_s": round(1 / frame_s, 1),
+        "per_point_estimate_ms": round(per_point_s * len(cells) * 1000, 1),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Replays repeated-query traces with and without the in-memory result cache.
+
+    python bench/bench_memo.py [--queries 5000] [--precision 4] [--seed 1]
+
+Each trace is a fixed, seeded sequence of calls to calculate_daily_solar_summary,
+calculate_daily_solar_profile and get_moon_phase, modelled on real use:
+
+- service: site popularity follows a Zipf distribution over 500 places, each
+  query's coordinates jittered in the fifth decimal place (as different clients
+  round them), over the last week; 60% summaries, 30% profiles, 10% moon phases
+- dashboard: 20 fixed sites polled in turn for today and tomorrow, profiles and
+  summaries alternately
+- batch: a nightly job of 2,000 sites in which a quarter are repeats or near
+  repeats of others, run for three dates
+
+Every trace is run uncached, then through a MemoryCache with entry limits of
+100% and 10% of the trace's distinct keys, reporting the time per query, the
+speedup, the hit rate and the cache's size.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from uplook.cache import MemoryCache  # noqa: E402
+from uplook.lunar.phase import get_moon_phase  # noqa: E402
+from uplook.solar.elevation import calculate_daily_solar_profile, calculate_daily_solar_summary  # noqa: E402
+
+FUNCTIONS = {
+    "summary": calculate_daily_solar_summary,
+    "profile": calculate_daily_solar_profile,
+    "phase": get_moon_phase,
+}
+
+DATES = [f"2025-11-{day:02d}" for day in range(1, 8)]
+
+
+def _places(count, rng):
+    return [(round(rng.uniform(-180, 180), 4), round(rng.uniform(-60, 60), 4)) for _ in range(count)]
+
+
+def _jitter(value, rng):
+    return value + rng.uniform(-3e-5, 3e-5)
+
+
+def service_trace(queries, rng):
+    places = _places(500, rng)
+    weights = [1 / rank ** 1.1 for rank in range(1, len(places) + 1)]
+    trace = []
+    for (lon, lat), date_str, roll in zip(
+        rng.choices(places, weights, k=queries), rng.choices(DATES, k=queries), (rng.random() for _ in range(queries))
+    ):
+        if roll < 0.1:
+            trace.append(("phase", (date_str,)))
+        else:
+            trace.append(("summary" if roll < 0.7 else "profile", (_jitter(lon, rng), _jitter(lat, rng), date_str)))
+    return trace
+
+
+def dashboard_trace(queries, rng):
+    places = _places(20, rng)
+    trace = []
+    for i in range(queries):
+        lon, lat = places[i % len(places)]
+        kind = "profile" if (i // len(places)) % 2 else "summary"
+        trace.append((kind, (lon, lat, DATES[(i // 500) % 2])))
+    return trace
+
+
+def batch_trace(queries, rng):
+    places = _places(1500, rng)
+    sites = places + [(_jitter(lon, rng), _jitter(lat, rng)) for lon, lat in rng.choices(places, k=500)]
+    rng.shuffle(sites)
+    trace = [("summary", (lon, lat, date_str)) for date_str in DATES[:3] for lon, lat in sites]
+    return trace[:queries]
+
+
+TRACES = {"service": service_trace, "dashboard": dashboard_trace, "batch": batch_trace}
+
+
+def replay(trace, cache=None):
+    """
+    Runs every call in trace, through cache if given.
+
+    Returns:
+        float: Seconds taken
+    """
+    functions = FUNCTIONS if cache is None else {kind: cache.memoize(kind, f) for kind, f in FUNCTIONS.items()}
+    started = time.perf_counter()
+    for kind, args in trace:
+        functions[kind](*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--precision", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {}
+    for name, build in TRACES.items():
+        trace = build(args.queries, random.Random(args.seed))
+        distinct = len({MemoryCache(precision=args.precision)._key(kind, call) for kind, call in trace})
+        uncached = replay(trace)
+        result = {"queries": len(trace), "distinct_keys": distinct, "uncached_us": round(uncached / len(trace) * 1e6, 1)}
+        for label, max_entries in (("full", distinct), ("tenth", max(1, distinct // 10))):
+            cache = MemoryCache(max_entries=max_entries, precision=args.precision)
+            seconds = replay(trace, cache)
+            stats = cache.stats()
+            result[f"cached_{label}"] = {
+                "max_entries": max_entries,
+                "us": round(seconds / len(trace) * 1e6, 1),
+                "speedup": round(uncached / seconds, 1),
+                "hit_rate": round(stats["hit_rate"], 3),
+                "entries": stats["entries"],
+                "kib": round(stats["bytes"] / 1024),
+            }
+        results[name] = result
+    print(json.dumps({"precision": args.precision, "traces": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
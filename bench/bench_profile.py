@@ -0,0 +1,77 @@
+"""
+Compares the memory and build time of compact SolarProfile profiles against the list
+of dicts the profile functions used to return.
+
+    python bench/bench_profile.py [--days 30] [--interval 1]
+
+Builds per-minute (by default) profiles for a run of days at one site, and reports
+bytes per sample (from tracemalloc) and build time for each representation.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ephem  # noqa: E402
+
+from uplook.solar.elevation import create_observer, calculate_observer_profile  # noqa: E402
+from uplook.solar.profile import SolarProfile  # noqa: E402
+
+
+def measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    profiles = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    samples = sum(len(profile) for profile in profiles)
+    return {
+        "samples": samples,
+        "bytes_per_sample": size / samples,
+        "build_s": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--interval", type=int, default=1)
+    args = parser.parse_args()
+
+    start = date(2025, 1, 1)
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(args.days)]
+    # Compute once, so both representations are built from the same samples and only
+    # the cost of building and holding them is compared
+    observer, sun = create_observer(-0.12, 51.51), ephem.Sun()
+    computed = [calculate_observer_profile(observer, sun, ephem.Date(day), args.interval) for day in dates]
+
+    def build_dicts():
+        return [
+            [
+                {"hour": minute // 60, "time": f"{minute // 60:02d}:{minute % 60:02d}", "angle_deg": round(angle, 2)}
+                for minute, angle in zip(profile.minutes, profile.angles)
+            ]
+            for profile in computed
+        ]
+
+    def build_profiles():
+        return [
+            SolarProfile(profile.minutes.tolist(), [round(angle, 2) for angle in profile.angles])
+            for profile in computed
+        ]
+
+    results = {
+        "dicts": measure(build_dicts),
+        "solar_profile": measure(build_profiles),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares the throughput of the vectorized sunrise/sunset solver against the per-site
+pyephem loop.
+
+    python bench/bench_riseset.py [--sites 100000] [--loop-sites 100000] [--date 2025-11-01]
+
+Generates random sites over the whole globe (so a share of them have polar day or
+night), solves them all with solar_events_array, and times calculate_observer_events
+one site at a time over the first --loop-sites of them, as the batch workers do. Also
+reports how many sites the two disagree on about having events, and the largest
+difference in event times.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ephem  # noqa: E402
+import numpy as np  # noqa: E402
+
+from uplook.solar.elevation import create_observer, calculate_observer_events  # noqa: E402
+from uplook.solar.riseset import solar_events_array  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sites", type=int, default=100000)
+    parser.add_argument("--loop-sites", type=int, default=100000)
+    parser.add_argument("--date", default="2025-11-01")
+    args = parser.parse_args()
+
+    random.seed(1)
+    lons = np.array([random.uniform(-180, 180) for _ in range(args.sites)])
+    # Uniform over the sphere, rather than over latitude
+    lats = np.degrees(np.arcsin(np.array([random.uniform(-1, 1) for _ in range(args.sites)])))
+
+    started = time.perf_counter()
+    sunrise, zenith, sunset = solar_events_array(lons, lats, args.date)
+    vectorized_s = time.perf_counter() - started
+
+    looped = min(args.loop_sites, args.sites)
+    sun, day = ephem.Sun(), ephem.Date(args.date.replace("-", "/"))
+    started = time.perf_counter()
+    events = [calculate_observer_events(create_observer(lons[i], lats[i]), sun, day) for i in range(looped)]
+    loop_s = time.perf_counter() - started
+
+    disagreements = 0
+    largest_s = 0.0
+    for i, expected in enumerate(events):
+        if bool(expected) == math.isnan(sunrise[i]):
+            disagreements += 1
+        elif expected:
+            ours = (sunrise[i], zenith[i], sunset[i])
+            largest_s = max(largest_s, *(abs(a - b) * 86400 for a, b in zip(ours, expected)))
+
+    results = {
+        "sites": args.sites,
+        "without_events": int(np.isnan(sunrise).sum()),
+        "vectorized_s": round(vectorized_s, 3),
+        "vectorized_sites_per_s": round(args.sites / vectorized_s),
+        "loop_sites": looped,
+        "loop_s": round(loop_s, 3),
+        "loop_sites_per_s": round(looped / loop_s),
+        "speedup": round((args.sites / vectorized_s) / (looped / loop_s), 1),
+        "disagreements": disagreements,
+        "largest_difference_s": round(largest_s, 1),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compares per-query latency of the CLI against the HTTP service.
+
+    python bench/bench_serve.py [--queries 200] [--cli-queries 20]
+
+Starts `uplook.py serve` on a free port, sends the same solar summary query over one
+keep-alive connection, and runs the equivalent CLI command as a fresh process.
+"""
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+UPLOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uplook", "uplook.py")
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_cli(queries):
+    samples = []
+    for i in range(queries):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, UPLOOK, "solar", "--lon", "-0.12", "--lat", str(51.0 + i / 1000), "--date", "2025-11-01"],
+            check=True, stdout=subprocess.DEVNULL
+        )
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def time_service(queries):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, UPLOOK, "serve", "--port", str(port), "--workers", "2"],
+        stderr=subprocess.PIPE
+    )
+    try:
+        server.stderr.readline()  # "Serving on ..." once the socket is listening
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        samples = []
+        for i in range(queries):
+            started = time.perf_counter()
+            connection.request("GET", f"/solar?lon=-0.12&lat={51.0 + i / 1000}&date=2025-11-01")
+            response = connection.getresponse()
+            response.read()
+            assert response.status == 200
+            samples.append(time.perf_counter() - started)
+        return samples
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--cli-queries", type=int, default=20)
+    args = parser.parse_args()
+
+    for name, samples in (("cli", time_cli(args.cli_queries)), ("serve", time_service(args.queries))):
+        result = percentiles(samples)
+        print(f"{name:<6} p50 {result['p50_ms']:8.2f} ms   p99 {result['p99_ms']:8.2f} ms   ({len(samples)} queries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Times CLI startup, and checks import time against a budget.
+
+    python bench/bench_startup.py [--runs 20] [--budget-ms 60]
+
+Runs each command --runs times as a fresh process, reporting the median wall time
+and, from `python -X importtime`, the median total import time and the slowest
+top-level imports. Exits with status 1 if the median import time of any command
+is over --budget-ms, so it can guard the cron path (a one-shot lunar summary).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+UPLOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uplook", "uplook.py")
+
+COMMANDS = {
+    "lunar_summary": ["lunar", "--type", "summary", "--date", "2025-11-01"],
+    "solar_summary": ["solar", "--lon", "-0.12", "--lat", "51.51", "--date", "2025-11-01"],
+    "solar_chart": ["solar", "--lon", "-0.12", "--lat", "51.51", "--date", "2025-11-01", "--type", "chart"],
+}
+
+
+def import_times(argv):
+    """
+    Runs the CLI once with -X importtime.
+
+    Returns:
+        dict: Cumulative microseconds of each top-level import (those not made by
+              another module while it was being imported)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", UPLOOK, *argv],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    top_level = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented by two spaces per level
+        if not name[1:].startswith(" "):
+            top_level[name.strip()] = int(cumulative)
+    return top_level
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=60.0)
+    args = parser.parse_args()
+
+    results = {}
+    over_budget = []
+    for name, argv in COMMANDS.items():
+        walls, totals, slowest = [], [], {}
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, UPLOOK, *argv], check=True, stdout=subprocess.DEVNULL)
+            walls.append(time.perf_counter() - started)
+            imports = import_times(argv)
+            totals.append(sum(imports.values()))
+            for module, us in imports.items():
+                slowest.setdefault(module, []).append(us)
+
+        import_ms = statistics.median(totals) / 1000
+        results[name] = {
+            "wall_ms": round(statistics.median(walls) * 1000, 1),
+            "import_ms": round(import_ms, 1),
+            "slowest_imports_ms": {
+                module: round(statistics.median(us) / 1000, 1)
+                for module, us in sorted(slowest.items(), key=lambda item: -statistics.median(item[1]))[:5]
+            },
+        }
+        if import_ms > args.budget_ms:
+            over_budget.append(name)
+
+    print(json.dumps({"budget_ms": args.budget_ms, "commands": results}, indent=2))
+    if over_budget:
+        print(f"Import time over the {args.budget_ms:g}ms budget: {', '.join(over_budget)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
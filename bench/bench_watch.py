@@ -0,0 +1,91 @@
+"""
+Compares the CPU cost of keeping a chart on screen with --watch against redrawing it.
+
+    python bench/bench_watch.py [--interval 60] [--runs 5]
+
+Simulates a day of one refresh a minute, with a fake clock and no sleeping, and
+reports the CPU time and bytes written per refresh for:
+
+- watch: watch_solar_chart, which draws the chart once and then redraws only the
+  cells that change
+- redraw: computing the SolarDay and rendering the summary and chart every minute,
+  in process
+- rerun: running `uplook.py solar --type chart` as a fresh process (timed over
+  --runs runs), as a cron job every minute would
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, UTC
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from uplook.solar.chart import get_solar_chart  # noqa: E402
+from uplook.solar.context import SolarDay  # noqa: E402
+from uplook.solar.summary import get_solar_summary  # noqa: E402
+from uplook.solar.watch import watch_solar_chart  # noqa: E402
+
+UPLOOK = os.path.join(ROOT, "uplook", "uplook.py")
+LON, LAT = -0.12, 51.51
+START = datetime(2025, 11, 1, tzinfo=UTC)
+MINUTES = 24 * 60
+
+
+def bench_watch(interval):
+    times = iter([START + timedelta(minutes=minute) for minute in range(MINUTES)])
+    stream = io.StringIO()
+    started = time.process_time()
+    watch_solar_chart(
+        lambda date_str: SolarDay(LON, LAT, date_str, interval=interval), 5, ".", "O",
+        stream=stream, clock=lambda: next(times), sleep=lambda seconds: None, ticks=MINUTES,
+    )
+    return time.process_time() - started, len(stream.getvalue())
+
+
+def bench_redraw(interval):
+    written = 0
+    started = time.process_time()
+    for minute in range(MINUTES):
+        solar_day = SolarDay(LON, LAT, START.date().isoformat(), interval=interval)
+        lines = [*get_solar_summary(solar_day), *get_solar_chart(solar_day, 5, ".", "O", current_hour=minute // 60)]
+        written += len("\n".join(lines)) + 1
+    return time.process_time() - started, written
+
+
+def bench_rerun(interval, runs):
+    argv = [sys.executable, UPLOOK, "solar", "--lon", str(LON), "--lat", str(LAT), "--type", "chart", "--interval", str(interval)]
+    cpu = []
+    for _ in range(runs):
+        before = os.times()
+        subprocess.run(argv, check=True, stdout=subprocess.DEVNULL)
+        after = os.times()
+        cpu.append(after.children_user + after.children_system - before.children_user - before.children_system)
+    return statistics.median(cpu)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--interval", type=int, default=60)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    watch_cpu, watch_bytes = bench_watch(args.interval)
+    redraw_cpu, redraw_bytes = bench_redraw(args.interval)
+    rerun_cpu = bench_rerun(args.interval, args.runs)
+    print(json.dumps({
+        "interval": args.interval,
+        "refreshes": MINUTES,
+        "watch": {"cpu_us_per_refresh": round(watch_cpu / MINUTES * 1e6, 1), "bytes_per_refresh": round(watch_bytes / MINUTES, 1)},
+        "redraw": {"cpu_us_per_refresh": round(redraw_cpu / MINUTES * 1e6, 1), "bytes_per_refresh": round(redraw_bytes / MINUTES, 1)},
+        "rerun": {"cpu_us_per_refresh": round(rerun_cpu * 1e6, 1)},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
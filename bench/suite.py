@@ -0,0 +1,259 @@
+"""
+Benchmark suite covering every entry point, with baselines and regression checks.
+
+    python bench/suite.py run [--filter PATTERN] [--quick] [--save FILE]
+    python bench/suite.py compare BASELINE [CURRENT] [--threshold 20] [--filter PATTERN]
+
+`run` times each case and prints the results as JSON, or writes them to --save.
+Cases are grouped as 'api' (one call of each public function), 'scaled' (many
+sites, many dates and high resolution workloads) and 'cli' (end-to-end runs of
+uplook.py as a fresh process). Each case is timed over enough loops to take at
+least --min-time seconds, --repeat times, and the fastest per-call time is kept
+as `seconds`, the least noisy figure for comparisons.
+
+`compare` reports the change in each case from BASELINE to CURRENT (a saved run,
+or a new run if not given), and exits with status 1 if any case is slower by more
+than --threshold percent. Timings depend on the machine, so a baseline is only
+meaningful on the machine that recorded it: record one with
+`python bench/suite.py run --save bench/baseline.json` before making changes.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from uplook.lunar.image import get_lunar_phase  # noqa: E402
+from uplook.lunar.phase import build_lunation_table, get_moon_phase  # noqa: E402
+from uplook.solar.batch import calculate_sites  # noqa: E402
+from uplook.solar.chart import get_solar_chart  # noqa: E402
+from uplook.solar.daterange import calculate_solar_summary_range  # noqa: E402
+from uplook.solar.elevation import (  # noqa: E402
+    calculate_daily_solar_profile, calculate_daily_solar_summary, calculate_solar_elevation
+)
+from uplook.solar.table import get_solar_table  # noqa: E402
+
+UPLOOK = os.path.join(ROOT, "uplook", "uplook.py")
+FORMAT_VERSION = 1
+
+DATE = "2025-11-01"
+LON, LAT = -0.12, 51.51
+
+
+def _sites(count):
+    """A fixed spread of sites from 60°S to 60°N, the same on every run."""
+    return [(-180 + (i * 137.508) % 360, -60 + 120 * i / count) for i in range(count)]
+
+
+def _api_cases():
+    profile = calculate_daily_solar_profile(LON, LAT, DATE)
+    return {
+        "calculate_solar_elevation": lambda: calculate_solar_elevation(DATE, "12:00", LON, LAT),
+        "calculate_daily_solar_profile": lambda: calculate_daily_solar_profile(LON, LAT, DATE),
+        "calculate_daily_solar_summary": lambda: calculate_daily_solar_summary(LON, LAT, DATE),
+        "get_moon_phase": lambda: get_moon_phase(DATE),
+        "get_solar_chart": lambda: get_solar_chart(profile, 5, ".", "O", current_hour=12),
+        "get_solar_table": lambda: get_solar_table(profile),
+        "get_lunar_phase": lambda: get_lunar_phase("Waxing Gibbous"),
+    }
+
+
+def _scaled_cases():
+    from uplook.solar.heatmap import get_solar_heatmap
+    from uplook.solar.riseset import solar_events_array
+    from uplook.solar.worldmap import get_solar_map
+
+    sites = _sites(1000)
+    many = _sites(100000)
+    lons, lats = [lon for lon, _ in many], [lat for _, lat in many]
+    minute_profile = calculate_daily_solar_profile(LON, LAT, DATE, interval=1)
+    days = [f"2025-{month:02d}-{day:02d}" for month in range(1, 13) for day in range(1, 29)]
+
+    def lunar_calendar():
+        lunations = build_lunation_table(days[0], days[-1])
+        return [get_moon_phase(day, lunations) for day in days]
+
+    return {
+        "sites_batch_1000": lambda: list(calculate_sites(sites, DATE, workers=1)),
+        "sites_events_array_100k": lambda: solar_events_array(lons, lats, DATE),
+        "dates_summary_range_365": lambda: list(calculate_solar_summary_range(LON, LAT, "2025-01-01", "2025-12-31")),
+        "dates_lunar_calendar_336": lunar_calendar,
+        "resolution_profile_minute": lambda: calculate_daily_solar_profile(LON, LAT, DATE, interval=1),
+        "resolution_chart_1440x30": lambda: get_solar_chart(minute_profile, 30, ".", "O", current_hour=12, width=80),
+        "resolution_heatmap_year": lambda: get_solar_heatmap(LON, LAT, 2025),
+        "resolution_map_1deg": lambda: get_solar_map(DATE, "12:00", 1.0),
+    }
+
+
+def _cli(*args):
+    def run():
+        subprocess.run([sys.executable, UPLOOK, *args], check=True, stdout=subprocess.DEVNULL)
+    return run
+
+
+def _cli_cases():
+    solar = ["solar", "--lon", str(LON), "--lat", str(LAT), "--date", DATE]
+    return {
+        "cli_solar_summary": _cli(*solar),
+        "cli_solar_chart": _cli(*solar, "--type", "chart"),
+        "cli_solar_range_year": _cli("solar", "--lon", str(LON), "--lat", str(LAT), "--start", "2025-01-01", "--end", "2025-12-31"),
+        "cli_lunar_combined": _cli("lunar", "--date", DATE, "--type", "combined"),
+        "cli_lunar_calendar_year": _cli("lunar", "--start", "2025-01-01", "--end", "2025-12-31"),
+    }
+
+
+GROUPS = {"api": _api_cases, "scaled": _scaled_cases, "cli": _cli_cases}
+
+
+def time_case(function, min_time, repeat):
+    """
+    Times function over enough loops to take at least min_time seconds, repeat
+    times, after one untimed call to warm it up.
+
+    Returns:
+        dict: "seconds" (fastest per-call time), "median_seconds", "loops", "repeats"
+    """
+    function()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.1))
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            function()
+        samples.append((time.perf_counter() - started) / loops)
+    return {
+        "seconds": min(samples),
+        "median_seconds": statistics.median(samples),
+        "loops": loops,
+        "repeats": repeat,
+    }
+
+
+def run_suite(pattern="*", min_time=0.2, repeat=5, log=None):
+    """
+    Runs every case whose name matches pattern (a glob).
+
+    Returns:
+        dict: The run, with "cases" mapping each case name to its group and timings
+    """
+    cases = {}
+    for group, build in GROUPS.items():
+        for name, function in build().items():
+            if not (fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(group, pattern)):
+                continue
+            result = time_case(function, min_time, repeat)
+            cases[name] = {"group": group, **result}
+            if log is not None:
+                print(f"{name:<32} {result['seconds'] * 1000:>12.4f} ms", file=log, flush=True)
+    return {
+        "version": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "cases": cases,
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+    Compares two runs case by case.
+
+    Returns:
+        list: (name, baseline seconds, current seconds, change in percent, status)
+              for every case in either run, status being 'ok', 'REGRESSION',
+              'faster' (by more than threshold), 'new' or 'missing'
+    """
+    rows = []
+    for name in sorted(set(baseline["cases"]) | set(current["cases"])):
+        before = baseline["cases"].get(name, {}).get("seconds")
+        after = current["cases"].get(name, {}).get("seconds")
+        if before is None or after is None:
+            rows.append((name, before, after, None, "new" if before is None else "missing"))
+            continue
+        change = (after - before) / before * 100
+        status = "REGRESSION" if change > threshold else "faster" if change < -threshold else "ok"
+        rows.append((name, before, after, change, status))
+    return rows
+
+
+def _ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.4f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    timing = argparse.ArgumentParser(add_help=False)
+    timing.add_argument("--filter", default="*", help="Glob of case or group names to run (default: all)")
+    timing.add_argument("--min-time", type=float, default=0.2, help="Least time per repeat, in seconds (default: 0.2)")
+    timing.add_argument("--repeat", type=int, default=5, help="Repeats per case (default: 5)")
+    timing.add_argument("--quick", action="store_true", help="Shorthand for --min-time 0.05 --repeat 3")
+
+    run_parser = commands.add_parser("run", parents=[timing], help="Time the cases")
+    run_parser.add_argument("--save", help="File to write the results to, e.g. bench/baseline.json")
+
+    compare_parser = commands.add_parser("compare", parents=[timing], help="Compare a run against a baseline")
+    compare_parser.add_argument("baseline", help="Results saved by run --save")
+    compare_parser.add_argument("current", nargs="?", help="Results to compare (default: run the suite now)")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=20.0, help="Slowdown in percent reported as a regression (default: 20)"
+    )
+    args = parser.parse_args()
+    if args.quick:
+        args.min_time, args.repeat = 0.05, 3
+
+    if args.command == "run":
+        results = run_suite(args.filter, args.min_time, args.repeat, log=sys.stderr)
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(results, f, indent=2)
+                f.write("\n")
+        else:
+            print(json.dumps(results, indent=2))
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.current is None:
+        current = run_suite(args.filter, args.min_time, args.repeat, log=sys.stderr)
+    else:
+        with open(args.current) as f:
+            current = json.load(f)
+    if args.filter != "*":
+        for run in (baseline, current):
+            run["cases"] = {
+                name: case for name, case in run["cases"].items()
+                if fnmatch.fnmatch(name, args.filter) or fnmatch.fnmatch(case["group"], args.filter)
+            }
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'Case':<32} {'Baseline ms':>12} {'Current ms':>12} {'Change':>8}  Status")
+    for name, before, after, change, status in rows:
+        shown = "-" if change is None else f"{change:+.1f}%"
+        print(f"{name:<32} {_ms(before):>12} {_ms(after):>12} {shown:>8}  {status}")
+    regressions = [row for row in rows if row[4] == "REGRESSION"]
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:g}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import numpy as np
+
+import uplook.lunar
+from uplook.lunar.phase import get_moon_phase
+
+
+def test_phases_match_get_moon_phase():
+    dates = ["2025-11-05", "2025-01-01", "2025-06-15"]
+
+    names, fractions = uplook.lunar.phases(dates)
+
+    for day, name, fraction in zip(dates, names, fractions):
+        assert (name, fraction) == get_moon_phase(day)
+    assert fractions.dtype == np.float64
+
+
+def test_phases_of_no_dates():
+    names, fractions = uplook.lunar.phases([])
+
+    assert len(names) == len(fractions) == 0
@@ -0,0 +1,14 @@
+from uplook.lunar.columns import phase_columns
+from uplook.lunar.phase import get_moon_phase
+
+
+def test_phase_columns():
+    phase_name, fraction = get_moon_phase("2025/11/1")
+    columns = phase_columns([("2025/11/1", phase_name, fraction)])
+
+    assert columns == [
+        ("date", "date", ["2025-11-01"]),
+        ("phase", "str", [phase_name]),
+        ("fraction", "float", columns[2][2]),
+    ]
+    assert list(columns[2][2]) == [fraction]
@@ -1,5 +1,11 @@
 import pytest
-from uplook.lunar.summary import fraction_to_percent_string, get_lunar_summary
+from uplook.lunar.summary import (
+    fraction_to_percent_string,
+    get_lunar_summary,
+    get_lunar_calendar_header,
+    get_lunar_calendar_row,
+    get_lunar_calendar_footer,
+)
 
 
 @pytest.mark.parametrize(
@@ -31,3 +37,20 @@ def test_fraction_to_percent_string_parametrized(fraction, expected):
 def test_get_lunar_summary_parametrized(phase, frac, date, expected):
     result = get_lunar_summary(phase, frac, date)
     assert result == [expected]
+
+
+@pytest.mark.parametrize(
+    "phase,frac,date,expected",
+    [
+        ("Full Moon", 0.9999, "2025-12-05", "2025-12-05 Full Moon               100%"),
+        ("Waxing Crescent", 0.12, "2025-11-24", "2025-11-24 Waxing Crescent          12%"),
+    ],
+)
+def test_get_lunar_calendar_row_parametrized(phase, frac, date, expected):
+    assert get_lunar_calendar_row(phase, frac, date) == [expected]
+
+
+def test_get_lunar_calendar_header_and_footer_widths_match():
+    header = get_lunar_calendar_header("2025-01-01", "2025-12-31")
+    assert header[0] == "Lunar profile from 2025-01-01 to 2025-12-31"
+    assert len(header[1]) == len(header[2]) == len(get_lunar_calendar_footer()[0])
@@ -1,5 +1,6 @@
+import ephem
 import pytest
-from uplook.lunar.phase import get_moon_phase, determine_phase_name
+from uplook.lunar.phase import get_moon_phase, determine_phase_name, build_lunation_table, previous_new_moon
 from uplook.lunar.summary import fraction_to_percent_string
 
 
@@ -46,3 +47,35 @@ def test_get_moon_phase_parametrized(date, expected_phase, expected_percent):
 def test_determine_phase_name_parametrized(fraction, age, expected):
     name = determine_phase_name(fraction, age)
     assert name == expected
+
+
+def test_build_lunation_table_covers_range():
+    lunations = build_lunation_table("2025-01-01", "2025-12-31")
+    # 12-13 lunations in a year, plus the new moons either side of the range
+    assert 13 <= len(lunations) <= 15
+    assert lunations == sorted(lunations)
+    assert lunations[0] <= ephem.Date("2025/01/01") < lunations[1]
+    assert lunations[-2] <= ephem.Date("2025/12/31") < lunations[-1]
+
+
+@pytest.mark.parametrize(
+    "date",
+    ["2025-01-01", "2025-03-29", "2025-06-15", "2025-11-20", "2025-12-05", "2025-12-31"],
+)
+def test_previous_new_moon_lookup_matches_ephem(date):
+    lunations = build_lunation_table("2025-01-01", "2025-12-31")
+    when = ephem.Date(date.replace("-", "/"))
+    assert previous_new_moon(when, lunations) == pytest.approx(float(ephem.previous_new_moon(when)))
+
+
+def test_previous_new_moon_falls_back_outside_table():
+    lunations = build_lunation_table("2025-01-01", "2025-01-31")
+    when = ephem.Date("2030/06/01")
+    assert previous_new_moon(when, lunations) == pytest.approx(float(ephem.previous_new_moon(when)))
+
+
+def test_get_moon_phase_with_lunation_table_matches_search():
+    lunations = build_lunation_table("2025-11-01", "2025-12-31")
+    for day in range(1, 31):
+        date = f"2025-11-{day:02d}"
+        assert get_moon_phase(date, lunations) == get_moon_phase(date)
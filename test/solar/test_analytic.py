@@ -0,0 +1,65 @@
+import pytest
+
+from uplook.solar.analytic import (
+    ELEVATION_TOLERANCE_DEG,
+    BELOW_HORIZON_TOLERANCE_DEG,
+    julian_date,
+    solar_elevation,
+    calculate_daily_solar_profile_analytic,
+)
+from uplook.solar.context import SolarDay
+from uplook.solar.elevation import calculate_solar_elevation, calculate_daily_solar_profile
+
+
+@pytest.mark.parametrize(
+    "date_str,time_str,lon,lat",
+    [
+        ("2025/11/20", "12:00", -0.1278, 51.5074),
+        ("1900/01/01", "06:30", 151.21, -33.87),
+        ("2099/12/31", "23:59", -149.9, 61.2),
+        ("1950/06/21", "00:00", 18.95, 89.9),
+        ("2075/12/21", "18:15", -60.0, -89.9),
+        ("2000/03/20", "07:45", 0.0, 0.0),
+    ],
+)
+def test_solar_elevation_matches_ephem(date_str, time_str, lon, lat):
+    expected = calculate_solar_elevation(date_str, time_str, lon, lat)
+    hours, minutes = map(int, time_str.split(":"))
+    angle = solar_elevation(julian_date(date_str) + (hours * 60 + minutes) / 1440, lon, lat)
+
+    tolerance = ELEVATION_TOLERANCE_DEG if expected >= -1 else BELOW_HORIZON_TOLERANCE_DEG
+    assert angle == pytest.approx(expected, abs=tolerance)
+
+
+@pytest.mark.parametrize(
+    "lon,lat,date_str",
+    [
+        (-0.12, 51.51, "2025/11/1"),
+        (25.0, -70.0, "1912/12/21"),
+        (-45.0, 85.0, "2088-03-21"),
+    ],
+)
+def test_analytic_profile_matches_ephem_profile(lon, lat, date_str):
+    expected = calculate_daily_solar_profile(lon, lat, date_str, interval=20)
+    profile = calculate_daily_solar_profile_analytic(lon, lat, date_str, interval=20)
+
+    assert [p["time"] for p in profile] == [p["time"] for p in expected]
+    for ours, theirs in zip(profile, expected):
+        # Both sides are rounded to 2 dp, so allow for one unit of rounding
+        tolerance = ELEVATION_TOLERANCE_DEG if theirs["angle_deg"] >= -1 else BELOW_HORIZON_TOLERANCE_DEG
+        assert ours["angle_deg"] == pytest.approx(theirs["angle_deg"], abs=tolerance + 0.01)
+
+
+def test_analytic_profile_full_precision_matches_solar_elevation():
+    profile = calculate_daily_solar_profile_analytic(-0.12, 51.51, "2025-11-01", interval=7, digits=None)
+    start = julian_date("2025-11-01")
+
+    for minute, angle in zip(profile.minutes, profile.angles):
+        assert angle == pytest.approx(solar_elevation(start + minute / 1440, -0.12, 51.51), abs=1e-4)
+
+
+def test_solar_day_noaa_engine():
+    solar_day = SolarDay(-0.12, 51.51, "2025-11-01", engine="noaa")
+
+    assert solar_day.profile == calculate_daily_solar_profile_analytic(-0.12, 51.51, "2025-11-01")
+    assert len(solar_day.profile) == 24
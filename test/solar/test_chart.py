@@ -1,7 +1,9 @@
 import pytest
 import math
 
-from uplook.solar.chart import get_solar_chart
+from uplook.solar.chart import get_solar_chart, iter_solar_chart
+from uplook.solar.context import SolarDay
+from uplook.solar.profile import SolarProfile
 
 
 @pytest.mark.parametrize(
@@ -92,3 +94,75 @@ def test_get_solar_chart_returns_none_when_sun_below_horizon():
     result = get_solar_chart(profile, 6, "*", "X", current_hour=0)
     assert isinstance(result, list)
     assert any("sun is below the horizon" in line for line in result)
+
+
+def test_iter_solar_chart_matches_get_solar_chart():
+    profile = [{"hour": h, "time": f"{h:02d}:00", "angle_deg": 40 - abs(12 - h) * 5.0} for h in range(24)]
+    lines = iter_solar_chart(profile, 6, "*", "X", current_hour=12)
+
+    assert not isinstance(lines, list)
+    assert list(lines) == get_solar_chart(profile, 6, "*", "X", current_hour=12)
+
+
+def test_iter_solar_chart_polar_night_skips_profile():
+    solar_day = SolarDay(10.0, 80.0, "2025-12-21")
+
+    lines = list(iter_solar_chart(solar_day, 5, ".", "O", current_hour=12))
+
+    assert lines == ["Note: Polar night, the sun is below the horizon for the entire day at this location/date."]
+    assert solar_day._profile is None
+
+
+def test_iter_solar_chart_polar_day_adds_note():
+    lines = list(iter_solar_chart(SolarDay(10.0, 80.0, "2025-06-21"), 5, ".", "O", current_hour=12))
+
+    assert lines[-1] == "Note: Polar day, the sun is above the horizon for the entire day at this location/date."
+    assert lines[-2].strip().startswith("---")
+
+
+def test_get_solar_chart_downsamples_to_width():
+    profile = SolarProfile(range(1440), [40 - abs(720 - m) / 12 for m in range(1440)])
+
+    chart = get_solar_chart(profile, 30, "*", "X", current_hour=12, width=80)
+
+    rows = [line[6:] for line in chart[:-1]]
+    assert len(chart) == 31
+    assert all(len(row) == 80 for row in rows)
+    assert sum(row.count("X") for row in rows) == 1
+    # The noon column keeps the peak, so it reaches the top row
+    assert "X" in rows[0]
+    assert chart[-1] == " " * 4 + "-" * 81
+
+
+def test_get_solar_chart_spaces_samples_that_fit_width():
+    profile = [{"hour": h, "time": f"{h:02d}:00", "angle_deg": 40 - abs(12 - h) * 5.0} for h in range(24)]
+
+    assert get_solar_chart(profile, 6, "*", "X", current_hour=12, width=47) == get_solar_chart(profile, 6, "*", "X", current_hour=12)
+    side_by_side = get_solar_chart(profile, 6, "*", "X", current_hour=12, width=30)
+    assert all(len(line) == 6 + 24 for line in side_by_side[:-1])
+    assert side_by_side[-1] == " " * 4 + "-" * 25
+
+
+def test_get_solar_chart_accepts_solar_profile():
+    entries = [{"hour": h, "time": f"{h:02d}:00", "angle_deg": 30 - abs(12 - h) * 4.0} for h in range(24)]
+    profile = SolarProfile.from_entries(entries)
+
+    assert get_solar_chart(profile, 5, ".", "O", current_hour=9) == get_solar_chart(entries, 5, ".", "O", current_hour=9)
+
+
+@pytest.mark.parametrize("width", [None, 40])
+def test_solar_chart_cells_locate_each_mark(width):
+    from uplook.solar.chart import SolarChart
+
+    solar_day = SolarDay(-0.12, 51.51, "2025-11-01", interval=30)
+    chart = SolarChart(solar_day, 5, ".", "O", width=width)
+    for hour in range(24):
+        column = chart.column_at(hour * 60)
+        lines = list(chart.lines(column))
+        assert lines == get_solar_chart(solar_day, 5, ".", "O", current_hour=hour, width=width)
+        cell = chart.cell(column)
+        if cell is not None:
+            line, offset = cell
+            assert lines[line][offset] == "O"
+        else:
+            assert not any("O" in line for line in lines)
@@ -0,0 +1,91 @@
+import pytest
+
+from uplook.solar.context import SolarDay
+from uplook.solar.elevation import calculate_daily_solar_profile, calculate_daily_solar_summary
+from uplook.solar.chart import get_solar_chart
+from uplook.solar.summary import get_solar_summary
+from uplook.solar.table import get_solar_table
+
+
+@pytest.mark.parametrize(
+    "lon,lat,date_str",
+    [
+        (-0.12, 51.51, "2025/11/1"),
+        (0.0, 0.0, "2025-11-20"),
+        (0.0, 85.0, "2025/11/20"),
+        (151.21, -33.87, "2025/06/21"),
+    ],
+)
+def test_solar_day_matches_per_call_functions(lon, lat, date_str):
+    solar_day = SolarDay(lon, lat, date_str)
+    assert solar_day.profile == calculate_daily_solar_profile(lon, lat, date_str)
+    assert solar_day.summary == calculate_daily_solar_summary(lon, lat, date_str)
+
+
+def test_solar_day_interval_caches_profiles_separately(tmp_path):
+    from uplook.cache import ResultCache
+
+    with ResultCache(tmp_path) as cache:
+        hourly = SolarDay(-0.12, 51.51, "2025/11/1", cache=cache).profile
+        quarterly = SolarDay(-0.12, 51.51, "2025/11/1", interval=15, cache=cache).profile
+
+    assert len(hourly) == 24
+    assert len(quarterly) == 96
+    assert quarterly == calculate_daily_solar_profile(-0.12, 51.51, "2025/11/1", interval=15)
+
+
+def test_solar_day_computes_lazily_and_once():
+    solar_day = SolarDay(-0.12, 51.51, "2025/11/1")
+    calls = []
+
+    def compute(kind):
+        calls.append(kind)
+        return []
+
+    solar_day._compute_profile = lambda: compute("profile")
+    solar_day._compute_summary = lambda: compute("summary")
+
+    get_solar_summary(solar_day)
+    get_solar_summary(solar_day)
+
+    assert calls == ["summary"]
+
+
+def test_renderers_accept_solar_day():
+    lon, lat, date_str = -0.12, 51.51, "2025/11/1"
+    solar_day = SolarDay(lon, lat, date_str)
+    daily_profile = calculate_daily_solar_profile(lon, lat, date_str)
+    daily_summary = calculate_daily_solar_summary(lon, lat, date_str)
+
+    assert get_solar_summary(solar_day) == get_solar_summary(daily_summary, lon, lat, date_str)
+    assert get_solar_table(solar_day) == get_solar_table(daily_profile)
+    assert get_solar_chart(solar_day, 5, ".", "O", current_hour=12) == get_solar_chart(daily_profile, 5, ".", "O", current_hour=12)
+
+
+def test_solar_day_uses_precomputed_results():
+    solar_day = SolarDay(0.0, 0.0, "2025/11/20", summary=[], profile=[{"hour": 0, "time": "00:00", "angle_deg": 1.0}])
+    assert solar_day.summary == []
+    assert solar_day.profile == [{"hour": 0, "time": "00:00", "angle_deg": 1.0}]
+    assert solar_day._observer is None
+
+
+def test_ephem_renderers_do_not_import_numpy():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys; from uplook.solar.context import SolarDay; "
+        "from uplook.solar.chart import get_solar_chart; "
+        "get_solar_chart(SolarDay(-0.12, 51.51, '2025/11/1'), 5, '.', 'O', current_hour=12); "
+        "assert 'numpy' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_solar_day_precise_events_match_summary():
+    rounded = SolarDay(-0.12, 51.51, "2025/11/1")
+    precise = SolarDay(-0.12, 51.51, "2025/11/1", precise=True)
+
+    assert len(precise.events) == 3
+    assert precise.summary == rounded.summary
+    assert [round(angle, 2) for angle in precise.profile.angles] == list(rounded.profile.angles)
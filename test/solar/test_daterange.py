@@ -0,0 +1,45 @@
+import pytest
+
+from uplook.solar.daterange import iter_dates, calculate_solar_summary_range
+from uplook.solar.elevation import calculate_daily_solar_summary
+
+
+def _minutes(time_str):
+    hours, minutes = time_str.split(":")
+    return int(hours) * 60 + int(minutes)
+
+
+@pytest.mark.parametrize(
+    "start,end,expected",
+    [
+        ("2025-12-30", "2026-01-02", ["2025-12-30", "2025-12-31", "2026-01-01", "2026-01-02"]),
+        ("2024/2/28", "2024/3/1", ["2024-02-28", "2024-02-29", "2024-03-01"]),
+        ("2025-01-01", "2025-01-01", ["2025-01-01"]),
+        ("2025-01-02", "2025-01-01", []),
+    ],
+)
+def test_iter_dates_parametrized(start, end, expected):
+    assert list(iter_dates(start, end)) == expected
+
+
+@pytest.mark.parametrize(
+    "lon,lat",
+    [
+        (-0.12, 51.51),
+        (0.0, 0.0),
+        # Polar night and midnight sun, so the search has to re-seed
+        (18.95, 69.65),
+        (0.0, 78.0),
+        # Sunset after midnight UTC, reported as [] by the per-day summary
+        (170.0, -45.0),
+    ],
+)
+def test_summary_range_matches_daily_summary(lon, lat):
+    results = list(calculate_solar_summary_range(lon, lat, "2025-01-01", "2025-12-31"))
+    assert len(results) == 365
+
+    for date_str, summary in results:
+        expected = calculate_daily_solar_summary(lon, lat, date_str)
+        assert len(summary) == len(expected), date_str
+        for ours, theirs in zip(summary, expected):
+            assert abs(_minutes(ours) - _minutes(theirs)) <= 1, date_str
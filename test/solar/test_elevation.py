@@ -44,3 +44,7 @@ def test_calculate_daily_solar_profile_basic():
         for entry in profile:
             assert set(entry.keys()) == {"hour", "time", "angle_deg"}
 
+
+
+def test_calculate_daily_solar_profile_invalid_date_returns_empty():
+    assert calculate_daily_solar_profile(0.0, 0.0, "not-a-date") == []
@@ -0,0 +1,45 @@
+import numpy as np
+
+from uplook.solar.heatmap import get_solar_heatmap, heatmap_profiles, solar_elevation_year
+from uplook.solar.vectorized import solar_elevation_array
+
+
+def test_solar_elevation_year_matches_daily_arrays():
+    dates, minutes, elevations = solar_elevation_year(-0.12, 51.51, 2024)
+
+    assert len(dates) == 366 and dates[0] == "2024-01-01" and dates[-1] == "2024-12-31"
+    assert minutes == list(range(0, 1440, 60))
+    assert elevations.shape == (366, 24)
+    day = np.datetime64("2024-06-21T00:00") + np.arange(0, 1440, 60).astype("timedelta64[m]")
+    np.testing.assert_allclose(elevations[172], solar_elevation_array(day, -0.12, 51.51))
+
+
+def test_get_solar_heatmap_layout():
+    lines = get_solar_heatmap(15.6, 78.2, 2025, interval=120, width=48)
+
+    assert lines[0] == "Solar elevation for 2025 at latitude 78.2, longitude 15.6"
+    assert lines[1].split() == list("JFMAMJJASOND")
+    rows = lines[2:-1]
+    assert [row[:5] for row in rows] == [f"{hour:02d}:00" for hour in range(0, 24, 2)]
+    assert all(len(row) == 6 + 48 for row in rows)
+    # Svalbard: polar night around the new year, polar day at midsummer
+    noon = rows[6][6:]
+    assert noon[0] != "#" and noon[24] in "#+"
+    assert rows[0][6] == " " and rows[0][6 + 24] != " "
+
+
+def test_get_solar_heatmap_shows_every_day_when_wide_enough():
+    lines = get_solar_heatmap(-0.12, 51.51, 2025, width=1000)
+
+    assert all(len(row) == 6 + 365 for row in lines[2:-1])
+    assert lines[1].index("F") == 6 + 31
+
+
+def test_heatmap_profiles_cover_the_year():
+    profiles = list(heatmap_profiles(-0.12, 51.51, 2025, interval=30))
+
+    assert len(profiles) == 365
+    date_str, profile = profiles[31]
+    assert date_str == "2025-02-01"
+    assert len(profile) == 48 and profile.minutes[-1] == 1410
+
@@ -0,0 +1,48 @@
+import random
+
+import ephem
+import pytest
+
+from uplook.solar.elevation import create_observer
+from uplook.solar.polar import NORMAL, POLAR_DAY, POLAR_NIGHT, classify_date
+
+
+@pytest.mark.parametrize(
+    "lat,date_str,expected",
+    [
+        (80.0, "2025-06-21", POLAR_DAY),
+        (80.0, "2025-12-21", POLAR_NIGHT),
+        (-80.0, "2025-06-21", POLAR_NIGHT),
+        (-80.0, "2025/12/21", POLAR_DAY),
+        (51.51, "2025-06-21", NORMAL),
+        (0.0, "2025-12-21", NORMAL),
+        (90.0, "2025-03-18", NORMAL),   # The day the Sun rises at the pole
+        (69.65, "1903-06-01", POLAR_DAY),
+        (69.65, "2099-12-01", POLAR_NIGHT),
+    ],
+)
+def test_classify_date(lat, date_str, expected):
+    assert classify_date(lat, date_str) == expected
+
+
+def _ephem_has_events(lon, lat, date_str):
+    observer, sun = create_observer(lon, lat), ephem.Sun()
+    day = ephem.Date(date_str)
+    observer.date = day
+    try:
+        sunrise = observer.next_rising(sun)
+        observer.date = sunrise
+        sunset = observer.next_setting(sun)
+    except ephem.CircumpolarError:
+        return False
+    return sunrise < day + 1 and sunset < day + 1
+
+
+def test_polar_days_never_have_events():
+    random.seed(4)
+    for _ in range(300):
+        lat = random.choice((1, -1)) * random.uniform(60, 90)
+        lon = random.uniform(-180, 180)
+        date_str = f"{random.randint(1900, 2099)}/{random.randint(1, 12)}/{random.randint(1, 28)}"
+        if classify_date(lat, date_str) != NORMAL:
+            assert not _ephem_has_events(lon, lat, date_str), (lon, lat, date_str)
@@ -0,0 +1,53 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from uplook.solar.chart import get_solar_chart
+from uplook.solar.elevation import calculate_daily_solar_profile
+from uplook.solar.profile import SolarProfile
+from uplook.solar.table import get_solar_table
+
+
+def test_solar_profile_behaves_like_list_of_dicts():
+    entries = calculate_daily_solar_profile(-0.1278, 51.5074, "2025/11/20", interval=30)
+    profile = SolarProfile.from_entries(entries)
+
+    assert len(profile) == 48
+    assert profile == entries
+    assert entries == profile
+    assert list(profile) == entries
+    assert profile[3] == entries[3]
+    assert profile[-1] == entries[-1]
+    assert profile[10:12] == entries[10:12]
+    assert json.loads(json.dumps(profile.to_list())) == entries
+
+
+def test_renderers_accept_solar_profile():
+    entries = calculate_daily_solar_profile(-0.1278, 51.5074, "2025/11/20")
+    profile = SolarProfile.from_entries(entries)
+
+    assert get_solar_table(profile) == get_solar_table(entries)
+    assert get_solar_chart(profile, 5, ".", "O", current_hour=12) == get_solar_chart(entries, 5, ".", "O", current_hour=12)
+
+
+def test_solar_profile_columns_are_zero_copy():
+    profile = SolarProfile([0, 60, 120], [-10.5, 0.25, 12.0])
+    angles = np.frombuffer(profile.angles, dtype=np.float64)
+    minutes = np.frombuffer(profile.minutes, dtype=np.uint16)
+
+    profile.angles[1] = 1.5
+
+    assert angles.tolist() == [-10.5, 1.5, 12.0]
+    assert minutes.tolist() == [0, 60, 120]
+
+
+def test_solar_profile_pickles():
+    profile = SolarProfile([0, 60], [1.0, 2.0])
+    assert pickle.loads(pickle.dumps(profile)) == profile
+
+
+def test_solar_profile_rejects_mismatched_columns():
+    with pytest.raises(ValueError):
+        SolarProfile([0, 60], [1.0])
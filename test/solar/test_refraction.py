@@ -0,0 +1,21 @@
+import math
+
+import ephem
+import pytest
+
+from uplook.solar.refraction import unrefract_deg, refraction_table, refract_deg
+
+
+@pytest.mark.parametrize("apparent", [-10.0, -1.0, 0.0, 0.5, 14.5, 15.0, 15.5, 45.0, 90.0])
+def test_unrefract_matches_ephem(apparent):
+    expected = math.degrees(ephem.unrefract(1010, 15, math.radians(apparent)))
+    assert unrefract_deg(apparent) == pytest.approx(expected, abs=1e-9)
+
+
+@pytest.mark.parametrize("apparent", [-5.0, -0.5, 0.0, 0.3, 5.0, 14.9, 30.0, 89.0])
+def test_refract_inverts_unrefract(apparent):
+    assert refract_deg(unrefract_deg(apparent), refraction_table()) == pytest.approx(apparent, abs=0.003)
+
+
+def test_refract_leaves_low_altitudes_unchanged():
+    assert refract_deg(-20.0, refraction_table()) == -20.0
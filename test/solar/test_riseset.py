@@ -0,0 +1,73 @@
+import math
+
+import ephem
+import numpy as np
+import pytest
+
+from uplook.solar.elevation import create_observer, calculate_observer_events
+from uplook.solar.riseset import solar_events_array, events_list
+
+# Largest difference allowed from pyephem's event times, in seconds, away from
+# sites where the Sun only grazes the horizon
+TOLERANCE_S = 15
+
+
+def ephem_events(lon, lat, date_str):
+    return calculate_observer_events(create_observer(lon, lat), ephem.Sun(), ephem.Date(date_str.replace("-", "/")))
+
+
+@pytest.mark.parametrize("date_str", ["2025-11-01", "2025-06-21", "1903-03-20", "2091-12-21"])
+def test_solar_events_array_matches_ephem(date_str):
+    lons = np.array([-0.12, 151.21, 0.0, 18.95, -149.9, 100.0, -70.0, 30.0])
+    lats = np.array([51.51, -33.87, 0.0, 69.65, 61.2, 80.0, -80.0, -45.0])
+
+    sunrise, zenith, sunset = solar_events_array(lons, lats, date_str)
+
+    for i, (lon, lat) in enumerate(zip(lons, lats)):
+        expected = ephem_events(lon, lat, date_str)
+        ours = events_list(sunrise, zenith, sunset, i)
+        assert bool(ours) == bool(expected), (lon, lat)
+        for a, b in zip(ours, expected):
+            assert abs(a - b) * 86400 <= TOLERANCE_S
+
+
+@pytest.mark.parametrize(
+    "lat,date_str",
+    [
+        (80.0, "2025-06-21"),   # Polar day
+        (80.0, "2025-12-21"),   # Polar night
+        (-89.0, "2025-06-21"),
+        (89.0, "2025-06-21"),
+    ],
+)
+def test_solar_events_array_polar_sites_have_no_events(lat, date_str):
+    assert ephem_events(10.0, lat, date_str) == []
+
+    sunrise, zenith, sunset = solar_events_array([10.0], [lat], date_str)
+
+    assert math.isnan(sunrise[0]) and math.isnan(zenith[0]) and math.isnan(sunset[0])
+    assert events_list(sunrise, zenith, sunset, 0) == []
+
+
+def test_solar_events_array_broadcasts_and_orders_events():
+    lons = np.linspace(-180, 180, 25)
+    sunrise, zenith, sunset = solar_events_array(lons, 10.0, "2025/03/01")
+
+    assert sunrise.shape == zenith.shape == sunset.shape == (25,)
+    found = ~np.isnan(sunrise)
+    assert found.any()
+    assert np.all(sunrise[found] < zenith[found]) and np.all(zenith[found] < sunset[found])
+    day = float(ephem.Date("2025/03/01"))
+    assert np.all((sunrise[found] >= day) & (sunset[found] < day + 1))
+
+
+def test_solar_events_array_chunks_match_single_pass(monkeypatch):
+    lons = np.linspace(-170, 170, 40)
+    lats = np.linspace(-60, 60, 40)
+    whole = solar_events_array(lons, lats, "2025-11-01")
+
+    monkeypatch.setattr("uplook.solar.riseset._CHUNK", 7)
+    chunked = solar_events_array(lons, lats, "2025-11-01")
+
+    for a, b in zip(whole, chunked):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,60 @@
+import ephem
+import pytest
+
+from uplook.solar.elevation import create_observer, calculate_daily_solar_profile
+from uplook.solar.sampling import ERROR_BOUND_DEG, exact_elevation, sample_elevations
+
+
+class CountingSun:
+    """Wraps ephem.Sun to count calls to compute."""
+
+    def __init__(self):
+        self.sun = ephem.Sun()
+        self.computes = 0
+
+    def compute(self, observer):
+        self.computes += 1
+        self.sun.compute(observer)
+
+    @property
+    def alt(self):
+        return self.sun.alt
+
+
+@pytest.mark.parametrize(
+    "lon,lat,date_str",
+    [
+        (-0.1278, 51.5074, "2025/11/20"),
+        (151.21, -33.87, "1901/01/15"),
+        # The sun passes straight overhead at noon
+        (0.0, 23.44, "2025/06/21"),
+        # Midnight sun, polar night, and the sun skimming the horizon all day
+        (0.0, 78.2, "2025/06/21"),
+        (0.0, -78.2, "2025/06/21"),
+        (25.0, 67.0, "2099/12/21"),
+    ],
+)
+def test_sample_elevations_within_error_bound(lon, lat, date_str):
+    day = ephem.Date(date_str)
+    minutes = list(range(1440))
+    observer, sun = create_observer(lon, lat), CountingSun()
+
+    sampled = sample_elevations(observer, sun, day, minutes)
+    computes = sun.computes
+    exact = [exact_elevation(observer, sun, day, minute) for minute in minutes]
+
+    assert max(abs(a - b) for a, b in zip(sampled, exact)) <= ERROR_BOUND_DEG
+    # A small multiple of the 24 positions an hourly profile computes
+    assert computes <= 96
+
+
+def test_daily_profile_interval():
+    profile = calculate_daily_solar_profile(-0.1278, 51.5074, "2025/11/20", interval=15)
+    hourly = calculate_daily_solar_profile(-0.1278, 51.5074, "2025/11/20")
+
+    assert len(profile) == 96
+    assert [p["time"] for p in profile[:5]] == ["00:00", "00:15", "00:30", "00:45", "01:00"]
+    assert [p["hour"] for p in profile[:5]] == [0, 0, 0, 0, 1]
+    # Whole hours agree with the exact hourly profile to within the rounding
+    for entry, exact in zip(profile[::4], hourly):
+        assert entry["angle_deg"] == pytest.approx(exact["angle_deg"], abs=0.01)
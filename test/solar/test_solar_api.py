@@ -0,0 +1,52 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+import uplook.solar
+from uplook.solar.api import as_days
+from uplook.solar.context import SolarDay
+
+
+def test_as_days_accepts_mixed_dates():
+    days = as_days(["2025-11-01", "2025/11/2", date(2025, 11, 3), np.datetime64("2025-11-04T12:00")])
+
+    np.testing.assert_array_equal(days, np.arange("2025-11-01", "2025-11-05", dtype="datetime64[D]"))
+
+
+@pytest.mark.parametrize("engine,tolerance", [("numpy", 0.02), ("noaa", 0.01), ("ephem", 0.0)])
+def test_profiles_match_solar_day(engine, tolerance):
+    sites = [(-0.12, 51.51), (151.21, -33.87)]
+    dates = ["2025-03-20", "2025-11-01"]
+
+    minutes, elevations = uplook.solar.profiles(sites, dates, interval=30, engine=engine)
+
+    assert list(minutes) == list(range(0, 1440, 30))
+    assert elevations.shape == (2, 2, 48)
+    for i, (lon, lat) in enumerate(sites):
+        for j, day in enumerate(dates):
+            expected = SolarDay(lon, lat, day, interval=30, precise=True).profile.angles
+            np.testing.assert_allclose(elevations[i, j], expected, atol=tolerance, rtol=0)
+
+
+def test_profiles_chunks_large_batches(monkeypatch):
+    monkeypatch.setattr("uplook.solar.api._MAX_CELLS", 50)
+    sites = np.column_stack([np.linspace(-180, 180, 7), np.linspace(-60, 60, 7)])
+
+    _, chunked = uplook.solar.profiles(sites, ["2025-06-21"])
+    monkeypatch.undo()
+    _, whole = uplook.solar.profiles(sites, ["2025-06-21"])
+
+    np.testing.assert_array_equal(chunked, whole)
+
+
+def test_events_match_solar_day():
+    sites = [(-0.12, 51.51), (10.0, 80.0)]
+
+    sunrise, zenith, sunset = uplook.solar.events(sites, ["2025-11-01", "2025-12-21"])
+
+    assert sunrise.shape == (2, 2) and sunrise.dtype == np.dtype("datetime64[s]")
+    assert str(sunrise[0, 0])[:16] == "2025-11-01T06:53"
+    assert str(sunset[0, 1])[:16] == "2025-12-21T15:53"
+    # Polar night at 80°N
+    assert np.isnat(sunrise[1, 1]) and np.isnat(zenith[1, 1]) and np.isnat(sunset[1, 1])
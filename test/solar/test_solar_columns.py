@@ -0,0 +1,38 @@
+import math
+
+import ephem
+
+from uplook.solar.columns import event_columns, profile_columns
+from uplook.solar.context import SolarDay
+from uplook.solar.profile import SolarProfile
+
+
+def test_event_columns_convert_to_unix_seconds():
+    solar_day = SolarDay(-0.12, 51.51, "2025/11/1", precise=True)
+    columns = {name: (kind, values) for name, kind, values in event_columns([
+        (-0.12, 51.51, "2025/11/1", solar_day.events),
+        (0.0, 85.0, "2025/11/20", []),
+    ])}
+
+    assert columns["date"] == ("date", ["2025-11-01", "2025-11-20"])
+    kind, sunrise = columns["sunrise"]
+    assert kind == "time"
+    assert sunrise[0] == (solar_day.events[0] - float(ephem.Date("1970/1/1"))) * 86400
+    assert math.isnan(sunrise[1])
+    assert columns["state"] == ("str", ["normal", "polar night"])
+
+
+def test_profile_columns_keep_full_precision():
+    solar_day = SolarDay(-0.12, 51.51, "2025/11/1", interval=30, precise=True)
+    other = SolarProfile([0, 60], [1.25, 2.5])
+    columns = {name: values for name, _, values in profile_columns([
+        (-0.12, 51.51, "2025-11-01", solar_day.profile),
+        (10.0, 20.0, "2025-11-01", other),
+    ])}
+
+    assert len(columns["elevation_deg"]) == 50
+    assert list(columns["elevation_deg"][:48]) == list(solar_day.profile.angles)
+    assert list(columns["lon"][46:]) == [-0.12, -0.12, 10.0, 10.0]
+    assert list(columns["minute"][46:]) == [1380, 1410, 0, 60]
+    # Full precision, not rounded to 0.01
+    assert any(round(angle, 2) != angle for angle in columns["elevation_deg"][:48])
@@ -1,5 +1,12 @@
 import pytest
-from uplook.solar.summary import get_solar_summary
+from uplook.solar.context import SolarDay
+from uplook.solar.polar import NORMAL, POLAR_DAY, POLAR_NIGHT
+from uplook.solar.summary import (
+    get_solar_summary,
+    get_solar_summary_range_header,
+    get_solar_summary_range_row,
+    get_solar_summary_range_footer,
+)
 
 
 @pytest.mark.parametrize(
@@ -22,3 +29,46 @@ def test_get_solar_summary_parametrized(daily_summary, lon, lat, date_str, expec
     # The remainder should include the expected string
     assert any(expected_contains in line for line in lines)
 
+
+
+@pytest.mark.parametrize(
+    "daily_summary,expected",
+    [
+        ([], "2025-11-20      --      --      --"),
+        (["06:45", "12:00", "17:30"], "2025-11-20   06:45   12:00   17:30"),
+    ],
+)
+def test_get_solar_summary_range_row_parametrized(daily_summary, expected):
+    assert get_solar_summary_range_row("2025-11-20", daily_summary) == [expected]
+
+
+def test_get_solar_summary_range_header_and_footer_widths_match():
+    header = get_solar_summary_range_header(-0.12, 51.51, "2025-01-01", "2025-12-31")
+    assert header[0] == "Solar profile from 2025-01-01 to 2025-12-31 at latitude 51.51, longitude -0.12"
+    assert len(header[1]) == len(header[2]) == len(get_solar_summary_range_footer()[0])
+
+
+@pytest.mark.parametrize(
+    "lat,date_str,expected",
+    [
+        (80.0, "2025-06-21", "Polar day: the sun does not set today"),
+        (80.0, "2025-12-21", "Polar night: the sun does not rise today"),
+    ],
+)
+def test_get_solar_summary_reports_polar_states(lat, date_str, expected):
+    assert get_solar_summary(SolarDay(10.0, lat, date_str))[1] == expected
+    assert get_solar_summary([], 10.0, lat, date_str, SolarDay(10.0, lat, date_str).state)[1] == expected
+
+
+@pytest.mark.parametrize(
+    "state,expected",
+    [
+        (NORMAL, "2025-06-21      --      --      --"),
+        (POLAR_DAY, "2025-06-21               polar day"),
+        (POLAR_NIGHT, "2025-06-21             polar night"),
+    ],
+)
+def test_get_solar_summary_range_row_reports_states(state, expected):
+    row = get_solar_summary_range_row("2025-06-21", [], state)
+    assert row == [expected]
+    assert len(row[0]) == len(get_solar_summary_range_footer()[0])
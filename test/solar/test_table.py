@@ -1,5 +1,5 @@
 import pytest
-from uplook.solar.table import get_solar_table
+from uplook.solar.table import get_solar_table, iter_solar_table
 
 
 @pytest.mark.parametrize(
@@ -52,3 +52,15 @@ def test_get_solar_table_alignment_and_row_count():
     assert any("12:00" in line and "45.10" in line for line in table)
     assert any("18:00" in line and "9.88" in line for line in table)
 
+
+
+def test_iter_solar_table_streams_rows():
+    def profile():
+        for minute in range(1440):
+            yield {"hour": minute // 60, "time": f"{minute // 60:02d}:{minute % 60:02d}", "angle_deg": 1.0}
+        raise AssertionError("profile read past the rows taken")
+
+    lines = iter_solar_table(profile())
+    first = [next(lines) for _ in range(3)]
+
+    assert first == get_solar_table([{"hour": 0, "time": "00:00", "angle_deg": 1.0}])[:3]
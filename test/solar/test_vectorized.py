@@ -0,0 +1,80 @@
+import random
+
+import pytest
+import numpy as np
+
+from uplook.solar.elevation import calculate_solar_elevation, calculate_daily_solar_profile
+from uplook.solar.vectorized import (
+    BELOW_HORIZON_TOLERANCE_DEG,
+    ELEVATION_TOLERANCE_DEG,
+    solar_elevation_array,
+    calculate_daily_solar_profile_vectorized,
+)
+
+
+@pytest.mark.parametrize(
+    "date_str,time_str,lon,lat",
+    [
+        ("2025/11/20", "12:00", -0.1278, 51.5074),
+        ("2025/06/21", "03:30", -0.1278, 51.5074),
+        ("2000/03/20", "18:15", 151.21, -33.87),
+        ("1975/12/21", "09:45", 18.95, 69.65),
+        ("2049/01/01", "23:59", -149.9, 61.2),
+        ("2025/11/20", "06:00", 0.0, 85.0),
+    ],
+)
+def test_solar_elevation_array_matches_ephem(date_str, time_str, lon, lat):
+    expected = calculate_solar_elevation(date_str, time_str, lon, lat)
+    timestamp = f"{date_str.replace('/', '-')}T{time_str}"
+    angle = solar_elevation_array(timestamp, lon, lat)
+    assert abs(float(angle) - expected) <= ELEVATION_TOLERANCE_DEG
+
+
+def test_solar_elevation_array_within_tolerance_from_1900_to_2100():
+    rng = random.Random(7)
+    for _ in range(300):
+        year, day, minute = rng.randrange(1900, 2100), rng.randrange(1, 366), rng.randrange(1440)
+        lon, lat = rng.uniform(-180, 180), rng.uniform(-90, 90)
+        timestamp = np.datetime64(f"{year}-01-01T00:00") + np.timedelta64((day - 1) * 1440 + minute, "m")
+        date_str, time_str = str(timestamp)[:10], str(timestamp)[11:16]
+        expected = calculate_solar_elevation(date_str, time_str, lon, lat)
+        tolerance = ELEVATION_TOLERANCE_DEG if expected >= -1 else BELOW_HORIZON_TOLERANCE_DEG
+        assert float(solar_elevation_array(timestamp, lon, lat)) == pytest.approx(expected, abs=tolerance)
+
+
+def test_solar_elevation_array_broadcasts_sites_and_times():
+    times = np.datetime64("2025-11-20T00:00") + np.arange(24) * np.timedelta64(1, "h")
+    lats = np.array([-45.0, 0.0, 51.5])[:, None]
+    lons = np.array([170.0, 0.0, -0.12])[:, None]
+
+    angles = solar_elevation_array(times, lons, lats)
+
+    assert angles.shape == (3, 24)
+    assert np.all((angles >= -90) & (angles <= 90))
+
+
+@pytest.mark.parametrize(
+    "lon,lat,date_str",
+    [
+        (-0.12, 51.51, "2025/11/1"),
+        (0.0, 0.0, "2025-11-20"),
+        (25.0, -70.0, "2025/12/21"),
+    ],
+)
+def test_vectorized_profile_matches_ephem_profile(lon, lat, date_str):
+    expected = calculate_daily_solar_profile(lon, lat, date_str)
+    profile = calculate_daily_solar_profile_vectorized(lon, lat, date_str)
+
+    assert [p["time"] for p in profile] == [p["time"] for p in expected]
+    for ours, theirs in zip(profile, expected):
+        # Both sides are rounded to 2 dp, so allow for one unit of rounding
+        assert abs(ours["angle_deg"] - theirs["angle_deg"]) <= ELEVATION_TOLERANCE_DEG + 0.01
+
+
+def test_vectorized_profile_interval_matches_ephem():
+    vectorized = calculate_daily_solar_profile_vectorized(-0.1278, 51.5074, "2025/11/20", interval=10)
+    sampled = calculate_daily_solar_profile(-0.1278, 51.5074, "2025/11/20", interval=10)
+
+    assert [p["time"] for p in vectorized] == [p["time"] for p in sampled]
+    for fast, slow in zip(vectorized, sampled):
+        assert fast["angle_deg"] == pytest.approx(slow["angle_deg"], abs=ELEVATION_TOLERANCE_DEG + 0.01)
@@ -0,0 +1,60 @@
+import io
+import re
+from datetime import datetime, timedelta, UTC
+
+from uplook.solar.chart import get_solar_chart
+from uplook.solar.context import SolarDay
+from uplook.solar.summary import get_solar_summary
+from uplook.solar.watch import watch_solar_chart
+
+MOVE = re.compile(r"\x1b\[(\d+);(\d+)H([^\x1b]?)")
+
+
+def watch(start, minutes):
+    made = []
+    times = iter([start + timedelta(minutes=minute) for minute in range(minutes)])
+
+    def make_day(date_str):
+        made.append(date_str)
+        return SolarDay(-0.12, 51.51, date_str)
+
+    stream = io.StringIO()
+    watch_solar_chart(make_day, 5, ".", "O", stream=stream, clock=lambda: next(times), sleep=lambda seconds: None, ticks=minutes)
+    return stream.getvalue(), made
+
+
+def test_first_frame_is_the_chart_for_the_current_time():
+    output, made = watch(datetime(2025, 11, 1, 12, 0, tzinfo=UTC), 1)
+
+    solar_day = SolarDay(-0.12, 51.51, "2025-11-01")
+    expected = [*get_solar_summary(solar_day), *get_solar_chart(solar_day, 5, ".", "O", current_hour=12)]
+    assert made == ["2025-11-01"]
+    assert output == "\x1b[?25l\x1b[H\x1b[2J" + "\n".join(expected) + "\n\x1b[?25h"
+
+
+def test_only_changed_cells_are_redrawn_each_hour():
+    output, made = watch(datetime(2025, 11, 1, 12, 0, tzinfo=UTC), 61)
+
+    updates = output[output.index("\x1b[2J"):].split("\n")[-1]
+    # Within the hour nothing changes; at 13:00 the 12:00 mark goes back to a data
+    # point and the 13:00 one becomes current, leaving the cursor below the chart
+    moves = MOVE.findall(updates)
+    assert [char for _, _, char in moves] == [".", "O", ""]
+    assert moves[-1][:2] == ("9", "1")
+    assert made == ["2025-11-01"]
+
+    # Applying the updates to the first frame gives the chart for 13:00
+    frame = output[output.index("\x1b[2J") + 4:].split("\n")[:8]
+    for row, column, char in moves[:2]:
+        line = frame[int(row) - 1]
+        frame[int(row) - 1] = line[:int(column) - 1] + char + line[int(column):]
+    solar_day = SolarDay(-0.12, 51.51, "2025-11-01")
+    assert frame == [*get_solar_summary(solar_day), *get_solar_chart(solar_day, 5, ".", "O", current_hour=13)]
+
+
+def test_profile_is_recomputed_at_date_rollover():
+    output, made = watch(datetime(2025, 11, 1, 23, 58, tzinfo=UTC), 4)
+
+    assert made == ["2025-11-01", "2025-11-02"]
+    assert output.count("\x1b[2J") == 2
+    assert "Solar profile for 2025-11-02" in output
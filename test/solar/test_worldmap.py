@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from uplook.solar.analytic import ELEVATION_TOLERANCE_DEG, BELOW_HORIZON_TOLERANCE_DEG
+from uplook.solar.columns import grid_columns
+from uplook.solar.elevation import calculate_solar_elevation
+from uplook.solar.worldmap import MAP_BANDS, get_solar_map, solar_elevation_grid, subsolar_point
+
+
+def test_solar_elevation_grid_matches_ephem():
+    longitudes, latitudes, elevations = solar_elevation_grid("2025-11-01", "09:30", 30.0)
+
+    assert elevations.shape == (6, 12)
+    assert longitudes[0] == -165.0 and latitudes[0] == 75.0 and latitudes[-1] == -75.0
+    for row, lat in enumerate(latitudes):
+        for column, lon in enumerate(longitudes):
+            expected = calculate_solar_elevation("2025/11/1", "09:30", float(lon), float(lat))
+            tolerance = ELEVATION_TOLERANCE_DEG if expected >= -1 else BELOW_HORIZON_TOLERANCE_DEG
+            assert elevations[row, column] == pytest.approx(expected, abs=tolerance)
+
+
+def test_subsolar_point_has_sun_overhead():
+    lon, lat = subsolar_point("2025-06-21", "12:00")
+
+    assert lat == pytest.approx(23.44, abs=0.01)
+    assert calculate_solar_elevation("2025/6/21", "12:00", lon, lat) == pytest.approx(90, abs=0.05)
+
+
+def test_get_solar_map_layout():
+    lines = get_solar_map("2025-06-21", "12:00", 10, current_char="@")
+
+    assert lines[0] == "Solar elevation map for 2025-06-21 12:00 UTC"
+    rows = lines[2:-2]
+    assert len(rows) == 9
+    assert all(len(row) == 4 + 1 + 36 + 1 for row in rows)
+    assert sum(row.count("@") for row in rows) == 1
+    # June: the sun is up all around the Arctic, and down all around the Antarctic
+    assert set(rows[-1][5:-1]) <= {" ", ".", ":"}
+    assert " " not in rows[0][5:-1]
+    assert lines[-1].strip().startswith(f"{MAP_BANDS[0][1]} ")
+
+
+def test_grid_columns_flatten_row_major():
+    longitudes, latitudes, elevations = solar_elevation_grid("2025-06-21", "12:00", 90.0)
+    columns = {name: values for name, _, values in grid_columns(longitudes, latitudes, elevations)}
+
+    assert list(columns["lon"]) == [-135.0, -45.0, 45.0, 135.0] * 2
+    assert list(columns["lat"]) == [45.0] * 4 + [-45.0] * 4
+    np.testing.assert_array_equal(columns["elevation_deg"], elevations.ravel())
@@ -0,0 +1,198 @@
+import pytest
+
+from uplook.cache import MemoryCache, ResultCache
+
+
+def test_get_or_compute_counts_hits_and_misses(tmp_path):
+    calls = []
+
+    def compute(lon, lat, date_str):
+        calls.append((lon, lat, date_str))
+        return ["06:53", "11:44", "16:33"]
+
+    with ResultCache(tmp_path) as cache:
+        first = cache.get_or_compute("summary", compute, -0.12, 51.51, "2025-11-01")
+        second = cache.get_or_compute("summary", compute, -0.12, 51.51, "2025-11-01")
+        stats = cache.stats()
+
+    assert first == second == ["06:53", "11:44", "16:33"]
+    assert len(calls) == 1
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_results_persist_between_instances(tmp_path):
+    with ResultCache(tmp_path) as cache:
+        cache.put("phase", ["Full Moon", 0.999], "2025-12-05")
+
+    with ResultCache(tmp_path) as cache:
+        assert cache.get("phase", "2025-12-05") == ["Full Moon", 0.999]
+
+
+@pytest.mark.parametrize(
+    "stored,looked_up,shared",
+    [
+        ((-0.12, 51.51), (-0.120004, 51.510003), True),
+        ((-0.12, 51.51), (-0.1201, 51.51), False),
+        ((0.0, 0.0), (-0.00001, 0.0), True),
+    ],
+)
+def test_coordinates_are_quantized(tmp_path, stored, looked_up, shared):
+    with ResultCache(tmp_path, precision=4) as cache:
+        cache.put("summary", ["06:53", "11:44", "16:33"], *stored, "2025-11-01")
+        found = cache.get("summary", *looked_up, "2025-11-01")
+
+    assert (found is not None) == shared
+
+
+def test_version_change_invalidates_results(tmp_path):
+    with ResultCache(tmp_path, version=1) as cache:
+        cache.put("phase", ["Full Moon", 0.999], "2025-12-05")
+
+    with ResultCache(tmp_path, version=2) as cache:
+        assert cache.get("phase", "2025-12-05") is None
+        assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    with ResultCache(tmp_path, max_entries=10) as cache:
+        for day in range(1, 11):
+            cache.put("phase", day, f"2025-12-{day:02d}")
+        # Touch the oldest entry so it is no longer the least recently used
+        assert cache.get("phase", "2025-12-01") == 1
+        cache.put("phase", 11, "2025-12-11")
+
+        stats = cache.stats()
+        assert stats["entries"] <= 10
+        assert stats["evictions"] > 0
+        assert cache.get("phase", "2025-12-01") == 1
+        assert cache.get("phase", "2025-12-02") is None
+        assert cache.get("phase", "2025-12-11") == 11
+
+
+def test_reopening_with_a_smaller_size_evicts(tmp_path):
+    with ResultCache(tmp_path) as cache:
+        for day in range(1, 21):
+            cache.put("phase", day, f"2025-12-{day:02d}")
+
+    with ResultCache(tmp_path, max_entries=5) as cache:
+        assert cache.stats()["entries"] <= 5
+
+
+def test_size_bound_holds_across_processes_sharing_a_file(tmp_path):
+    # Two caches on one file stand in for two service workers
+    with ResultCache(tmp_path, max_entries=10, autocommit=True) as first, \
+            ResultCache(tmp_path, max_entries=10, autocommit=True) as second:
+        for day in range(1, 9):
+            first.put("phase", day, f"2025-12-{day:02d}")
+            second.put("phase", day, f"2026-12-{day:02d}")
+        assert second.stats()["entries"] <= 10
+
+    with ResultCache(tmp_path, max_entries=10) as cache:
+        assert cache.stats()["entries"] <= 10
+
+
+def test_autocommit_results_are_visible_to_other_connections(tmp_path):
+    with ResultCache(tmp_path, autocommit=True) as writer, ResultCache(tmp_path) as reader:
+        writer.put("phase", ["Full Moon", 0.999], "2025-12-05")
+        assert reader.get("phase", "2025-12-05") == ["Full Moon", 0.999]
+
+
+@pytest.mark.parametrize("date", ["2025-11-01", "2025/11/1", "2025-11-1", "2025/11/01"])
+def test_date_formats_share_entries(tmp_path, date):
+    with ResultCache(tmp_path) as cache:
+        cache.put("phase", ["Waxing Gibbous", 0.74], "2025-11-01")
+        assert cache.get("phase", date) == ["Waxing Gibbous", 0.74]
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=3)
+    for day in range(1, 4):
+        cache.put("phase", day, f"2025-12-{day:02d}")
+    assert cache.get("phase", "2025-12-01") == 1
+    cache.put("phase", 4, "2025-12-04")
+
+    assert cache.get("phase", "2025-12-02") is None
+    assert [cache.get("phase", f"2025-12-{day:02d}") for day in (1, 3, 4)] == [1, 3, 4]
+    assert (cache.stats()["entries"], cache.stats()["evictions"]) == (3, 1)
+
+
+def test_memory_cache_bounds_estimated_size():
+    profile = [{"hour": hour, "time": f"{hour:02d}:00", "angle_deg": -10.5} for hour in range(24)]
+    cache = MemoryCache(max_bytes=30000)
+    for day in range(1, 11):
+        cache.put("profile:ephem", profile, 0.0, 0.0, f"2025-12-{day:02d}")
+    stats = cache.stats()
+
+    assert 0 < stats["bytes"] <= 30000
+    assert 0 < stats["entries"] < 10
+    assert cache.get("profile:ephem", 0.0, 0.0, "2025-12-10") is profile
+
+    cache.put("profile:ephem", profile * 100, 1.0, 1.0, "2025-12-01")
+    assert cache.get("profile:ephem", 1.0, 1.0, "2025-12-01") is None
+
+
+@pytest.mark.parametrize(
+    "precision,looked_up,shared",
+    [
+        (4, (-0.120004, 51.510003), True),
+        (4, (-0.1201, 51.51), False),
+        (2, (-0.1201, 51.514), True),
+        (5, (-0.12004, 51.51), False),
+    ],
+)
+def test_memory_cache_quantizes_to_chosen_precision(precision, looked_up, shared):
+    cache = MemoryCache(precision=precision)
+    cache.put("summary", ["06:53", "11:44", "16:33"], -0.12, 51.51, "2025-11-01")
+
+    assert (cache.get("summary", *looked_up, "2025/11/1") is not None) == shared
+
+
+def test_memory_cache_invalidation():
+    cache = MemoryCache()
+    for day in range(1, 4):
+        cache.put("phase", day, f"2025-12-{day:02d}")
+        cache.put("summary", day, 0.0, 0.0, f"2025-12-{day:02d}")
+
+    assert cache.invalidate("phase", "2025/12/1") == 1
+    assert cache.get("phase", "2025-12-01") is None
+    assert cache.invalidate("phase") == 2
+    assert cache.get("summary", 0.0, 0.0, "2025-12-01") == 1
+    assert cache.clear() == 3
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["invalidations"]) == (0, 0, 6)
+
+
+def test_memory_cache_in_front_of_result_cache(tmp_path):
+    with ResultCache(tmp_path) as disk:
+        disk.put("phase", ["Full Moon", 0.999], "2025-12-05")
+
+    with MemoryCache(backing=ResultCache(tmp_path)) as cache:
+        assert cache.get("phase", "2025-12-05") == ["Full Moon", 0.999]
+        assert cache.get("phase", "2025-12-05") == ["Full Moon", 0.999]
+        cache.put("phase", ["Waning Gibbous", 0.98], "2025-12-06")
+        stats = cache.stats()
+
+    assert (stats["hits"], stats["misses"], stats["backing"]["hits"]) == (1, 1, 1)
+    with ResultCache(tmp_path) as disk:
+        assert disk.get("phase", "2025-12-06") == ["Waning Gibbous", 0.98]
+
+
+def test_memoize_solar_and_lunar_functions():
+    from uplook.lunar.phase import build_lunation_table, get_moon_phase
+    from uplook.solar.elevation import calculate_daily_solar_profile, calculate_daily_solar_summary
+
+    cache = MemoryCache()
+    summary = cache.memoize("summary", calculate_daily_solar_summary)
+    profile = cache.memoize("profile", calculate_daily_solar_profile)
+    phase = cache.memoize("phase", get_moon_phase)
+
+    assert summary(-0.12, 51.51, "2025-11-01") == calculate_daily_solar_summary(-0.12, 51.51, "2025-11-01")
+    assert summary(-0.120001, 51.51, "2025/11/1") == ["06:53", "11:44", "16:33"]
+    assert profile(-0.12, 51.51, "2025-11-01", interval=30) == calculate_daily_solar_profile(-0.12, 51.51, "2025-11-01", 30)
+    assert len(profile(-0.12, 51.51, "2025-11-01")) == 24
+    assert phase("2025-11-01") == get_moon_phase("2025-11-01")
+    # The lunations table can't be part of a key, so the call is passed through
+    assert phase("2025-11-01", build_lunation_table("2025-10-01", "2025-12-01")) == get_moon_phase("2025-11-01")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 4, 4)
@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from uplook.executor import CheckpointError, run_chunks
+
+
+def square_all(chunk):
+    return [value * value for value in chunk]
+
+
+def slow_first(chunk):
+    # The first chunk finishes last
+    if chunk[0] == 0:
+        import time
+        time.sleep(0.2)
+    return square_all(chunk)
+
+
+CHUNKS = [[0, 1], [2, 3], [4, 5], [6]]
+EXPECTED = [[0, 1], [4, 9], [16, 25], [36]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_results_are_yielded_in_chunk_order(workers):
+    assert list(run_chunks(slow_first, CHUNKS, workers=workers)) == EXPECTED
+
+
+def test_chunks_are_read_lazily():
+    taken = []
+
+    def chunks():
+        for chunk in CHUNKS:
+            taken.append(chunk)
+            yield chunk
+
+    results = run_chunks(square_all, chunks(), workers=2, max_pending=2)
+    assert next(results) == [0, 1]
+    # The two handed out at first, plus one to replace the result taken
+    assert len(taken) == 3
+    results.close()
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path):
+    path = os.path.join(tmp_path, "job.checkpoint")
+    first = run_chunks(square_all, CHUNKS, workers=1, checkpoint=path, job={"name": "squares"})
+    assert [next(first), next(first)] == EXPECTED[:2]
+    first.close()
+
+    computed = []
+
+    def counted(chunk):
+        computed.append(chunk)
+        return square_all(chunk)
+
+    assert list(run_chunks(counted, CHUNKS, workers=1, checkpoint=path, job={"name": "squares"})) == EXPECTED
+    assert computed == CHUNKS[2:]
+
+
+def test_half_written_result_is_recomputed(tmp_path):
+    path = os.path.join(tmp_path, "job.checkpoint")
+    list(run_chunks(square_all, CHUNKS[:2], workers=1, checkpoint=path, job=1))
+    with open(path, "a") as f:
+        f.write('{"result":[16,')
+
+    assert list(run_chunks(square_all, CHUNKS, workers=1, checkpoint=path, job=1)) == EXPECTED
+    with open(path) as f:
+        assert [json.loads(line) for line in f][1:] == [{"result": result} for result in EXPECTED]
+
+
+def test_checkpoint_for_another_job_is_rejected(tmp_path):
+    path = os.path.join(tmp_path, "job.checkpoint")
+    list(run_chunks(square_all, CHUNKS, workers=1, checkpoint=path, job={"dates": ["2025-01-01", "2025-12-31"]}))
+
+    with pytest.raises(CheckpointError, match="different job"):
+        list(run_chunks(square_all, CHUNKS, workers=1, checkpoint=path, job={"dates": ["2025-01-01", "2026-12-31"]}))
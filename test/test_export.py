@@ -0,0 +1,68 @@
+import csv
+import json
+import math
+from array import array
+
+import numpy as np
+import pytest
+
+from uplook.export import read_table, write_table
+
+
+COLUMNS = [
+    ("lon", "float", array("d", [-0.12, 151.2093])),
+    ("date", "date", ["2025-11-01", "2025-11-02"]),
+    ("minute", "int", array("H", [0, 1439])),
+    ("phase", "str", ["Full Moon", "New Moon"]),
+    ("sunrise", "time", array("d", [1761980036.473734, math.nan])),
+    ("elevation_deg", "float", array("d", [12.345678901234567, -0.1])),
+]
+
+
+@pytest.mark.parametrize("fmt,name", [("npy", "table.npy"), ("npz", "table.npz")])
+def test_numpy_formats_round_trip(tmp_path, fmt, name):
+    path = str(tmp_path / name)
+    write_table(path, COLUMNS, fmt)
+    table = read_table(path)
+
+    assert list(table) == [name for name, _, _ in COLUMNS]
+    assert table["lon"].tolist() == [-0.12, 151.2093]
+    assert table["elevation_deg"][0] == 12.345678901234567
+    assert table["minute"].dtype == np.uint16
+    assert table["date"].tolist()[1].isoformat() == "2025-11-02"
+    assert str(table["sunrise"][0]) == "2025-11-01T06:53:56.473734"
+    assert np.isnat(table["sunrise"][1])
+    assert table["phase"].tolist() == ["Full Moon", "New Moon"]
+
+
+def test_npy_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "table.npy")
+    write_table(path, COLUMNS, "npy")
+    assert isinstance(read_table(path)["lon"], np.memmap)
+
+
+def test_csv_keeps_full_precision(tmp_path):
+    path = str(tmp_path / "table.csv")
+    write_table(path, COLUMNS, "csv")
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    assert float(rows[0]["elevation_deg"]) == 12.345678901234567
+    assert rows[0]["sunrise"] == "2025-11-01T06:53:56.473734Z"
+    assert rows[1]["sunrise"] == ""
+
+
+def test_json_is_one_list_per_column(tmp_path):
+    path = str(tmp_path / "table.json")
+    write_table(path, COLUMNS, "json")
+    with open(path) as f:
+        data = json.load(f)
+
+    assert data["minute"] == [0, 1439]
+    assert data["elevation_deg"] == [12.345678901234567, -0.1]
+    assert data["sunrise"] == ["2025-11-01T06:53:56.473734Z", None]
+
+
+def test_write_table_rejects_ragged_columns(tmp_path):
+    with pytest.raises(ValueError):
+        write_table(str(tmp_path / "table.csv"), [("a", "float", [1.0]), ("b", "float", [])], "csv")
@@ -0,0 +1,137 @@
+import asyncio
+import io
+import json
+import time
+
+import pytest
+
+from uplook.serve import QueryService, QueueFullError, serve, serve_lines
+
+
+def echo(query):
+    if query.get("fail"):
+        return {"error": "rejected"}
+    return {"echo": query}
+
+
+def slow(query):
+    time.sleep(query.get("sleep", 0.3))
+    return {"done": True}
+
+
+async def _request(port, method, target, body=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+        f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    return status, json.loads(body)
+
+
+async def _with_server(service, requests):
+    bound = asyncio.get_running_loop().create_future()
+    server = asyncio.create_task(serve(service, port=0, ready=lambda address: bound.set_result(address[1])))
+    port = await bound
+    try:
+        return await requests(port)
+    finally:
+        server.cancel()
+        service.close()
+
+
+@pytest.mark.parametrize(
+    "method,target,body,expected_status,expected",
+    [
+        ("GET", "/solar?lon=-0.12&lat=51.51", None, 200, {"echo": {"lon": "-0.12", "lat": "51.51", "command": "solar"}}),
+        ("GET", "/lunar/?date=2025-11-01", None, 200, {"echo": {"date": "2025-11-01", "command": "lunar"}}),
+        ("POST", "/", {"command": "lunar", "type": "image"}, 200, {"echo": {"command": "lunar", "type": "image"}}),
+        ("POST", "/solar", {"lon": 1.5}, 200, {"echo": {"lon": 1.5, "command": "solar"}}),
+        ("GET", "/solar?fail=1", None, 400, {"error": "rejected"}),
+        ("GET", "/nowhere", None, 404, {"error": "no such endpoint: GET /nowhere"}),
+        ("POST", "/", [1], 400, {"error": "invalid JSON body: expected a JSON object"}),
+    ],
+)
+def test_serve_routes_queries(method, target, body, expected_status, expected):
+    service = QueryService(echo, workers=1)
+    status, payload = asyncio.run(_with_server(service, lambda port: _request(port, method, target, body)))
+    assert status == expected_status
+    assert payload == expected
+
+
+def test_serve_health_reports_stats():
+    service = QueryService(echo, workers=1)
+
+    async def requests(port):
+        await _request(port, "GET", "/lunar")
+        return await _request(port, "GET", "/health")
+
+    status, payload = asyncio.run(_with_server(service, requests))
+    assert status == 200
+    assert payload["completed"] == 1
+    assert payload["workers"] == 1
+
+
+def test_query_service_rejects_when_queue_is_full():
+    service = QueryService(slow, workers=1, max_concurrency=1, max_queue=1)
+
+    async def run():
+        first = asyncio.create_task(service.submit({}))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(service.submit({}))
+        await asyncio.sleep(0.05)
+        with pytest.raises(QueueFullError):
+            await service.submit({})
+        return await asyncio.gather(first, second)
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        service.close()
+
+    assert results == [{"done": True}, {"done": True}]
+    assert service.stats()["rejected"] == 1
+
+
+def _serve_lines(service, lines):
+    stdout = io.StringIO()
+    try:
+        asyncio.run(serve_lines(service, io.StringIO("".join(lines)), stdout))
+    finally:
+        service.close()
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_serve_lines_answers_each_line():
+    lines = [
+        '{"id": 1, "command": "lunar"}\n',
+        "\n",
+        '{"id": "b", "fail": true}\n',
+        '{"command": "solar"}\n',
+        "[1]\n",
+        "not json\n",
+    ]
+    responses = _serve_lines(QueryService(echo, workers=1, max_concurrency=1), lines)
+
+    # Responses come back as they complete, and bad lines are answered straight away
+    assert len(responses) == 5
+    for expected in (
+        {"id": 1, "echo": {"command": "lunar"}},
+        {"id": "b", "error": "rejected"},
+        {"echo": {"command": "solar"}},
+        {"error": "expected a JSON object"},
+    ):
+        assert expected in responses
+    assert any(response.get("error", "").startswith("invalid JSON") for response in responses)
+
+
+def test_serve_lines_pipelines_queries():
+    lines = ['{"id": "slow", "sleep": 0.5}\n', '{"id": "fast", "sleep": 0}\n']
+    responses = _serve_lines(QueryService(slow, workers=2), lines)
+
+    assert [response["id"] for response in responses] == ["fast", "slow"]
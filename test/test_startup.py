@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+UPLOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "uplook", "uplook.py")
+
+
+def imported_modules(*argv):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", UPLOOK, *argv],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    return {line.rsplit("|", 1)[1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+
+
+@pytest.mark.parametrize(
+    "argv,unwanted",
+    [
+        (["lunar", "--type", "summary", "--date", "2025-11-01"], ("uplook.solar", "asyncio", "concurrent", "sqlite3", "numpy", "uplook.serve")),
+        (["solar", "--lon", "-0.12", "--lat", "51.51", "--date", "2025-11-01"], ("uplook.lunar", "asyncio", "concurrent", "sqlite3", "numpy", "uplook.serve")),
+    ],
+)
+def test_one_shot_commands_only_import_what_they_use(argv, unwanted):
+    modules = imported_modules(*argv)
+
+    assert "ephem" in modules
+    loaded = sorted(module for module in modules if any(module == name or module.startswith(name + ".") for name in unwanted))
+    assert loaded == []
@@ -0,0 +1,105 @@
+import multiprocessing
+import sys
+
+import ephem
+import pytest
+
+from uplook import timings
+from uplook.solar.batch import calculate_sites
+from uplook.solar.context import SolarDay
+
+
+class FakeClock:
+    """Stands in for the time module in timings: time only passes on sleep()."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+    def process_time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+clock = FakeClock()
+
+
+class Work:
+    @staticmethod
+    def outer():
+        clock.sleep(0.02)
+        Work.inner()
+
+    @staticmethod
+    def inner():
+        clock.sleep(0.03)
+
+    @staticmethod
+    def steps():
+        for step in range(3):
+            clock.sleep(0.01)
+            yield step
+
+
+def test_stages_are_exclusive_and_restored(monkeypatch):
+    monkeypatch.setattr(timings, "time", clock)
+    original = Work.__dict__["outer"]
+    with timings.record([(Work, "outer", "outer"), (Work, "inner", "inner"), (Work, "steps", "steps")]) as recorded:
+        Work.outer()
+        for _ in Work.steps():
+            clock.sleep(0.02)
+        report = recorded.report()
+
+    stages = report["stages"]
+    assert stages["outer"]["calls"] == stages["inner"]["calls"] == 1
+    assert stages["outer"]["wall_s"] == pytest.approx(0.02)
+    assert stages["outer"]["cpu_s"] == pytest.approx(0.02)
+    assert stages["inner"]["wall_s"] == pytest.approx(0.03)
+    # The consumer's time between steps is left out
+    assert stages["steps"]["wall_s"] == pytest.approx(0.03)
+    assert report["wall_s"] == pytest.approx(0.14)
+    assert Work.__dict__["outer"] is original
+
+
+def test_ephem_calls_are_counted_only_while_recording():
+    original = ephem.Observer
+    with timings.record() as recorded:
+        SolarDay(-0.12, 51.51, "2025-11-01").summary
+        ephem.previous_new_moon("2025/11/1")
+        calls = recorded.report()["ephem_calls"]
+
+    assert calls["Observer"] == calls["Sun"] == 1
+    assert calls["Observer.next_rising"] == calls["Observer.next_setting"] == 1
+    assert calls["previous_new_moon"] == 1
+    assert ephem.Observer is original
+
+
+def test_solar_day_stages():
+    targets = [(SolarDay, "_compute_profile", "compute profile"), (SolarDay, "_compute_events", "compute summary")]
+    with timings.record(targets) as recorded:
+        solar_day = SolarDay(-0.12, 51.51, "2025-11-01", engine="noaa")
+        solar_day.profile
+        solar_day.summary
+        report = recorded.report()
+
+    assert report["stages"]["compute profile"]["calls"] == 1
+    assert report["stages"]["compute summary"]["calls"] == 1
+    # The analytic engine doesn't compute the sun with pyephem
+    assert report["ephem_calls"]["Sun.compute"] < 50
+
+
+def test_forked_workers_are_included():
+    if "fork" not in multiprocessing.get_all_start_methods() or sys.platform == "darwin":
+        return
+    sites = [(float(lon), 51.0) for lon in range(6)]
+    targets = [(SolarDay, "_compute_profile", "compute profile")]
+    with timings.record(targets) as recorded:
+        list(calculate_sites(sites, "2025-11-01", workers=2))
+        report = recorded.report()
+
+    assert report["stages"]["compute profile"]["calls"] == len(sites)
+    assert report["ephem_calls"]["Observer"] == len(sites)
@@ -0,0 +1,3 @@
+from .uplook import main
+
+main()
@@ -0,0 +1,376 @@
+import json
+import os
+import sqlite3
+import sys
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache, wraps
+
+# Bump whenever a cached computation changes its results, so that entries written by
+# an older algorithm are discarded rather than served
+CACHE_VERSION = 1
+
+CACHE_FILENAME = "uplook-cache.sqlite3"
+
+# Writes grouped into one transaction when not in autocommit mode
+_COMMIT_EVERY = 1000
+
+
+class ResultCache:
+    """
+    A persistent, size-bounded cache of computed results, stored in SQLite.
+
+    Entries are keyed on a kind (e.g. 'summary') plus the arguments of the call.
+    Float arguments such as longitude and latitude are rounded to `precision`
+    decimal places, so sites closer together than that share results. Once more
+    than `max_entries` results are stored, the least recently used are evicted.
+
+    By default writes are committed in batches and when the cache is closed, which
+    suits a single command line run. A long-lived process sharing the file with
+    others (such as a service worker) should use autocommit, so that it never holds
+    the write lock between results.
+    """
+
+    def __init__(self, directory, max_entries=100000, precision=4, version=CACHE_VERSION, autocommit=False):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, CACHE_FILENAME)
+        self.max_entries = max_entries
+        self.precision = precision
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None if autocommit else "DEFERRED")
+        self._uncommitted = 0
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, version INTEGER NOT NULL,"
+            " value TEXT NOT NULL, accessed INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        # Results from any other algorithm version are no longer valid
+        self._db.execute("DELETE FROM results WHERE version != ?", (self.version,))
+        self._db.commit()
+        self._entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        # Access counter used to order entries for least recently used eviction
+        self._clock = self._db.execute("SELECT COALESCE(MAX(accessed), 0) FROM results").fetchone()[0]
+        if self._entries > self.max_entries:
+            self._evict()
+            self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Writes any pending results to disk and closes the database."""
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+    def _key(self, kind, args):
+        return "|".join([kind, *map(str, _quantize(args, self.precision))])
+
+    def get(self, kind, *args):
+        """
+        Returns the cached result for kind and args, or None on a miss.
+        """
+        key = self._key(kind, args)
+        row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._clock += 1
+        self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (self._clock, key))
+        self._written()
+        return json.loads(row[0])
+
+    def put(self, kind, value, *args):
+        """
+        Stores a JSON-serialisable result for kind and args, evicting the least
+        recently used results if the cache is full.
+        """
+        key = self._key(kind, args)
+        exists = self._db.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone()
+        self._clock += 1
+        self._db.execute(
+            "INSERT OR REPLACE INTO results (key, version, value, accessed) VALUES (?, ?, ?, ?)",
+            (key, self.version, json.dumps(value), self._clock)
+        )
+        if exists is None:
+            self._entries += 1
+            # Other processes may be adding to the same file, so check the real size
+            # now and then rather than trusting this process's own count
+            if self._entries > self.max_entries or self._entries % self._recount_every == 0:
+                self._entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if self._entries > self.max_entries:
+            self._evict()
+        self._written()
+
+    @property
+    def _recount_every(self):
+        return max(1, self.max_entries // 100)
+
+    def _written(self):
+        if self._db.isolation_level is None:
+            return
+        self._uncommitted += 1
+        if self._uncommitted >= _COMMIT_EVERY:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def _evict(self):
+        # Evict a little below the limit, so a full cache doesn't evict on every put.
+        # Keeping the newest `target` rows bounds the file whatever other processes did.
+        target = int(self.max_entries * 0.9)
+        cursor = self._db.execute(
+            "DELETE FROM results WHERE key IN"
+            " (SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+            (target,)
+        )
+        self.evictions += max(cursor.rowcount, 0)
+        self._entries = target
+
+    def get_or_compute(self, kind, compute, *args):
+        """
+        Returns the cached result for kind and args, calling compute(*args) and
+        storing its result on a miss.
+        """
+        value = self.get(kind, *args)
+        if value is None:
+            value = compute(*args)
+            self.put(kind, value, *args)
+        return value
+
+    def stats(self):
+        """
+        Returns hit/miss statistics for this session and the current cache size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+        }
+
+
+class MemoryCache:
+    """
+    An in-process least recently used cache of computed results, bounded in both
+    entries and memory, with the same get, put and get_or_compute interface as
+    ResultCache.
+
+    Keys are quantized in the same way: float arguments are rounded to `precision`
+    decimal places and dates normalised, so queries for sites closer together than
+    that share results. Once there are more than `max_entries` results, or their
+    estimated size passes `max_bytes`, the least recently used are evicted.
+
+    Values are kept as they are, not copied, so callers must not modify the
+    results they get back.
+
+    With a `backing` cache (such as a ResultCache), misses are looked up there
+    before being computed, and new results are stored in both, so the memory cache
+    sits in front of the persistent one.
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=64 * 2**20, precision=4, backing=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.precision = precision
+        self.backing = backing
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+        # key -> (value, estimated size), least recently used first
+        self._entries = OrderedDict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def close(self):
+        """Closes the backing cache, if any."""
+        if self.backing is not None:
+            self.backing.close()
+
+    def _key(self, kind, args):
+        return (kind, *_quantize(args, self.precision))
+
+    def get(self, kind, *args):
+        """
+        Returns the cached result for kind and args, or None on a miss.
+        """
+        key = self._key(kind, args)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        if self.backing is None:
+            return None
+        value = self.backing.get(kind, *args)
+        if value is not None:
+            self._store(key, value)
+        return value
+
+    def put(self, kind, value, *args):
+        """
+        Stores a result for kind and args (and in the backing cache, if any),
+        evicting the least recently used results if the cache is full.
+        """
+        self._store(self._key(kind, args), value)
+        if self.backing is not None:
+            self.backing.put(kind, value, *args)
+
+    def _store(self, key, value):
+        size = _sizeof(value)
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous[1]
+        if size > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def get_or_compute(self, kind, compute, *args):
+        """
+        Returns the cached result for kind and args, calling compute(*args) and
+        storing its result on a miss.
+        """
+        value = self.get(kind, *args)
+        if value is None:
+            value = compute(*args)
+            self.put(kind, value, *args)
+        return value
+
+    def memoize(self, kind, function):
+        """
+        Returns a wrapper around function that caches its results as kind, keyed on
+        its arguments, e.g. memoize('summary', calculate_daily_solar_summary). Calls
+        with unhashable arguments (such as get_moon_phase's lunations table) are
+        passed straight through.
+        """
+        @wraps(function)
+        def memoized(*args, **kwargs):
+            key_args = (*args, *sorted(kwargs.items())) if kwargs else args
+            try:
+                hash(key_args)
+            except TypeError:
+                return function(*args, **kwargs)
+            return self.get_or_compute(kind, lambda *_: function(*args, **kwargs), *key_args)
+        return memoized
+
+    def invalidate(self, kind=None, *args):
+        """
+        Removes results from the memory cache (the backing cache is left alone):
+        the result for kind and args if args are given, every result of kind if
+        only kind is, or everything.
+
+        Returns:
+            int: The number of results removed
+        """
+        if kind is None:
+            keys = list(self._entries)
+        elif args:
+            key = self._key(kind, args)
+            keys = [key] if key in self._entries else []
+        else:
+            keys = [key for key in self._entries if key[0] == kind]
+        for key in keys:
+            self.bytes -= self._entries.pop(key)[1]
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        """Removes every result from the memory cache, returning how many there were."""
+        return self.invalidate()
+
+    def stats(self):
+        """
+        Returns hit/miss statistics for this session and the current cache size,
+        with those of the backing cache under "backing".
+        """
+        lookups = self.hits + self.misses
+        stats = {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "precision": self.precision,
+        }
+        if self.backing is not None:
+            stats["backing"] = self.backing.stats()
+        return stats
+
+
+def _quantize(args, precision):
+    """
+    Returns args with floats rounded to precision decimal places and dates
+    normalised, as used in cache keys.
+    """
+    parts = []
+    for arg in args:
+        if isinstance(arg, float):
+            # Normalise -0.0 so it shares entries with 0.0
+            arg = round(arg, precision) + 0.0
+        elif isinstance(arg, str):
+            arg = _normalise_date(arg)
+        parts.append(arg)
+    return parts
+
+
+def _sizeof(value):
+    """
+    Estimates the memory used by a result made of lists, tuples, dicts, strings
+    and numbers. Objects shared between results (such as interned dict keys) are
+    counted every time, so this errs on the high side.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(key) + _sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_sizeof(item) for item in value)
+    return size
+
+
+@lru_cache(maxsize=4096)
+def _normalise_date(value):
+    """
+    Returns 'YYYY-MM-DD' for any date format uplook accepts ('2025/11/1',
+    '2025-11-01', ...) so that they share cache entries. Other strings are
+    returned unchanged.
+    """
+    try:
+        return datetime.strptime(value.replace('/', '-'), "%Y-%m-%d").date().isoformat()
+    except ValueError:
+        return value
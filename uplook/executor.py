@@ -0,0 +1,155 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointError(ValueError):
+    """Raised when a checkpoint file can't be read, or belongs to a different job."""
+
+
+def run_chunks(function, chunks, workers=None, max_pending=None, checkpoint=None, job=None):
+    """
+    Calls function on every chunk of a job on a pool of worker processes, yielding
+    the results in chunk order whatever order they finish in.
+
+    Chunks are read from the iterable lazily, and no more than max_pending are
+    handed out before the oldest result has been taken, so memory stays bounded
+    however large the job and however slow the consumer.
+
+    With a checkpoint file, each result is appended to it as it is yielded. Running
+    the same job again with the same file yields the saved results from it rather
+    than recomputing them, and carries on from the first unfinished chunk, so an
+    interrupted run can be resumed. The file is left in place; delete it once the
+    results have been used.
+
+    Args:
+        function: Function of one chunk, picklable (defined at module level)
+        chunks: Iterable of picklable chunks, the same on every run of a job
+        workers (int): Number of worker processes (defaults to the CPU count). With
+            a single worker, or a single chunk, no pool is started.
+        max_pending (int): Most chunks handed out but not yet yielded (defaults to
+            twice the number of workers)
+        checkpoint (str): Optional path of a checkpoint file. Results must then be
+            JSON-serialisable, and are yielded in their JSON form (lists, not tuples).
+        job: JSON-serialisable description of the job, saved in the checkpoint so
+            that it is never resumed by a different job
+
+    Yields:
+        The result of function(chunk) for each chunk, in order
+
+    Raises:
+        CheckpointError: If the checkpoint file is unreadable or for another job
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_pending is None:
+        max_pending = 2 * workers
+
+    chunks = iter(chunks)
+    log = None
+    if checkpoint is not None:
+        done, offset = _read_checkpoint(checkpoint, job)
+        log = open(checkpoint, 'r+b' if offset else 'wb')
+    try:
+        if log is not None:
+            if offset:
+                yield from done
+                # Drop any half-written line left by the interruption
+                log.truncate(offset)
+                log.seek(offset)
+                chunks = islice(chunks, done.count, None)
+            else:
+                _write_line(log, json.dumps({"checkpoint": CHECKPOINT_VERSION, "job": job}))
+
+        for result in _map_ordered(function, chunks, workers, max_pending):
+            if log is not None:
+                text = json.dumps(result, separators=(',', ':'))
+                _write_line(log, f'{{"result":{text}}}')
+                result = json.loads(text)
+            yield result
+    finally:
+        if log is not None:
+            log.close()
+
+
+def _map_ordered(function, chunks, workers, max_pending):
+    first = list(islice(chunks, 2))
+    if workers <= 1 or len(first) <= 1:
+        yield from map(function, first)
+        yield from map(function, chunks)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque()
+    chunks = chain(first, chunks)
+    try:
+        for chunk in islice(chunks, max_pending):
+            pending.append(executor.submit(function, chunk))
+        while pending:
+            result = pending.popleft().result()
+            # Hand out the next chunk before yielding, so workers stay busy while
+            # the consumer handles this result
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(function, chunk))
+            yield result
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _Saved:
+    """Iterates over the results saved in a checkpoint file, counting them."""
+
+    def __init__(self, path, start, end):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.count = 0
+
+    def __iter__(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.start)
+            while f.tell() < self.end:
+                yield json.loads(f.readline())["result"]
+                self.count += 1
+
+
+def _read_checkpoint(path, job):
+    """
+    Checks a checkpoint file against job, and finds the end of its last complete
+    result without keeping the results in memory.
+
+    Returns:
+        tuple: (saved, offset): an iterable of the saved results, and the offset
+               after the last complete one, or 0 if there is no checkpoint yet
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return _Saved(path, 0, 0), 0
+    with open(path, 'rb') as f:
+        header = f.readline()
+        try:
+            header = json.loads(header)
+        except ValueError:
+            raise CheckpointError(f"{path}: not a checkpoint file")
+        if not isinstance(header, dict) or header.get("checkpoint") != CHECKPOINT_VERSION:
+            raise CheckpointError(f"{path}: not a checkpoint file, or from another version")
+        if header.get("job") != json.loads(json.dumps(job)):
+            raise CheckpointError(f"{path}: checkpoint is for a different job")
+        start = end = f.tell()
+        for line in iter(f.readline, b''):
+            if not line.endswith(b'\n'):
+                break
+            try:
+                json.loads(line)["result"]
+            except (ValueError, KeyError, TypeError):
+                break
+            end = f.tell()
+    return _Saved(path, start, end), end
+
+
+def _write_line(log, text):
+    log.write(text.encode() + b'\n')
+    log.flush()
@@ -0,0 +1,118 @@
+import csv
+import json
+import math
+import sys
+from array import array
+from datetime import datetime, UTC
+
+FORMATS = ('csv', 'json', 'npy', 'npz')
+
+# Column kinds, and how each is stored in NumPy output:
+#   'float'    float64
+#   'int'      int64, or the array's own type for array.array columns
+#   'str'      fixed-width unicode
+#   'date'     datetime64[D], from 'YYYY-MM-DD' strings
+#   'time'     datetime64[us] (NaT when missing), from Unix seconds (NaN when missing)
+KINDS = ('float', 'int', 'str', 'date', 'time')
+
+
+def write_table(path, columns, fmt):
+    """
+    Writes a table of equal-length columns in a machine-readable format.
+
+    'npy' writes one structured array with a fixed-width record per row, which
+    numpy.load can memory-map; 'npz' writes one array per column. Both are built
+    from whole columns, so no Python object is made per row, and array.array
+    columns are used without copying. 'csv' and 'json' (one list per column) write
+    floats at full precision, times as ISO 8601 UTC, and missing values as empty
+    cells or null. NumPy is only needed for 'npy' and 'npz'.
+
+    Args:
+        path (str): File to write, or '-' for stdout
+        columns (list): [(name, kind, values), ...], with kinds from KINDS
+        fmt (str): One of FORMATS
+    """
+    lengths = {len(values) for _, _, values in columns}
+    if len(lengths) > 1:
+        raise ValueError("all columns must be the same length")
+    for name, kind, _ in columns:
+        if kind not in KINDS:
+            raise ValueError(f"unknown kind {kind!r} for column {name!r}")
+
+    binary = fmt in ('npy', 'npz')
+    if path == '-':
+        stream = sys.stdout.buffer if binary else sys.stdout
+        _write(stream, columns, fmt)
+        stream.flush()
+        return
+    with open(path, 'wb' if binary else 'w', newline='' if fmt == 'csv' else None) as stream:
+        _write(stream, columns, fmt)
+
+
+def _write(stream, columns, fmt):
+    if fmt == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow([name for name, _, _ in columns])
+        writer.writerows(zip(*(_text_values(kind, values, '') for _, kind, values in columns)))
+    elif fmt == 'json':
+        json.dump({name: list(_text_values(kind, values, None)) for name, kind, values in columns}, stream)
+        stream.write("\n")
+    elif fmt == 'npy':
+        import numpy as np
+        arrays = [(name, _to_numpy(kind, values)) for name, kind, values in columns]
+        length = len(arrays[0][1]) if arrays else 0
+        table = np.empty(length, dtype=[(name, values.dtype) for name, values in arrays])
+        for name, values in arrays:
+            table[name] = values
+        np.save(stream, table)
+    elif fmt == 'npz':
+        import numpy as np
+        np.savez(stream, **{name: _to_numpy(kind, values) for name, kind, values in columns})
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+
+
+def read_table(path):
+    """
+    Reads a table written by write_table in 'npy' or 'npz' format.
+
+    Returns:
+        dict: {name: numpy array}; 'npy' columns are views of a memory-mapped file
+    """
+    import numpy as np
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    table = np.load(path, mmap_mode='r')
+    return {name: table[name] for name in table.dtype.names}
+
+
+def _to_numpy(kind, values):
+    import numpy as np
+    if isinstance(values, array) and kind in ('float', 'int', 'time'):
+        values = np.frombuffer(values, dtype=values.typecode)
+    if kind == 'float':
+        return np.asarray(values, dtype=np.float64)
+    if kind == 'int':
+        return values if isinstance(values, np.ndarray) else np.asarray(values, dtype=np.int64)
+    if kind == 'str':
+        return np.asarray(values, dtype=str)
+    if kind == 'date':
+        return np.asarray(values, dtype='datetime64[D]')
+    seconds = np.asarray(values, dtype=np.float64)
+    missing = np.isnan(seconds)
+    times = np.round(np.where(missing, 0.0, seconds) * 1e6).astype(np.int64).view('datetime64[us]')
+    times[missing] = np.datetime64('NaT')
+    return times
+
+
+def _text_values(kind, values, missing):
+    if kind == 'time':
+        return (missing if math.isnan(t) else _iso_time(t) for t in values)
+    if kind == 'float':
+        return (missing if math.isnan(v) else v for v in values)
+    return values
+
+
+def _iso_time(seconds):
+    return datetime.fromtimestamp(seconds, UTC).isoformat(timespec='microseconds').replace('+00:00', 'Z')
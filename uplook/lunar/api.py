@@ -0,0 +1,25 @@
+import numpy as np
+
+from ..solar.api import as_days
+from .phase import build_lunation_table, get_moon_phase
+
+
+def phases(dates):
+    """
+    Calculates the moon's phase on every date, from a single lunation table covering
+    them all.
+
+    Args:
+        dates: Dates to calculate for (see uplook.solar.api.as_days)
+
+    Returns:
+        tuple: (names, fractions): a string array of phase names and a float array
+               of illuminated fractions, one of each per date
+    """
+    days = [str(day) for day in as_days(dates)]
+    if not days:
+        return np.array([], dtype=str), np.array([], dtype=float)
+
+    lunations = build_lunation_table(min(days), max(days))
+    names, fractions = zip(*(get_moon_phase(day, lunations) for day in days))
+    return np.array(names), np.array(fractions)
@@ -0,0 +1,25 @@
+from array import array
+
+import ephem
+
+
+def phase_columns(rows):
+    """
+    Builds export columns of lunar phases, one row per date.
+
+    Args:
+        rows: Iterable of (date_str, phase_name, fraction)
+
+    Returns:
+        list: [(name, kind, values), ...] for export.write_table
+    """
+    dates, phases, fractions = [], [], array('d')
+    for date_str, phase_name, fraction in rows:
+        dates.append(ephem.Date(date_str).datetime().date().isoformat())
+        phases.append(phase_name)
+        fractions.append(fraction)
+    return [
+        ("date", "date", dates),
+        ("phase", "str", phases),
+        ("fraction", "float", fractions),
+    ]
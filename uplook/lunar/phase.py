@@ -1,3 +1,5 @@
+from bisect import bisect_right
+
 import ephem
 
 
@@ -36,13 +38,53 @@ def determine_phase_name(fraction, age, full_moon_age=14.77):
     return "Last Quarter"
 
 
-def get_moon_phase(date_str):
+def build_lunation_table(start_str, end_str):
+    """
+    Builds a sorted table of new moon instants covering every date from start_str
+    to end_str, for use with get_moon_phase.
+
+    Args:
+        start_str (str): First date the table must cover ('YYYY-MM-DD')
+        end_str (str): Last date the table must cover ('YYYY-MM-DD')
+
+    Returns:
+        list: New moon instants as ephem dates (floats), from the new moon before
+              start_str to the first new moon after end_str
+    """
+    start = ephem.Date(start_str.replace('-', '/') + " 00:00:00")
+    end = ephem.Date(end_str.replace('-', '/') + " 00:00:00")
+
+    new_moon = ephem.previous_new_moon(start)
+    lunations = [float(new_moon)]
+    while new_moon <= end:
+        new_moon = ephem.next_new_moon(new_moon)
+        lunations.append(float(new_moon))
+    return lunations
+
+
+def previous_new_moon(date, lunations=None):
+    """
+    Finds the last new moon before the given ephem date.
+
+    With a lunation table covering the date this is a bisect lookup; otherwise
+    it falls back to pyephem's iterative search.
+    """
+    if lunations:
+        index = bisect_right(lunations, date) - 1
+        if 0 <= index < len(lunations) - 1:
+            return lunations[index]
+    return ephem.previous_new_moon(date)
+
+
+def get_moon_phase(date_str, lunations=None):
     """
     Calculates the illuminated fraction and descriptive phase name of the moon
     for a given date. Assumes date is provided in 'YYYY-MM-DD' format.
 
     Args:
         date_str (str): The date to calculate the phase for.
+        lunations (list): Optional table from build_lunation_table, used to look up
+            the previous new moon instead of searching for it.
 
     Returns:
         phase_name (str): The name of the Lunar phase on the provided date
@@ -59,11 +101,11 @@ def get_moon_phase(date_str):
 
     # 3. Key Values
     current_date_ephem = ephem.Date(date_str_pyephem)
-    prev_new_moon_date = ephem.previous_new_moon(date_str_pyephem)
+    prev_new_moon_date = previous_new_moon(current_date_ephem, lunations)
     fraction = moon.moon_phase  # Illuminated fraction (0.0 to 1.0)
     age = current_date_ephem - prev_new_moon_date  # Age in days (0.0 to ~29.53)
 
     # 4. Determine Descriptive Phase Name
     phase_name = determine_phase_name(fraction, age)
 
-    return phase_name, fraction
\ No newline at end of file
+    return phase_name, fraction
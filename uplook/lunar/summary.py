@@ -25,3 +25,23 @@ def get_lunar_summary(phase, fraction, date_str):
     percent = fraction_to_percent_string(fraction)
     return [f"Lunar profile for {date_str}: {phase} ({percent} illuminated)"]
 
+
+def get_lunar_calendar_header(start_str, end_str):
+    """
+    Renders the heading of a multi-day Lunar phase calendar
+    """
+    return [
+        f"Lunar profile from {start_str} to {end_str}",
+        "{:<10} {:<16} {:>11}".format("Date", "Phase", "Illuminated"),
+        "-" * 39
+    ]
+
+def get_lunar_calendar_row(phase, fraction, date_str):
+    """
+    Renders one day of a Lunar phase calendar
+    """
+    percent = fraction_to_percent_string(fraction)
+    return ["{:<10} {:<16} {:>11}".format(date_str, phase, percent)]
+
+def get_lunar_calendar_footer():
+    return ["-" * 39]
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+
+class QueueFullError(Exception):
+    """Raised when a query arrives while the service's queue is already full."""
+
+
+def _started():
+    """No-op run once per worker so that the pool starts all its processes."""
+
+
+class QueryService:
+    """
+    Runs queries on a pool of worker processes, with a bound on how many run at once
+    and how many may wait for their turn.
+
+    The worker processes live as long as the service, so anything they set up or
+    cache (imports, pyephem state, result caches) stays warm between queries.
+
+    Args:
+        handler: Module-level function taking a query dict and returning a
+            JSON-serialisable response dict. It runs in the worker processes.
+        workers (int): Number of worker processes (defaults to the CPU count)
+        max_concurrency (int): Queries running at once (defaults to workers)
+        max_queue (int): Queries allowed to wait for a free slot before new ones are
+            rejected with QueueFullError
+        initializer: Optional function run once in each worker process
+        initargs (tuple): Arguments for initializer
+    """
+
+    def __init__(self, handler, workers=None, max_concurrency=None, max_queue=100, initializer=None, initargs=()):
+        self.handler = handler
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.workers
+        self.max_queue = max_queue
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=initializer, initargs=initargs
+        )
+        # Start the workers now, before any connection is accepted. Workers forked
+        # later would inherit the open client sockets, and closing a connection in
+        # the server would then never reach the client.
+        for future in [self.executor.submit(_started) for _ in range(self.workers)]:
+            future.result()
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self._slots = None
+
+    async def submit(self, query):
+        """
+        Runs one query in the worker pool once a slot is free, and returns its response.
+        """
+        if self._slots is None:
+            # Created here so that it belongs to the running event loop
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self.waiting >= self.max_queue and self._slots.locked():
+            self.rejected += 1
+            raise QueueFullError(f"queue is full ({self.max_queue} queries waiting)")
+
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.handler, query)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+# Largest request body accepted, in bytes
+_MAX_BODY = 1024 * 1024
+
+
+def _route(method, target, body):
+    """
+    Turns an HTTP request into a query dict.
+
+    GET /solar?lon=-0.12&lat=51.51 and GET /lunar?date=2025-11-01 take their options
+    from the query string. POST / takes the whole query, including "command", as a
+    JSON object, and POST /solar or /lunar take the options as a JSON object.
+
+    Returns:
+        dict: The query, or None if the path is not a query endpoint
+    """
+    url = urlsplit(target)
+    path = url.path.rstrip('/')
+    query = dict(parse_qsl(url.query))
+    if method == 'POST' and body:
+        fields = json.loads(body)
+        if not isinstance(fields, dict):
+            raise ValueError("expected a JSON object")
+        query.update(fields)
+    if path in ('/solar', '/lunar'):
+        query['command'] = path[1:]
+    elif not (path == '' and method == 'POST'):
+        return None
+    return query
+
+
+async def _respond(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+
+async def _handle_request(service, method, target, body):
+    """Returns (status, payload) for one request."""
+    if method == 'GET' and urlsplit(target).path == '/health':
+        return 200, service.stats()
+
+    try:
+        query = _route(method, target, body)
+    except ValueError as e:
+        return 400, {"error": f"invalid JSON body: {e}"}
+    if query is None:
+        return 404, {"error": f"no such endpoint: {method} {target}"}
+
+    try:
+        response = await service.submit(query)
+    except QueueFullError as e:
+        return 503, {"error": str(e)}
+    except Exception as e:
+        return 500, {"error": str(e)}
+    return (400 if "error" in response else 200), response
+
+
+async def _handle_connection(service, reader, writer):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            method, target, version = request_line.decode('latin-1').split(maxsplit=2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            if length > _MAX_BODY:
+                await _respond(writer, 413, {"error": "request body too large"}, False)
+                break
+            body = await reader.readexactly(length) if length else b''
+
+            keep_alive = headers.get('connection', '').lower() != 'close' and version.strip() == 'HTTP/1.1'
+            status, payload = await _handle_request(service, method.upper(), target, body)
+            await _respond(writer, status, payload, keep_alive)
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service, host='127.0.0.1', port=8765, ready=None):
+    """
+    Serves queries over HTTP/JSON until cancelled.
+
+    Args:
+        service (QueryService): Runs the queries
+        host (str): Address to listen on (localhost by default)
+        port (int): Port to listen on
+        ready: Optional callback, called with the bound (host, port) once listening
+    """
+    server = await asyncio.start_server(
+        lambda reader, writer: _handle_connection(service, reader, writer), host, port
+    )
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[:2])
+    async with server:
+        await server.serve_forever()
+
+
+async def _answer_line(service, line):
+    """Returns the response for one JSON-lines query, carrying over its "id"."""
+    try:
+        query = json.loads(line)
+    except ValueError as e:
+        return {"error": f"invalid JSON: {e}"}
+    if not isinstance(query, dict):
+        return {"error": "expected a JSON object"}
+
+    has_id = "id" in query
+    query_id = query.pop("id", None)
+    try:
+        response = await service.submit(query)
+    except Exception as e:
+        response = {"error": str(e)}
+    if has_id:
+        response = {"id": query_id, **response}
+    return response
+
+
+async def serve_lines(service, stdin=None, stdout=None):
+    """
+    Serves queries as JSON lines until stdin is closed: one query object per line on
+    stdin, one response object per line on stdout.
+
+    Queries are pipelined, so responses are written as they complete rather than in
+    input order; a query's "id" is copied to its response to match them up. Once
+    max_concurrency + max_queue queries are in progress, reading pauses until one
+    completes, so a fast writer is slowed down rather than rejected.
+
+    Args:
+        service (QueryService): Runs the queries
+        stdin: Text stream to read queries from (defaults to sys.stdin)
+        stdout: Text stream to write responses to (defaults to sys.stdout)
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    loop = asyncio.get_running_loop()
+    in_progress = asyncio.Semaphore(service.max_concurrency + service.max_queue)
+    pending = set()
+
+    async def answer(line):
+        try:
+            response = await _answer_line(service, line)
+        finally:
+            in_progress.release()
+        stdout.write(json.dumps(response) + "\n")
+        stdout.flush()
+
+    while True:
+        await in_progress.acquire()
+        # Read in a thread, as stdin may be a pipe, a terminal or a regular file
+        line = await loop.run_in_executor(None, stdin.readline)
+        if not line:
+            in_progress.release()
+            break
+        if not line.strip():
+            in_progress.release()
+            continue
+        task = asyncio.create_task(answer(line))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    if pending:
+        await asyncio.wait(pending)
@@ -0,0 +1,15 @@
+"""
+Solar calculations.
+
+The batch API, profiles(sites, dates) and events(sites, dates), needs numpy, so
+it is only imported when first used (see api.py).
+"""
+
+__all__ = ['profiles', 'events']
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import api
+        return getattr(api, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,178 @@
+import math
+from datetime import datetime
+
+from .profile import SolarProfile
+from .refraction import TABLE_LOW_DEG, TABLE_STEP_DEG, refraction_table, refract_deg, unrefract_deg
+
+# Largest difference (degrees) between analytic and pyephem elevations for dates
+# from 1900 to 2100 at any latitude, with the Sun above -1°. Below that, pyephem's
+# refraction model stretches differences in the true altitude up to about threefold,
+# to within BELOW_HORIZON_TOLERANCE_DEG. Checked in the tests; see
+# bench/bench_engines.py for the full comparison.
+ELEVATION_TOLERANCE_DEG = 0.01
+BELOW_HORIZON_TOLERANCE_DEG = 0.02
+
+# Julian date of the ephem epoch (1899-12-31 12:00 UTC); ephem dates are days since it
+EPHEM_EPOCH_JD = 2415020.0
+
+_J2000_JD = 2451545.0
+# Julian date of midnight UTC at the start of day 0 of the proleptic Gregorian calendar
+_ORDINAL_JD = 1721424.5
+
+# Horizontal parallax of the Sun, and its apparent radius at 1 AU, in degrees
+_PARALLAX_DEG = 0.00244
+_RADIUS_DEG = 0.266564
+
+_sin, _cos, _asin, _atan2 = math.sin, math.cos, math.asin, math.atan2
+_RAD = math.pi / 180
+_DEG = 180 / math.pi
+
+
+def julian_date(date_str):
+    """Returns the Julian date of midnight UTC at the start of a 'YYYY-MM-DD' or 'YYYY/MM/DD' date."""
+    day = datetime.strptime(date_str.replace('/', '-'), "%Y-%m-%d")
+    return day.toordinal() + _ORDINAL_JD
+
+
+def sun_coordinates(jd):
+    """
+    Calculates the apparent position of the Sun with the NOAA solar calculator
+    formulae (from Meeus' Astronomical Algorithms), plus nutation and the largest
+    lunar perturbation.
+
+    Args:
+        jd (float): Julian date (UT)
+
+    Returns:
+        tuple: (declination, right ascension, equation of the equinoxes), in degrees
+    """
+    t = (jd - _J2000_JD) / 36525
+    mean_longitude = 280.46646 + t * (36000.76983 + t * 0.0003032)
+    mean_anomaly = (357.52911 + t * (35999.05029 - 0.0001537 * t)) * _RAD
+    centre = (_sin(mean_anomaly) * (1.914602 - t * (0.004817 + 0.000014 * t))
+              + _sin(2 * mean_anomaly) * (0.019993 - 0.000101 * t)
+              + _sin(3 * mean_anomaly) * 0.000289)
+
+    node = (125.04 - 1934.136 * t) * _RAD
+    nutation = -0.00478 * _sin(node) - 0.00037 * _sin(2 * mean_longitude * _RAD)
+    moon_elongation = (297.85036 + 445267.111480 * t) * _RAD
+    # Aberration (-0.00569°), nutation and the Moon's pull on the Earth
+    longitude = (mean_longitude + centre - 0.00569 + nutation + 0.00179 * _sin(moon_elongation)) * _RAD
+
+    mean_obliquity = 23 + (26 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60) / 60
+    obliquity = (mean_obliquity + 0.00256 * _cos(node)) * _RAD
+
+    declination = _asin(_sin(obliquity) * _sin(longitude)) * _DEG
+    right_ascension = _atan2(_cos(obliquity) * _sin(longitude), _cos(longitude)) * _DEG
+    return declination, right_ascension, nutation * _cos(obliquity)
+
+
+def sun_distance(jd):
+    """Returns the distance of the Sun from the Earth, in AU, from the same formulae as sun_coordinates."""
+    t = (jd - _J2000_JD) / 36525
+    mean_anomaly = (357.52911 + t * (35999.05029 - 0.0001537 * t)) * _RAD
+    centre = (_sin(mean_anomaly) * (1.914602 - t * (0.004817 + 0.000014 * t))
+              + _sin(2 * mean_anomaly) * (0.019993 - 0.000101 * t)
+              + _sin(3 * mean_anomaly) * 0.000289)
+    eccentricity = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+    anomaly = mean_anomaly + centre * _RAD
+    return 1.000001018 * (1 - eccentricity * eccentricity) / (1 + eccentricity * _cos(anomaly))
+
+
+def horizon_altitude(jd):
+    """
+    Returns the geocentric altitude (degrees) of the Sun's centre at sunrise and
+    sunset as pyephem times them: with the top of the disc on the horizon, raised by
+    refraction, seen from the Earth's surface.
+    """
+    radius = _RADIUS_DEG / sun_distance(jd)
+    return unrefract_deg(-radius) + _PARALLAX_DEG
+
+
+def sidereal_time(jd):
+    """Returns Greenwich mean sidereal time, in degrees (not reduced to 0-360)."""
+    d = jd - _J2000_JD
+    t = d / 36525
+    return 280.46061837 + 360.98564736629 * d + t * t * (0.000387933 - t / 38710000)
+
+
+def true_elevation(declination, hour_angle, latitude):
+    """
+    Returns the geocentric altitude (degrees), corrected for parallax, of a body at a
+    declination and hour angle, seen from a latitude (all in degrees).
+    """
+    lat = latitude * _RAD
+    dec = declination * _RAD
+    s = _sin(dec) * _sin(lat) + _cos(dec) * _cos(lat) * _cos(hour_angle * _RAD)
+    altitude = _asin(-1.0 if s < -1.0 else 1.0 if s > 1.0 else s)
+    return altitude * _DEG - _PARALLAX_DEG * _cos(altitude)
+
+
+def solar_elevation(jd, longitude, latitude):
+    """
+    Calculates the solar angle of elevation analytically, with pyephem's refraction
+    model, to within ELEVATION_TOLERANCE_DEG of calculate_solar_elevation.
+
+    Args:
+        jd (float): Julian date (UT)
+        longitude (float): Longitude in decimal degrees, east positive
+        latitude (float): Latitude in decimal degrees, north positive
+
+    Returns:
+        float: Elevation in degrees
+    """
+    declination, right_ascension, equinoxes = sun_coordinates(jd)
+    hour_angle = sidereal_time(jd) + equinoxes + longitude - right_ascension
+    return refract_deg(true_elevation(declination, hour_angle, latitude), refraction_table())
+
+
+def calculate_daily_solar_profile_analytic(longitude, latitude, date_str, interval=60, digits=2):
+    """
+    Generates the same profile as calculate_daily_solar_profile with the analytic
+    solar position, as a SolarProfile with elevations rounded to `digits` places
+    (None for full precision).
+
+    The sine of the Sun's declination and its hour angle are calculated at the start,
+    middle and end of the day and interpolated quadratically between them, which is
+    exact to far better than 0.0001°, so each sample costs a handful of floating
+    point operations and no objects besides its result.
+    """
+    start = julian_date(date_str)
+    sines, hour_angles = [], []
+    for half in (0.0, 0.5, 1.0):
+        declination, right_ascension, equinoxes = sun_coordinates(start + half)
+        sines.append(_sin(declination * _RAD))
+        hour_angles.append(sidereal_time(start + half) + equinoxes + longitude - right_ascension)
+    s0, s1, s2 = sines
+    # Keep the hour angles continuous through the day, and small
+    h0 = hour_angles[0] % 360
+    h1 = h0 + (hour_angles[1] - hour_angles[0]) % 360
+    h2 = h1 + (hour_angles[2] - hour_angles[1]) % 360
+
+    sin_lat, cos_lat = _sin(latitude * _RAD), _cos(latitude * _RAD)
+    table = refraction_table()
+    top = len(table) - 2
+    # round(angle * scale) / scale is several times quicker than round(angle, digits),
+    # and can only differ from it in the last place of the rounded value
+    scale = None if digits is None else 10 ** digits
+
+    minutes = range(0, 24 * 60, interval)
+    angles = []
+    for minute in minutes:
+        x = minute / 1440
+        # Quadratic through x = 0, 0.5 and 1
+        a, b, c = 2 * (x - 0.5) * (x - 1), -4 * x * (x - 1), 2 * x * (x - 0.5)
+        sin_dec = a * s0 + b * s1 + c * s2
+        s = sin_dec * sin_lat + (1 - sin_dec * sin_dec) ** 0.5 * cos_lat * _cos((a * h0 + b * h1 + c * h2) * _RAD)
+        altitude = _asin(-1.0 if s < -1.0 else 1.0 if s > 1.0 else s)
+        angle = altitude * _DEG - _PARALLAX_DEG * _cos(altitude)
+
+        # refract_deg, inlined as it is most of the cost of each sample
+        position = (angle - TABLE_LOW_DEG) / TABLE_STEP_DEG
+        if position >= 0:
+            i = int(position)
+            if i > top:
+                i = top
+            angle = table[i] + (position - i) * (table[i + 1] - table[i])
+        angles.append(angle if scale is None else round(angle * scale) / scale)
+    return SolarProfile(minutes, angles)
@@ -0,0 +1,105 @@
+from datetime import date, datetime
+
+import numpy as np
+
+from .analytic import EPHEM_EPOCH_JD
+from .context import SolarDay
+from .riseset import solar_events_array
+from .vectorized import solar_elevation_array
+
+# Julian date of the Unix epoch
+_UNIX_EPOCH_JD = 2440587.5
+# Most elevations computed in one vectorized call, to bound the size of temporaries
+_MAX_CELLS = 1 << 20
+
+
+def as_days(dates):
+    """
+    Converts a sequence of dates to a datetime64[D] array. Dates may be 'YYYY-MM-DD'
+    or 'YYYY/MM/DD' strings, date or datetime objects, or datetime64 values.
+    """
+    days = []
+    for value in np.atleast_1d(np.asarray(dates, dtype=object)):
+        if isinstance(value, str):
+            value = datetime.strptime(value.replace('/', '-'), "%Y-%m-%d").date()
+        elif isinstance(value, datetime):
+            value = value.date()
+        elif not isinstance(value, date):
+            value = np.datetime64(value, 'D')
+        days.append(np.datetime64(value, 'D'))
+    return np.array(days, dtype='datetime64[D]')
+
+
+def _sites_array(sites):
+    return np.asarray(sites, dtype=float).reshape(-1, 2)
+
+
+def profiles(sites, dates, interval=60, engine='numpy'):
+    """
+    Calculates the solar elevation profile of every site on every date.
+
+    With the default 'numpy' engine, all the samples are computed together in a few
+    vectorized passes, and elevations agree with pyephem to within 0.02° (0.04° with
+    the Sun below -1°) from 1900 to 2100. The 'ephem' and 'noaa' engines give the
+    same results as the command line's --engine options, computed one site and date
+    at a time.
+
+    Args:
+        sites: (lon, lat) pairs in decimal degrees, or an array of shape (sites, 2)
+        dates: Dates to calculate for (see as_days)
+        interval (int): Minutes between samples, starting at midnight UTC
+        engine (str): 'numpy', 'ephem' or 'noaa'
+
+    Returns:
+        tuple: (minutes, elevations): the sample times in minutes after midnight UTC,
+               and a float array of elevations in degrees, of shape
+               (sites, dates, samples)
+    """
+    sites = _sites_array(sites)
+    days = as_days(dates)
+    minutes = np.arange(0, 24 * 60, interval)
+    elevations = np.empty((len(sites), len(days), len(minutes)))
+
+    if engine == 'numpy':
+        timestamps = days.astype('datetime64[m]')[:, None] + minutes.astype('timedelta64[m]')
+        chunk = max(1, _MAX_CELLS // max(1, timestamps.size))
+        for first in range(0, len(sites), chunk):
+            lon = sites[first:first + chunk, 0, None, None]
+            lat = sites[first:first + chunk, 1, None, None]
+            elevations[first:first + chunk] = solar_elevation_array(timestamps, lon, lat)
+        return minutes, elevations
+
+    for i, (lon, lat) in enumerate(sites.tolist()):
+        for j, day in enumerate(days):
+            solar_day = SolarDay(lon, lat, str(day), engine=engine, interval=interval, precise=True)
+            elevations[i, j] = solar_day.profile.angles
+    return minutes, elevations
+
+
+def events(sites, dates):
+    """
+    Calculates sunrise, solar zenith and sunset for every site on every date, with
+    the vectorized solver (see solar_events_array), to within a few seconds of
+    pyephem.
+
+    Args:
+        sites: (lon, lat) pairs in decimal degrees, or an array of shape (sites, 2)
+        dates: Dates to calculate for (see as_days)
+
+    Returns:
+        tuple: (sunrise, zenith, sunset) datetime64[s] arrays of shape (sites, dates),
+               NaT where the sun does not rise or set
+    """
+    sites = _sites_array(sites)
+    days = as_days(dates)
+    times = np.full((3, len(sites), len(days)), np.nan)
+    for j, day in enumerate(days):
+        times[:, :, j] = solar_events_array(sites[:, 0], sites[:, 1], str(day))
+
+    # ephem dates to Unix seconds, keeping NaN as NaT
+    seconds = (times + EPHEM_EPOCH_JD - _UNIX_EPOCH_JD) * 86400
+    missing = np.isnan(seconds)
+    result = np.round(np.where(missing, 0.0, seconds)).astype(np.int64).view('datetime64[s]')
+    result[missing] = np.datetime64('NaT')
+    sunrise, zenith, sunset = result
+    return sunrise, zenith, sunset
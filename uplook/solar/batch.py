@@ -0,0 +1,226 @@
+import csv
+import hashlib
+import json
+import os
+from functools import partial
+
+from ..executor import run_chunks
+from .context import SolarDay, profile_kind
+from . import daterange
+from .profile import SolarProfile
+
+# Most sites handed to a worker at once
+_MAX_CHUNK = 256
+# (site, date) pairs handed to a worker at once by calculate_sites_range: enough
+# for the per-chunk overhead to be small, few enough for progress to be saved often
+RANGE_CHUNK = 2048
+
+
+class SiteError(ValueError):
+    """Raised for a site list entry that can't be read, with its line number."""
+
+
+def read_sites(stream):
+    """
+    Reads a list of sites from a CSV or JSON-lines stream.
+
+    CSV input needs a header row with 'lon' and 'lat' columns. JSON-lines input has
+    one object per line with 'lon' and 'lat' keys. The format is detected from the
+    first non-blank character ('{' means JSON-lines).
+
+    Returns:
+        list: [(lon, lat), ...] in input order
+
+    Raises:
+        SiteError: If a line is malformed, naming the line
+    """
+    numbered = [(number, line) for number, line in enumerate(stream, 1) if line.strip()]
+    if not numbered:
+        return []
+
+    if numbered[0][1].lstrip().startswith('{'):
+        records = []
+        for number, line in numbered:
+            try:
+                records.append((number, json.loads(line)))
+            except ValueError as e:
+                raise SiteError(f"line {number}: invalid JSON ({e})")
+    else:
+        reader = csv.DictReader((line for _, line in numbered), skipinitialspace=True)
+        records = zip((number for number, _ in numbered[1:]), reader)
+
+    return [_parse_site(number, record) for number, record in records]
+
+
+def _parse_site(number, record):
+    if not isinstance(record, dict):
+        raise SiteError(f"line {number}: expected an object with 'lon' and 'lat'")
+    for field in ('lon', 'lat'):
+        if record.get(field) is None:
+            raise SiteError(f"line {number}: missing '{field}'")
+    try:
+        return float(record['lon']), float(record['lat'])
+    except (TypeError, ValueError):
+        raise SiteError(f"line {number}: 'lon' and 'lat' must be numbers")
+
+
+def calculate_site(site, date_str, engine='ephem', interval=60):
+    """
+    Calculates the daily summary and profile for a single (lon, lat) site.
+
+    Returns:
+        tuple: (daily_summary, daily_profile)
+    """
+    lon, lat = site
+    solar_day = SolarDay(lon, lat, date_str, engine=engine, interval=interval)
+    return solar_day.summary, solar_day.profile
+
+
+def calculate_site_precise(site, date_str, engine='ephem', interval=60):
+    """
+    Calculates the exact event times and the full precision profile for a single
+    (lon, lat) site, for machine-readable export.
+
+    Returns:
+        tuple: (events, daily_profile)
+    """
+    lon, lat = site
+    solar_day = SolarDay(lon, lat, date_str, engine=engine, interval=interval, precise=True)
+    return solar_day.events, solar_day.profile
+
+
+def calculate_sites(sites, date_str, engine='ephem', interval=60, workers=None, cache=None, precise=False):
+    """
+    Calculates the daily summary and profile for every site, spreading the work over
+    a process pool. Results are yielded in the same order as the input sites.
+
+    Args:
+        sites (list): [(lon, lat), ...]
+        date_str (str): The date to calculate for
+        engine (str): Profile engine, 'ephem', 'noaa' or 'numpy'
+        interval (int): Minutes between profile samples
+        workers (int): Number of worker processes (defaults to the CPU count). With a
+            single worker, or a single site, no pool is started.
+        cache (ResultCache): Optional result cache. Sites found in it are not sent to
+            the pool, and newly calculated sites are stored in it.
+        precise (bool): Calculate as calculate_site_precise instead
+
+    Yields:
+        tuple: (daily_summary, daily_profile) for each site, or (events, daily_profile)
+               with precise
+    """
+    if cache is None:
+        yield from _calculate_uncached(sites, date_str, engine, interval, workers, precise)
+        return
+
+    summary_kind = 'events' if precise else 'summary'
+    kind = profile_kind(engine, interval, precise)
+    cached = []
+    for lon, lat in sites:
+        daily_summary = cache.get(summary_kind, lon, lat, date_str)
+        daily_profile = cache.get(kind, lon, lat, date_str)
+        if daily_summary is None or daily_profile is None:
+            cached.append(None)
+        else:
+            cached.append((daily_summary, SolarProfile.from_entries(daily_profile)))
+
+    missing = [site for site, result in zip(sites, cached) if result is None]
+    calculated = _calculate_uncached(missing, date_str, engine, interval, workers, precise)
+    for site, result in zip(sites, cached):
+        if result is None:
+            result = next(calculated)
+            lon, lat = site
+            cache.put(summary_kind, result[0], lon, lat, date_str)
+            cache.put(kind, result[1].to_list(), lon, lat, date_str)
+        yield result
+    calculated.close()
+
+
+def _calculate_uncached(sites, date_str, engine, interval, workers, precise=False):
+    worker = partial(
+        calculate_site_precise if precise else calculate_site, date_str=date_str, engine=engine, interval=interval
+    )
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(sites) <= 1:
+        yield from map(worker, sites)
+        return
+
+    # Hand out work in a few chunks per worker to keep the IPC overhead low, but keep
+    # chunks small enough that the first results arrive quickly on huge inputs
+    chunksize = max(1, min(_MAX_CHUNK, len(sites) // (workers * 4)))
+    chunks = (sites[first:first + chunksize] for first in range(0, len(sites), chunksize))
+    for results in run_chunks(partial(_map_list, worker), chunks, workers):
+        yield from results
+
+
+def _map_list(function, items):
+    return list(map(function, items))
+
+
+def calculate_sites_range(sites, start_str, end_str, workers=None, chunk_size=RANGE_CHUNK, checkpoint=None):
+    """
+    Calculates the exact sunrise, zenith and sunset times of every site on every
+    date in a range, spreading the work over a process pool (see run_chunks).
+
+    The (site, date) pairs are taken site by site, every date of the first site
+    then every date of the next, and split into chunks of chunk_size pairs. Each
+    worker runs calculate_solar_events_range over the dates of each site in its
+    chunk, so both many sites and a long range of dates at one site are spread
+    over the workers. Results are yielded in the same site by site order.
+
+    Args:
+        sites (list): [(lon, lat), ...]
+        start_str (str): The first date
+        end_str (str): The last date, inclusive
+        workers (int): Number of worker processes (defaults to the CPU count)
+        chunk_size (int): (site, date) pairs per chunk
+        checkpoint (str): Optional checkpoint file, to resume an interrupted run
+            from without recomputing the chunks it finished
+
+    Yields:
+        tuple: (lon, lat, date_str, events), with events as returned by
+               calculate_observer_events ([] when the sun does not rise or set)
+
+    Raises:
+        CheckpointError: If the checkpoint file is for a different job
+    """
+    sites = [(float(lon), float(lat)) for lon, lat in sites]
+    dates = list(daterange.iter_dates(start_str, end_str))
+    total = len(sites) * len(dates)
+    chunks = (_range_chunk(sites, dates, first, min(first + chunk_size, total)) for first in range(0, total, chunk_size))
+    job = None
+    if checkpoint is not None:
+        digest = hashlib.sha256(json.dumps(sites).encode()).hexdigest()
+        job = {"job": "solar events", "sites": digest, "dates": dates[:1] + dates[-1:], "chunk_size": chunk_size}
+
+    pair = 0
+    for results in run_chunks(_calculate_range_chunk, chunks, workers, checkpoint=checkpoint, job=job):
+        for events in results:
+            lon, lat = sites[pair // len(dates)]
+            yield lon, lat, dates[pair % len(dates)], events
+            pair += 1
+
+
+def _range_chunk(sites, dates, first, end):
+    """
+    Returns the (site, date) pairs first to end (in site by site order) as runs of
+    consecutive dates at one site: [(lon, lat, start_str, end_str), ...].
+    """
+    runs = []
+    while first < end:
+        site, day = divmod(first, len(dates))
+        last = min(len(dates), day + end - first) - 1
+        runs.append((*sites[site], dates[day], dates[last]))
+        first += last - day + 1
+    return runs
+
+
+def _calculate_range_chunk(runs):
+    # Called through the module, so that --timings sees it
+    return [
+        events
+        for lon, lat, start_str, end_str in runs
+        for _, events in daterange.calculate_solar_events_range(lon, lat, start_str, end_str)
+    ]
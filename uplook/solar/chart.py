@@ -1,85 +1,165 @@
 import math
+from bisect import bisect_left, bisect_right
 from datetime import datetime, UTC
 
+from .context import SolarDay
+from .polar import NORMAL, POLAR_DAY, POLAR_NIGHT
+from .profile import SolarProfile
 
-def get_solar_chart(daily_profile, chart_rows, data_char, current_char, current_hour=None):
+
+def get_solar_chart(daily_profile, chart_rows, data_char, current_char, current_hour=None, width=None):
     """
     Renders the solar elevation profile as a simple ASCII chart.
 
+    daily_profile may be a SolarDay, in which case its profile is computed here.
+
     If current_hour is provided, it will be used instead of the runtime UTC hour. This
     makes the function easier to test deterministically.
+
+    If width is provided, the plot is kept within that many characters: samples are
+    spaced out as usual if they fit, drawn side by side if they fit that way, and
+    otherwise grouped into width columns, each showing the highest sample in it.
     """
+    return list(iter_solar_chart(daily_profile, chart_rows, data_char, current_char, current_hour, width))
 
-    # 1. Filter out values below the horizon (elevation <= 0)
-    sun_above_horizon = [p for p in daily_profile if p['angle_deg'] > 0]
 
-    if not sun_above_horizon:
-        return ["Note: The sun is below the horizon for the entire day at this location/date."]
+def iter_solar_chart(daily_profile, chart_rows, data_char, current_char, current_hour=None, width=None):
+    """
+    Generates the same lines as get_solar_chart one row at a time.
 
-    # 2. Determine the chart ceiling (max elevation rounded up to nearest 10)
-    max_elevation = max(p['angle_deg'] for p in sun_above_horizon)
-    # Round up to the nearest 10
-    chart_ceiling = math.ceil(max_elevation / 10.0) * 10
+    Every sample is visited once: it is assigned to its column and then to the row
+    for its elevation, and each row is built from its own preallocated buffer.
+    """
+    chart = SolarChart(daily_profile, chart_rows, data_char, current_char, width)
+    if chart.note is not None:
+        yield chart.note
+        return
 
-    # Get the current hour in UTC for marking (use provided current_hour if set)
+    # The current time, to the minute (the start of the hour if current_hour is set)
     if current_hour is None:
-        current_utc_hour = datetime.now(UTC).hour
+        now = datetime.now(UTC)
+        current_minute = now.hour * 60 + now.minute
     else:
-        current_utc_hour = int(current_hour)
-
-    # 3. Scale and Plotting
-
-    if chart_rows < 2:
-        chart_rows = 2
-    if chart_rows > 30:
-        chart_rows = 30
-    # Calculate the height interval for each row
-    height_interval = chart_ceiling / chart_rows
-
-    # Generate the chart rows from top (max angle) to bottom (0 degrees)
-    chart_output = []
-
-    for row_index in range(chart_rows):
-        # Calculate the angle represented by the bottom of the current row segment
-        angle_low = (chart_rows - 1 - row_index) * height_interval
-        # Calculate the angle represented by the top of the current row segment
-        angle_high = angle_low + height_interval
-
-        row_content = []
-
-        # Iterate through all 24 hours (columns)
-        for hour_data in daily_profile:
-            angle = hour_data['angle_deg']
-            hour = hour_data['hour']
-
-            # Check if the angle falls within the current row segment
-            if angle_low < angle <= angle_high:
-                # Determine the character to use
-                if hour == current_utc_hour:
-                    char = current_char
-                else:
-                    char = data_char
-                row_content.append(char)
-            else:
-                # Space for hours not in this row segment or below 0 degrees
-                row_content.append(' ')
-
-        # Determine the Y-axis label
-        if row_index == 0:
-            # Top row label is the ceiling
-            label = f"{chart_ceiling}°"
-        elif row_index == chart_rows - 1:
-            # Bottom row label is 0 degrees
-            label = "0° "
-        else:
-            # Intermediate rows are unlabeled
-            label = "   "
+        current_minute = int(current_hour) * 60
+    yield from chart.lines(chart.column_at(current_minute))
 
-        chart_output.append(f"{label} | {' '.join(row_content)}")
 
-    # 4. Generate the footer
+class SolarChart:
+    """
+    A solar elevation chart laid out once, so that it can be drawn again with the
+    current time in another column without going back over the profile (see
+    watch_solar_chart).
 
-    # Separator line
-    separator = " " * 4 + "-" * 48
-    chart_output.append(separator)
-    return chart_output
+    Takes the same arguments as get_solar_chart, apart from the current time. If
+    there is nothing to plot, note holds the message shown instead of the chart.
+    """
+
+    def __init__(self, daily_profile, chart_rows, data_char, current_char, width=None):
+        self.data_char = data_char
+        self.current_char = current_char
+        self.note = None
+        self.minutes = []
+        self._columns = 0
+
+        state = NORMAL
+        if isinstance(daily_profile, SolarDay):
+            state = daily_profile.state
+            if state == POLAR_NIGHT:
+                # Nothing to plot, so the profile isn't computed
+                self.note = "Note: Polar night, the sun is below the horizon for the entire day at this location/date."
+                return
+            daily_profile = daily_profile.profile
+
+        # Read the columns directly rather than building a dict per sample
+        profile = SolarProfile.from_entries(daily_profile)
+        minutes, angles = profile.minutes, profile.angles
+
+        # 1. Nothing to plot unless some of the profile is above the horizon
+        if not angles or max(angles) <= 0:
+            self.note = "Note: The sun is below the horizon for the entire day at this location/date."
+            return
+
+        # 2. Determine the chart ceiling (max elevation rounded up to nearest 10)
+        chart_ceiling = math.ceil(max(angles) / 10.0) * 10
+
+        # 3. Bucket the samples into columns
+
+        samples = len(angles)
+        if width is None or 2 * samples - 1 <= width:
+            columns, spacer = samples, ' '
+        else:
+            columns, spacer = min(samples, width), ''
+        tops = [0.0] * columns
+        for index, angle in enumerate(angles):
+            column = index * columns // samples
+            if angle > tops[column]:
+                tops[column] = angle
+        self.minutes = list(minutes)
+        self._columns = columns
+        self._spacer = spacer
+
+        # 4. Plot each column in the row for its elevation
+
+        if chart_rows < 2:
+            chart_rows = 2
+        if chart_rows > 30:
+            chart_rows = 30
+        # Row k from the bottom covers elevations above k * height_interval, up to and
+        # including the next row's
+        height_interval = chart_ceiling / chart_rows
+        row_tops = [k * height_interval + height_interval for k in range(chart_rows)]
+
+        self._grid = [[' '] * columns for _ in range(chart_rows)]
+        # The grid row of each column's mark, or None if it has none
+        self._rows = [None] * columns
+        for column, angle in enumerate(tops):
+            if angle <= 0:
+                continue
+            row = chart_rows - 1 - bisect_left(row_tops, angle)
+            self._grid[row][column] = data_char
+            self._rows[column] = row
+
+        # Y-axis labels: the ceiling on the top row, 0 degrees on the bottom one, and
+        # the intermediate rows unlabeled
+        self._labels = [f"{chart_ceiling}° | "] + ["    | "] * (chart_rows - 2) + ["0°  | "]
+
+        # 5. Generate the footer
+
+        # Separator line, reaching one past the plot
+        plot_width = columns * len(spacer + ' ') - len(spacer)
+        self._footer = [" " * 4 + "-" * (plot_width + 1)]
+        if state == POLAR_DAY:
+            self._footer.append("Note: Polar day, the sun is above the horizon for the entire day at this location/date.")
+
+    def column_at(self, minute):
+        """Returns the column of the last sample at or before minute, or None."""
+        index = bisect_right(self.minutes, minute) - 1
+        if index < 0:
+            return None
+        return index * self._columns // len(self.minutes)
+
+    def cell(self, column):
+        """
+        Returns where the mark of a column is drawn, as (line, offset) in the lines
+        of the chart, or None if the column has no mark (or there is no chart).
+        """
+        if column is None or self.note is not None or self._rows[column] is None:
+            return None
+        row = self._rows[column]
+        return row, len(self._labels[row]) + column * (len(self._spacer) + 1)
+
+    def lines(self, current_column=None):
+        """
+        Generates the lines of the chart, with current_column's mark drawn as the
+        current time.
+        """
+        if self.note is not None:
+            yield self.note
+            return
+        current_row = self._rows[current_column] if current_column is not None else None
+        for row_index, row_content in enumerate(self._grid):
+            if row_index == current_row:
+                row_content = list(row_content)
+                row_content[current_column] = self.current_char
+            yield self._labels[row_index] + self._spacer.join(row_content)
+        yield from self._footer
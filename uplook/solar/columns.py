@@ -0,0 +1,97 @@
+import math
+from array import array
+
+import ephem
+
+from .polar import NORMAL, classify_ephem_day
+from .profile import SolarProfile
+
+# ephem dates count days from 1899/12/31 12:00 UTC
+_UNIX_EPOCH = float(ephem.Date('1970/1/1'))
+
+
+def _iso_date(date_str):
+    return ephem.Date(date_str).datetime().date().isoformat()
+
+
+def event_columns(rows):
+    """
+    Builds export columns of exact sunrise, zenith and sunset times, one row per
+    site and date.
+
+    Args:
+        rows: Iterable of (lon, lat, date_str, events), with events as returned by
+            calculate_observer_events ([] when the sun does not rise or set)
+
+    Returns:
+        list: [(name, kind, values), ...] for export.write_table; times are Unix
+              seconds, NaN when there is no event, and the state is 'normal',
+              'polar day' or 'polar night' (see classify_day)
+    """
+    lons, lats, dates, states = array('d'), array('d'), [], []
+    times = (array('d'), array('d'), array('d'))
+    for lon, lat, date_str, events in rows:
+        lons.append(lon)
+        lats.append(lat)
+        dates.append(_iso_date(date_str))
+        for column, event in zip(times, events or (None, None, None)):
+            column.append(math.nan if event is None else (event - _UNIX_EPOCH) * 86400)
+        states.append(classify_ephem_day(lat, ephem.Date(date_str)) if not events else NORMAL)
+    return [
+        ("lon", "float", lons),
+        ("lat", "float", lats),
+        ("date", "date", dates),
+        ("sunrise", "time", times[0]),
+        ("zenith", "time", times[1]),
+        ("sunset", "time", times[2]),
+        ("state", "str", states),
+    ]
+
+
+def profile_columns(rows):
+    """
+    Builds export columns of solar elevations, one row per sample.
+
+    The samples are copied column by column from each profile, so no Python object
+    is made per sample.
+
+    Args:
+        rows: Iterable of (lon, lat, date_str, profile)
+
+    Returns:
+        list: [(name, kind, values), ...] for export.write_table
+    """
+    lons, lats, dates = array('d'), array('d'), []
+    minutes, angles = array('H'), array('d')
+    for lon, lat, date_str, profile in rows:
+        profile = SolarProfile.from_entries(profile)
+        count = len(profile)
+        lons.extend(array('d', [lon]) * count)
+        lats.extend(array('d', [lat]) * count)
+        dates.extend([_iso_date(date_str)] * count)
+        minutes.extend(profile.minutes)
+        angles.extend(profile.angles)
+    return [
+        ("lon", "float", lons),
+        ("lat", "float", lats),
+        ("date", "date", dates),
+        ("minute", "int", minutes),
+        ("elevation_deg", "float", angles),
+    ]
+
+
+def grid_columns(longitudes, latitudes, elevations):
+    """
+    Builds export columns of solar elevations over a longitude/latitude grid, one
+    row per cell, as returned by solar_elevation_grid (numpy arrays).
+
+    Returns:
+        list: [(name, kind, values), ...] for export.write_table, with rows from north
+              to south and west to east within each
+    """
+    rows, columns = elevations.shape
+    return [
+        ("lon", "float", longitudes[None, :].repeat(rows, axis=0).ravel()),
+        ("lat", "float", latitudes[:, None].repeat(columns, axis=1).ravel()),
+        ("elevation_deg", "float", elevations.ravel()),
+    ]
@@ -0,0 +1,138 @@
+import ephem
+
+from .analytic import calculate_daily_solar_profile_analytic
+from .elevation import create_observer, calculate_observer_profile, calculate_observer_events, format_events
+from .polar import classify_ephem_day
+from .profile import SolarProfile
+
+
+def profile_kind(engine, interval, precise=False):
+    """Returns the result cache kind for profiles from an engine at an interval."""
+    kind = f"profile:{engine}"
+    if interval != 60:
+        kind += f":{interval}m"
+    if precise:
+        kind += ":precise"
+    return kind
+
+
+class SolarDay:
+    """
+    The solar calculations for one site on one date.
+
+    Each result is computed the first time it is used and then kept, and all of
+    them share a single parsed date, Observer and Sun. Renderers take a SolarDay,
+    so output that only needs the summary never computes the profile.
+
+    Args:
+        longitude (float): Longitude of the site in decimal degrees
+        latitude (float): Latitude of the site in decimal degrees
+        date_str (str): The date, in any format pyephem accepts ('YYYY-MM-DD', 'YYYY/MM/DD')
+        engine (str): Profile engine, 'ephem', 'noaa' or 'numpy'
+        interval (int): Minutes between profile samples
+        precise (bool): Keep profile elevations at full precision instead of rounding
+            them to 0.01°
+        cache (ResultCache): Optional result cache to read results from and store them in
+        summary (list): Optional precomputed summary, e.g. from a batch worker
+        profile (list): Optional precomputed profile, e.g. from a batch worker
+        events (list): Optional precomputed event times, e.g. from a batch worker
+    """
+
+    def __init__(self, longitude, latitude, date_str, engine='ephem', interval=60, precise=False, cache=None,
+                 summary=None, profile=None, events=None):
+        self.longitude = longitude
+        self.latitude = latitude
+        self.date_str = date_str
+        self.engine = engine
+        self.interval = interval
+        self.precise = precise
+        self.cache = cache
+        self._date = None
+        self._observer = None
+        self._sun = None
+        self._summary = summary
+        self._profile = profile
+        self._events = events
+        self._state = None
+
+    @property
+    def date(self):
+        """Midnight UTC at the start of the day, as an ephem.Date"""
+        if self._date is None:
+            self._date = ephem.Date(self.date_str)
+        return self._date
+
+    @property
+    def observer(self):
+        if self._observer is None:
+            self._observer = create_observer(self.longitude, self.latitude)
+        return self._observer
+
+    @property
+    def sun(self):
+        if self._sun is None:
+            self._sun = ephem.Sun()
+        return self._sun
+
+    @property
+    def profile(self):
+        """Solar elevations every `interval` minutes, as returned by calculate_daily_solar_profile"""
+        if self._profile is None:
+            if self.cache is None:
+                self._profile = self._compute_profile()
+            else:
+                # The cache holds the JSON form, a list of dicts
+                entries = self._cached(profile_kind(self.engine, self.interval, self.precise), lambda: self._compute_profile().to_list())
+                self._profile = SolarProfile.from_entries(entries)
+        return self._profile
+
+    @property
+    def events(self):
+        """Exact sunrise, zenith and sunset times, as returned by calculate_observer_events"""
+        if self._events is None:
+            self._events = self._cached("events", self._compute_events)
+        return self._events
+
+    @property
+    def state(self):
+        """Whether the day is normal, polar day or polar night, as returned by classify_day"""
+        if self._state is None:
+            self._state = classify_ephem_day(self.latitude, self.date)
+        return self._state
+
+    @property
+    def summary(self):
+        """Sunrise, zenith and sunset times, as returned by calculate_daily_solar_summary"""
+        if self._summary is None:
+            self._summary = self._cached("summary", self._compute_summary)
+        return self._summary
+
+    def _cached(self, kind, compute):
+        if self.cache is None:
+            return compute()
+        return self.cache.get_or_compute(
+            kind, lambda *args: compute(), self.longitude, self.latitude, self.date_str
+        )
+
+    def _compute_profile(self):
+        if self.engine == 'noaa':
+            return calculate_daily_solar_profile_analytic(
+                self.longitude, self.latitude, self.date_str, self.interval, digits=self._digits
+            )
+        if self.engine == 'numpy':
+            # Imported here so that ephem-only output never loads numpy
+            from .vectorized import calculate_daily_solar_profile_vectorized
+            return calculate_daily_solar_profile_vectorized(
+                self.longitude, self.latitude, self.date_str, self.interval, digits=self._digits
+            )
+        return calculate_observer_profile(self.observer, self.sun, self.date, self.interval, digits=self._digits)
+
+    @property
+    def _digits(self):
+        return None if self.precise else 2
+
+    def _compute_events(self):
+        return calculate_observer_events(self.observer, self.sun, self.date)
+
+    def _compute_summary(self):
+        return format_events(self.events)
@@ -0,0 +1,171 @@
+import math
+from datetime import datetime, timedelta
+
+import ephem
+
+from .elevation import format_events
+from .polar import NORMAL, classify_ephem_day
+
+_RISING = -1
+_TRANSIT = 0
+_SETTING = 1
+
+# Iterations allowed when refining a seeded event before falling back to pyephem
+_MAX_ITERATIONS = 6
+# A single hour angle step smaller than this (about 9 seconds) leaves a residual well
+# below pyephem's own 0.1 second precision, so no confirming iteration is needed
+_SETTLED_STEP = 1e-4
+
+
+def iter_dates(start_str, end_str):
+    """
+    Yields every date from start_str to end_str inclusive as 'YYYY-MM-DD' strings.
+    Accepts the same 'YYYY-MM-DD' or 'YYYY/MM/DD' formats as the rest of uplook.
+    """
+    day = datetime.strptime(start_str.replace('/', '-'), "%Y-%m-%d").date()
+    end = datetime.strptime(end_str.replace('/', '-'), "%Y-%m-%d").date()
+    while day <= end:
+        yield day.isoformat()
+        day += timedelta(days=1)
+
+
+def _refine_event(observer, sun, guess, kind, pressure):
+    """
+    Refines a predicted rising, transit or setting time with the same hour angle
+    iteration pyephem uses, starting from a guess that is already close.
+
+    The observer must have its pressure set to 0, as pyephem does while searching;
+    the real pressure is only used to place the refracted horizon.
+
+    Returns:
+        float: The event time as an ephem date, or None if the sun does not cross
+               the horizon or the iteration does not converge.
+    """
+    lat = observer.lat
+    date = guess
+    for _ in range(_MAX_ITERATIONS):
+        observer.date = date
+        sun.compute(observer)
+
+        if kind == _TRANSIT:
+            target_ha = 0.0
+        else:
+            horizon = ephem.unrefract(pressure, observer.temp, -sun.radius)
+            arg = ((math.sin(horizon) - math.sin(lat) * math.sin(sun.dec))
+                   / (math.cos(lat) * math.cos(sun.dec)))
+            if not -1.0 <= arg <= 1.0:
+                return None
+            target_ha = kind * math.acos(arg)
+
+        difference = (target_ha - sun.ha + math.pi) % (2 * math.pi) - math.pi
+        bump = difference / (2 * math.pi)
+        date += bump
+        if abs(bump) < _SETTLED_STEP:
+            return date
+    return None
+
+
+def _follows(first, second):
+    """True if second is the first event of its kind after first (within one day)."""
+    return second is not None and 0 < second - first < 1
+
+
+def calculate_solar_summary_range(longitude, latitude, start_str, end_str):
+    """
+    Generates the sunrise, solar zenith and sunset times for every date in a range.
+
+    Times agree with calculate_daily_solar_summary to within a minute (both round
+    down to HH:MM, so sub-second differences can move a time across a minute
+    boundary); see calculate_solar_events_range.
+
+    Yields:
+        tuple: (date_str, summary) where summary is [<sunrise>, <zenith>, <sunset>]
+               in HH:MM format (UTC), or [] if the sun does not rise or set that day.
+    """
+    for date_str, events in calculate_solar_events_range(longitude, latitude, start_str, end_str):
+        yield date_str, format_events(events)
+
+
+def calculate_solar_events_range(longitude, latitude, start_str, end_str):
+    """
+    Generates the exact sunrise, solar zenith and sunset times for every date in a range.
+
+    Days of polar day or night are recognised up front and skipped. Each other day's
+    events are predicted from the previous day's events and their daily drift, then
+    refined with a few hour angle iterations on a single reused Sun. Whenever there
+    is nothing to predict from (the first day, or after a day with no sunrise or
+    sunset), or the refined event is not the one a per-day search would find, the
+    day falls back to the pyephem searches used by calculate_observer_events.
+
+    Yields:
+        tuple: (date_str, events) where events is [<sunrise>, <zenith>, <sunset>] as
+               ephem dates (float days), or [] if the sun does not rise or set that day.
+    """
+    observer = ephem.Observer()
+    observer.lon = str(longitude)
+    observer.lat = str(latitude)
+
+    search_observer = ephem.Observer()
+    search_observer.lon = observer.lon
+    search_observer.lat = observer.lat
+    search_observer.pressure = 0.0
+
+    sun = ephem.Sun()
+
+    previous = None  # (sunrise, transit, sunset) of the previous day
+    drift = (0.0, 0.0, 0.0)
+
+    for date_str in iter_dates(start_str, end_str):
+        target_day = ephem.Date(date_str)
+        next_day = ephem.Date(target_day + 1)
+
+        if classify_ephem_day(latitude, target_day) != NORMAL:
+            previous = None
+            yield date_str, []
+            continue
+
+        sunrise = transit = sunset = None
+        if previous is not None:
+            sunrise = _refine_event(search_observer, sun, previous[0] + 1 + drift[0], _RISING, observer.pressure)
+            if sunrise is not None and target_day <= sunrise < next_day:
+                sunset = _refine_event(search_observer, sun, previous[2] + 1 + drift[2], _SETTING, observer.pressure)
+                transit = _refine_event(search_observer, sun, previous[1] + 1 + drift[1], _TRANSIT, observer.pressure)
+                # The setting and transit must be the first ones after sunrise
+                if not (_follows(sunrise, sunset) and _follows(sunrise, transit)):
+                    sunrise = None
+            else:
+                sunrise = None
+
+        if sunrise is None:
+            # Nothing usable to predict from: search from midnight as a per-day call would
+            observer.date = date_str
+            try:
+                sunrise = observer.next_rising(sun)
+                observer.date = sunrise
+                sunset = observer.next_setting(sun)
+            except ephem.CircumpolarError:
+                previous = None
+                yield date_str, []
+                continue
+
+            if sunrise >= next_day:
+                previous = None
+                yield date_str, []
+                continue
+
+            observer.date = sunrise
+            transit = observer.next_transit(sun)
+
+        events = (float(sunrise), float(transit), float(sunset))
+        if previous is not None:
+            drift = tuple(event - prior - 1 for event, prior in zip(events, previous))
+        else:
+            drift = (0.0, 0.0, 0.0)
+        previous = events
+
+        if sunset >= next_day:
+            # Still a good seed for tomorrow, but not reported for today
+            yield date_str, []
+            continue
+
+        yield date_str, list(events)
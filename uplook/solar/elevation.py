@@ -1,5 +1,11 @@
+import math
+
 import ephem
 
+from .polar import NORMAL, classify_ephem_day
+from .profile import SolarProfile
+from .sampling import sample_elevations
+
 
 def calculate_solar_elevation(date_str, time_str, longitude, latitude):
     """
@@ -30,23 +36,74 @@ def calculate_solar_elevation(date_str, time_str, longitude, latitude):
         print(f"Error calculating elevation for {date_str} {time_str}: {e}")
         return None
 
-def calculate_daily_solar_profile(longitude, latitude, date_str):
-    """Generates an array of solar elevation angles for every hour (00:00 to 23:00 UTC)."""
+def calculate_daily_solar_profile(longitude, latitude, date_str, interval=60):
+    """
+    Generates an array of solar elevation angles every `interval` minutes through the
+    day, by default for every hour (00:00 to 23:00 UTC).
 
-    hourly_angles = []
+    Returns:
+        list: [{"hour", "time", "angle_deg"}, ...]; calculate_observer_profile returns
+              the same samples as a compact SolarProfile
+    """
+    try:
+        day = ephem.Date(date_str)
+    except Exception as e:
+        print(f"Error calculating elevation for {date_str}: {e}")
+        return []
 
-    for hour in range(24):
-        time_str = f"{hour:02d}:00"
-        angle = calculate_solar_elevation(date_str, time_str, longitude, latitude)
+    return calculate_observer_profile(create_observer(longitude, latitude), ephem.Sun(), day, interval).to_list()
 
-        if angle is not None:
-            hourly_angles.append({
-                "hour": hour,
-                "time": time_str,
-                "angle_deg": round(angle, 2)
-            })
+def create_observer(longitude, latitude):
+    """Creates an Observer for the location, with no date set."""
+    observer = ephem.Observer()
+    observer.lon = str(longitude)
+    observer.lat = str(latitude)
+    return observer
 
-    return hourly_angles
+def calculate_observer_profile(observer, sun, day, interval=60, digits=2):
+    """
+    Generates the same profile as calculate_daily_solar_profile, reusing one
+    Observer and Sun for every sample. The profile is returned as a SolarProfile.
+
+    Profiles with more samples than hours are interpolated by sample_elevations,
+    to within ERROR_BOUND_DEG of the exact elevations, rather than computing every
+    sample with pyephem.
+
+    Args:
+        observer (ephem.Observer): Observer for the location (its date is changed)
+        sun (ephem.Sun): Sun body to compute
+        day (ephem.Date): Midnight UTC at the start of the day
+        interval (int): Minutes between samples
+        digits (int): Decimal places the elevations are rounded to, or None to keep
+            them at full precision
+    """
+    minutes = list(range(0, 24 * 60, interval))
+
+    if len(minutes) > 24:
+        try:
+            angles = sample_elevations(observer, sun, day, minutes)
+        except Exception as e:
+            print(f"Error calculating elevation for {ephem.Date(day)}: {e}")
+            return SolarProfile()
+        if digits is not None:
+            angles = [round(angle, digits) for angle in angles]
+        return SolarProfile(minutes, angles)
+
+    profile = SolarProfile()
+
+    for minute in minutes:
+        try:
+            observer.date = ephem.Date(day + (minute // 60) * ephem.hour + (minute % 60) * ephem.minute)
+            sun.compute(observer)
+            angle = sun.alt * (180 / ephem.pi)
+        except Exception as e:
+            print(f"Error calculating elevation for {ephem.Date(day)} {minute // 60:02d}:{minute % 60:02d}: {e}")
+            continue
+
+        profile.minutes.append(minute)
+        profile.angles.append(angle if digits is None else round(angle, digits))
+
+    return profile
 
 def calculate_daily_solar_summary(longitude, latitude, date_str):
     """
@@ -57,13 +114,39 @@ def calculate_daily_solar_summary(longitude, latitude, date_str):
         list: [<time of sunrise>, <time of solar zenith>, <time of sunset>] in HH:MM format (UTC).
               Returns [] if the sun does not rise or set.
     """
-    # 1. Setup Observer
-    observer = ephem.Observer()
-    observer.lon = str(longitude)
-    observer.lat = str(latitude)
-    observer.date = date_str  # Use the start of the day for reference
+    return calculate_observer_summary(create_observer(longitude, latitude), ephem.Sun(), ephem.Date(date_str))
+
+def calculate_observer_summary(observer, sun, day):
+    """
+    Generates the same summary as calculate_daily_solar_summary for an existing
+    Observer and Sun.
+
+    Args:
+        observer (ephem.Observer): Observer for the location (its date is changed)
+        sun (ephem.Sun): Sun body to compute
+        day (ephem.Date): Midnight UTC at the start of the day
+    """
+    return format_events(calculate_observer_events(observer, sun, day))
+
+def calculate_observer_events(observer, sun, day):
+    """
+    Calculates the exact times of sunrise, solar zenith and sunset on the day.
+
+    Args:
+        observer (ephem.Observer): Observer for the location (its date is changed)
+        sun (ephem.Sun): Sun body to compute
+        day (ephem.Date): Midnight UTC at the start of the day
+
+    Returns:
+        list: [<sunrise>, <solar zenith>, <sunset>] as ephem dates (float days),
+              or [] if the sun does not rise or set.
+    """
+    # 0. Skip the searches when the sun stays up or down all day
+    if classify_ephem_day(math.degrees(observer.lat), day) != NORMAL:
+        return []
 
-    sun = ephem.Sun()
+    # 1. Setup Observer
+    observer.date = day  # Use the start of the day for reference
 
     # 2. Calculate Events (Sunrise, Sunset, and Transit/Zenith)
 
@@ -93,7 +176,7 @@ def calculate_daily_solar_summary(longitude, latitude, date_str):
     # 3. Check if all events fall on the input date
 
     # Reset observer to the start of the target day
-    target_day = ephem.Date(date_str)
+    target_day = ephem.Date(day)
     # The day after the target day
     next_day = ephem.Date(target_day + 1)
 
@@ -108,21 +191,17 @@ def calculate_daily_solar_summary(longitude, latitude, date_str):
     observer.date = sunrise_ephem_date  # Start search after sunrise
     transit_ephem_date = observer.next_transit(sun)
 
-    # 5. Format Output Times
+    return [float(sunrise_ephem_date), float(transit_ephem_date), float(sunset_ephem_date)]
 
-    # pyephem dates are epoch days; convert to Python datetime objects
-    # .datetime() converts to a UTC aware datetime
-    sunrise_dt = ephem.Date(sunrise_ephem_date).datetime()
-    transit_dt = ephem.Date(transit_ephem_date).datetime()
-    sunset_dt = ephem.Date(sunset_ephem_date).datetime()
+def format_events(events):
+    """
+    Formats the event times from calculate_observer_events as a summary.
 
-    # Format to HH:MM (UTC)
+    Returns:
+        list: [<time of sunrise>, <time of solar zenith>, <time of sunset>] in HH:MM
+              format (UTC), or [] if there are no events.
+    """
+    # pyephem dates are epoch days; convert to Python datetime objects
+    # .datetime() converts to a UTC aware datetime, formatted to HH:MM (UTC)
     time_format = "%H:%M"
-
-    summary = [
-        sunrise_dt.strftime(time_format),
-        transit_dt.strftime(time_format),
-        sunset_dt.strftime(time_format)
-    ]
-
-    return summary
+    return [ephem.Date(event).datetime().strftime(time_format) for event in events]
@@ -0,0 +1,85 @@
+from datetime import date
+
+import numpy as np
+
+from .profile import SolarProfile
+from .vectorized import solar_elevation_array
+from .worldmap import band_legend, shade_elevations
+
+_MONTH_INITIALS = "JFMAMJJASOND"
+
+
+def solar_elevation_year(longitude, latitude, year, interval=60):
+    """
+    Calculates solar elevations through a whole year at one site, in one call to
+    solar_elevation_array covering every sample of every day.
+
+    Args:
+        longitude (float): Longitude in decimal degrees
+        latitude (float): Latitude in decimal degrees
+        year (int): The year
+        interval (int): Minutes between samples within each day
+
+    Returns:
+        tuple: (dates, minutes, elevations): the dates as 'YYYY-MM-DD' strings, the
+               sample times in minutes after midnight UTC, and a (dates, samples)
+               array of elevations in degrees
+    """
+    start = np.datetime64(f"{year:04d}-01-01", 'D')
+    days = start + np.arange((date(year + 1, 1, 1) - date(year, 1, 1)).days)
+    minutes = np.arange(0, 24 * 60, interval)
+    timestamps = days.astype('datetime64[m]')[:, None] + minutes.astype('timedelta64[m]')
+    elevations = solar_elevation_array(timestamps, longitude, latitude)
+    return [str(day) for day in days], minutes.tolist(), elevations
+
+
+def get_solar_heatmap(longitude, latitude, year, interval=60, width=None):
+    """
+    Renders a date by time of day heatmap of solar elevation for a whole year.
+
+    Returns:
+        list: The lines of the heatmap
+    """
+    return list(iter_solar_heatmap(longitude, latitude, year, interval, width))
+
+
+def iter_solar_heatmap(longitude, latitude, year, interval=60, width=None):
+    """
+    Generates the lines of a heatmap of solar elevation through a year at one site:
+    one row per sample time of day (hourly by default) and one column per day, or
+    per run of days when `width` is smaller than the number of days, in which case
+    each column shows the middle day of its run. Cells are shaded by the same
+    elevation bands as the solar map.
+    """
+    dates, minutes, elevations = solar_elevation_year(longitude, latitude, year, interval)
+    if width is None or width >= len(dates):
+        columns = np.arange(len(dates))
+    else:
+        columns = ((np.arange(width) + 0.5) * len(dates) / width).astype(int)
+
+    # Shade the whole grid at once, with time of day down the side
+    cells = shade_elevations(elevations[columns].T)
+
+    # Mark the column where each month starts
+    months = [' '] * len(columns)
+    for month in range(12):
+        first = (date(year, month + 1, 1) - date(year, 1, 1)).days
+        column = int(np.searchsorted(columns, first))
+        if column < len(columns) and months[column] == ' ':
+            months[column] = _MONTH_INITIALS[month]
+
+    yield f"Solar elevation for {year} at latitude {latitude}, longitude {longitude}"
+    yield "      " + "".join(months)
+    for minute, line in zip(minutes, cells):
+        yield f"{minute // 60:02d}:{minute % 60:02d} " + "".join(line)
+    yield "      " + band_legend()
+
+
+def heatmap_profiles(longitude, latitude, year, interval=60):
+    """
+    Yields (date_str, SolarProfile) for every day of the year, for export with
+    profile_columns, from the same single batched computation as the heatmap.
+    """
+    dates, minutes, elevations = solar_elevation_year(longitude, latitude, year, interval)
+    for date_str, angles in zip(dates, elevations):
+        yield date_str, SolarProfile(minutes, angles.tolist())
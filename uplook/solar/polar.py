@@ -0,0 +1,54 @@
+from .analytic import EPHEM_EPOCH_JD, julian_date, horizon_altitude, sun_coordinates
+
+NORMAL = 'normal'
+POLAR_DAY = 'polar day'
+POLAR_NIGHT = 'polar night'
+
+# Allowance (degrees) for the difference between the analytic declination and
+# pyephem's, so that no day is labelled polar unless the search would find no events
+_MARGIN_DEG = 0.02
+
+
+def classify_day(latitude, jd):
+    """
+    Labels a day at a latitude as polar day (the Sun never sets), polar night (it
+    never rises) or normal, from the Sun's declination alone.
+
+    The Sun culminates at 90° - |latitude - declination| and is lowest at
+    |latitude + declination| - 90°, so comparing those with the horizon settles most
+    high latitude days without searching for events. Days within a small margin of
+    either limit are labelled normal, and left to the search.
+
+    Args:
+        latitude (float): Latitude in decimal degrees, north positive
+        jd (float): Julian date of midnight UTC at the start of the day
+
+    Returns:
+        str: NORMAL, POLAR_DAY or POLAR_NIGHT
+    """
+    # Declination is monotonic through a day, apart from near a solstice where it
+    # barely changes, so the ends of the day bound it
+    first, last = sun_coordinates(jd)[0], sun_coordinates(jd + 1)[0]
+    low, high = min(first, last), max(first, last)
+    horizon = horizon_altitude(jd + 0.5)
+
+    # How close the declination comes to the latitude (for the highest the Sun gets),
+    # and to minus the latitude (for the lowest)
+    nearest = 0.0 if low <= latitude <= high else min(abs(latitude - low), abs(latitude - high))
+    if 90 - nearest < horizon - _MARGIN_DEG:
+        return POLAR_NIGHT
+
+    lowest = 0.0 if low <= -latitude <= high else min(abs(latitude + low), abs(latitude + high))
+    if lowest - 90 > horizon + _MARGIN_DEG:
+        return POLAR_DAY
+    return NORMAL
+
+
+def classify_date(latitude, date_str):
+    """As classify_day, for a 'YYYY-MM-DD' or 'YYYY/MM/DD' date."""
+    return classify_day(latitude, julian_date(date_str))
+
+
+def classify_ephem_day(latitude, day):
+    """As classify_day, for an ephem date (midnight UTC at the start of the day)."""
+    return classify_day(latitude, float(day) + EPHEM_EPOCH_JD)
@@ -0,0 +1,78 @@
+from array import array
+from collections.abc import Sequence
+
+
+class SolarProfile(Sequence):
+    """
+    A solar elevation profile stored as two compact columns: the minute of the day of
+    each sample (unsigned 16-bit) and its elevation in degrees (double), about 10
+    bytes per sample instead of a few hundred for a dict.
+
+    It behaves like the list of {"hour", "time", "angle_deg"} dicts the profile
+    functions have always returned: iterating or indexing builds those dicts on
+    demand, and it compares equal to such a list. Bulk consumers can read the columns
+    directly, without building any dicts, through `minutes` and `angles` (arrays
+    supporting the buffer protocol, so e.g. numpy.frombuffer views them without a copy).
+
+    Args:
+        minutes: Minutes after midnight UTC of each sample
+        angles: Elevation in degrees of each sample, already rounded as reported
+    """
+
+    __slots__ = ("minutes", "angles")
+
+    def __init__(self, minutes=(), angles=()):
+        self.minutes = minutes if isinstance(minutes, array) and minutes.typecode == "H" else array("H", minutes)
+        self.angles = angles if isinstance(angles, array) and angles.typecode == "d" else array("d", angles)
+        if len(self.minutes) != len(self.angles):
+            raise ValueError("minutes and angles must be the same length")
+
+    @classmethod
+    def from_entries(cls, entries):
+        """
+        Builds a profile from a list of {"hour", "time", "angle_deg"} dicts, such as
+        one read back from JSON. A SolarProfile is returned unchanged.
+        """
+        if isinstance(entries, SolarProfile):
+            return entries
+        minutes = array("H")
+        angles = array("d")
+        for entry in entries:
+            hours, _, mins = entry["time"].partition(":")
+            minutes.append(int(hours) * 60 + int(mins or 0))
+            angles.append(entry["angle_deg"])
+        return cls(minutes, angles)
+
+    def __len__(self):
+        return len(self.minutes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SolarProfile(self.minutes[index], self.angles[index])
+        return _entry(self.minutes[index], self.angles[index])
+
+    def __iter__(self):
+        for minute, angle in zip(self.minutes, self.angles):
+            yield _entry(minute, angle)
+
+    def __eq__(self, other):
+        if isinstance(other, SolarProfile):
+            return self.minutes == other.minutes and self.angles == other.angles
+        if isinstance(other, list):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"SolarProfile({len(self)} samples)"
+
+    def to_list(self):
+        """Returns the profile as a JSON-serialisable list of dicts."""
+        return list(self)
+
+
+def _entry(minute, angle):
+    return {
+        "hour": minute // 60,
+        "time": f"{minute // 60:02d}:{minute % 60:02d}",
+        "angle_deg": angle
+    }
@@ -0,0 +1,76 @@
+import math
+from bisect import bisect_left
+
+# pyephem's default atmosphere
+PRESSURE_MBAR = 1010.0
+TEMPERATURE_C = 15.0
+
+# True altitudes covered by a refraction table; pyephem applies no refraction below it
+TABLE_LOW_DEG = -12.0
+TABLE_STEP_DEG = 0.05
+
+# Refraction tables, keyed by (pressure, temperature)
+_TABLES = {}
+
+
+def unrefract_deg(apparent, pressure=PRESSURE_MBAR, temperature=TEMPERATURE_C):
+    """
+    Converts an apparent altitude to a true altitude (degrees) with the same
+    piecewise formula as pyephem (libastro's unrefract), including its blend between
+    14.5° and 15.5°.
+    """
+    def low():
+        # Below 15 degrees
+        a = ((2e-5 * apparent + 1.96e-2) * apparent + 1.594e-1) * pressure
+        b = (273 + temperature) * ((8.45e-2 * apparent + 5.05e-1) * apparent + 1)
+        r = a / b
+        return apparent if apparent < 0 and r < 0 else apparent - r
+
+    def high():
+        # Above 15 degrees
+        r = 7.888888e-5 * pressure / ((273 + temperature) * math.tan(math.radians(apparent)))
+        return apparent - math.degrees(r)
+
+    if apparent < 14.5:
+        return low()
+    if apparent >= 15.5:
+        return high()
+    blend = apparent - 14.5
+    return low() + (high() - low()) * blend
+
+
+def refraction_table(pressure=PRESSURE_MBAR, temperature=TEMPERATURE_C):
+    """
+    Returns apparent altitudes (degrees) for evenly spaced true altitudes from
+    TABLE_LOW_DEG to 90°, every TABLE_STEP_DEG.
+
+    pyephem's model only converts apparent to true altitude, so that is tabulated
+    finely and then resampled, which is possible because the conversion is monotonic.
+    Linear interpolation in the table is within 0.0001° of inverting the model exactly
+    above -1°, and 0.003° below, where the model bends most sharply.
+    """
+    key = (pressure, temperature)
+    if key not in _TABLES:
+        apparent = [i / 100 for i in range(int(TABLE_LOW_DEG * 100) - 200, 9001)]
+        true = [unrefract_deg(a, pressure, temperature) for a in apparent]
+
+        table = []
+        for i in range(int((90 - TABLE_LOW_DEG) / TABLE_STEP_DEG) + 1):
+            target = TABLE_LOW_DEG + i * TABLE_STEP_DEG
+            j = min(max(bisect_left(true, target), 1), len(true) - 1)
+            fraction = (target - true[j - 1]) / (true[j] - true[j - 1])
+            table.append(apparent[j - 1] + fraction * (apparent[j] - apparent[j - 1]))
+        _TABLES[key] = table
+    return _TABLES[key]
+
+
+def refract_deg(true_deg, table):
+    """
+    Converts a true altitude to the apparent altitude (degrees) using a table from
+    refraction_table.
+    """
+    position = (true_deg - TABLE_LOW_DEG) / TABLE_STEP_DEG
+    if position < 0:
+        return true_deg
+    i = min(int(position), len(table) - 2)
+    return table[i] + (position - i) * (table[i + 1] - table[i])
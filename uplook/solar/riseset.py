@@ -0,0 +1,200 @@
+import math
+
+import numpy as np
+
+from .analytic import EPHEM_EPOCH_JD, julian_date, horizon_altitude, sun_coordinates, sidereal_time
+
+# Refinement stops once every step is shorter than this (about 0.01 seconds)
+_SETTLED_STEP = 1e-7
+_MAX_ITERATIONS = 60
+# Sites solved together, to bound the size of the bracketing arrays
+_CHUNK = 8192
+
+
+class _SunDay:
+    """
+    The Sun's motion through one day, shared by every site: the sine of its
+    declination and its Greenwich hour angle (degrees) as quadratics in the fraction
+    of the day, interpolated through the start, middle and end of the day, and the
+    altitude of its centre at rising and setting.
+    """
+
+    def __init__(self, date_str):
+        self.start = julian_date(date_str)
+        sines, hour_angles = [], []
+        for half in (0.0, 0.5, 1.0):
+            declination, right_ascension, equinoxes = sun_coordinates(self.start + half)
+            sines.append(math.sin(math.radians(declination)))
+            hour_angles.append(sidereal_time(self.start + half) + equinoxes - right_ascension)
+        h0 = hour_angles[0] % 360
+        h1 = h0 + (hour_angles[1] - hour_angles[0]) % 360
+        h2 = h1 + (hour_angles[2] - hour_angles[1]) % 360
+        self.sine = _quadratic(*sines)
+        self.hour_angle = _quadratic(h0, h1, h2)
+
+        self.sin_horizon = math.sin(math.radians(horizon_altitude(self.start + 0.5)))
+
+    def height(self, x, sin_lat, cos_lat, lon):
+        """
+        Returns sin(altitude) - sin(horizon) and its derivative per day at fractions x
+        of the day, broadcast over sites.
+        """
+        a, b, c = self.sine
+        s = a + x * (b + x * c)
+        ds = b + 2 * c * x
+        cos_dec = np.sqrt(1 - s * s)
+        a, b, c = self.hour_angle
+        hour_angle = np.radians(a + x * (b + x * c) + lon)
+        rate = np.radians(b + 2 * c * x)
+
+        cos_h = np.cos(hour_angle)
+        value = s * sin_lat + cos_dec * cos_lat * cos_h - self.sin_horizon
+        slope = (ds * sin_lat - s * ds / cos_dec * cos_lat * cos_h
+                 - cos_dec * cos_lat * np.sin(hour_angle) * rate)
+        return value, slope
+
+
+def _quadratic(y0, y1, y2):
+    """Returns (a, b, c) with a + b x + c x^2 through (0, y0), (0.5, y1) and (1, y2)."""
+    return y0, -3 * y0 + 4 * y1 - y2, 2 * y0 - 4 * y1 + 2 * y2
+
+
+def solar_events_array(longitudes, latitudes, date_str):
+    """
+    Calculates sunrise, solar zenith and sunset for many sites on one date at once,
+    with the same meaning as calculate_observer_events: the first rising of the day,
+    the next setting and transit after it, and no events unless both the rising and
+    setting fall on the day.
+
+    The Sun's position comes from the analytic formulae (see analytic.py) and is
+    shared by every site. Each site's day is split at its upper and lower transits
+    into spans where the altitude only rises or only falls, so the sign of the
+    altitude at their ends brackets every horizon crossing. The crossings of all sites
+    are then refined together by Newton's method, with bisection wherever a Newton
+    step would leave its bracket. Sites where the Sun stays up or down all day, or
+    only crosses the horizon once, simply have no events, so polar days and nights
+    need no special handling.
+
+    Times agree with calculate_observer_events to a few seconds, except where the Sun
+    only grazes the horizon and the exact time is very sensitive to its altitude.
+
+    Args:
+        longitudes: Longitudes in decimal degrees, east positive (array-like)
+        latitudes: Latitudes in decimal degrees, north positive (array-like)
+        date_str (str): The date, 'YYYY-MM-DD' or 'YYYY/MM/DD'
+
+    Returns:
+        tuple: (sunrise, zenith, sunset) float arrays of ephem dates (days), NaN for
+               sites without events.
+    """
+    lon, lat = np.broadcast_arrays(np.asarray(longitudes, dtype=float), np.asarray(latitudes, dtype=float))
+    lon, lat = lon.ravel(), lat.ravel()
+    sun = _SunDay(date_str)
+
+    events = np.full((3, len(lon)), np.nan)
+    for first in range(0, len(lon), _CHUNK):
+        chunk = slice(first, first + _CHUNK)
+        events[:, chunk] = _solve_chunk(sun, lon[chunk], lat[chunk])
+
+    offset = sun.start - EPHEM_EPOCH_JD
+    sunrise, zenith, sunset = events + offset
+    return sunrise, zenith, sunset
+
+
+def _solve_chunk(sun, lon, lat):
+    sin_lat, cos_lat = np.sin(np.radians(lat)), np.cos(np.radians(lat))
+
+    # The altitude only turns around at the upper and lower transits, so between the
+    # start of the day, the transits and the end of the day it is monotonic, and each
+    # of those spans contains at most one crossing
+    bounds = np.concatenate([np.zeros((len(lon), 1)), _half_turns(sun, lon), np.ones((len(lon), 1))], axis=1)
+    above = sun.height(bounds, sin_lat[:, None], cos_lat[:, None], lon[:, None])[0] >= 0
+
+    # First rising of the day, and the first setting after it
+    spans = np.arange(bounds.shape[1] - 1)
+    rising = ~above[:, :-1] & above[:, 1:]
+    setting = above[:, :-1] & ~above[:, 1:]
+    rise_at = np.where(rising.any(axis=1), rising.argmax(axis=1), spans[-1] + 1)
+    setting &= spans > rise_at[:, None]
+    found = setting.any(axis=1)
+    set_at = setting.argmax(axis=1)
+
+    events = np.full((3, len(lon)), np.nan)
+    if not found.any():
+        return events
+
+    sites = np.flatnonzero(found)
+    bounds, rise_at, set_at = bounds[sites], rise_at[sites], set_at[sites]
+    sin_lat, cos_lat, lon = sin_lat[sites], cos_lat[sites], lon[sites]
+    rows = np.arange(len(sites))
+    sunrise = _refine(sun, bounds[rows, rise_at], bounds[rows, rise_at + 1], sin_lat, cos_lat, lon, 1.0)
+    sunset = _refine(sun, bounds[rows, set_at], bounds[rows, set_at + 1], sin_lat, cos_lat, lon, -1.0)
+
+    events[0, sites] = sunrise
+    events[1, sites] = _transit(sun, sunrise, lon)
+    events[2, sites] = sunset
+    return events
+
+
+def _half_turns(sun, lon):
+    """
+    Returns the times during the day at which each site's local hour angle is a
+    multiple of 180° (the upper and lower transits), as a (sites, 3) array in
+    increasing order, padded with 1 (the end of the day).
+    """
+    a, b, c = sun.hour_angle
+    first = np.floor((a + lon) / 180) + 1
+    targets = (first[:, None] + np.arange(3)) * 180 - lon[:, None]
+    x = (targets - a) / b
+    for _ in range(2):
+        x = x - (a + x * (b + x * c) - targets) / (b + 2 * c * x)
+    return np.where(x < 1, x, 1.0)
+
+
+def _refine(sun, low, high, sin_lat, cos_lat, lon, direction):
+    """
+    Finds the horizon crossing in [low, high] for each site, where the altitude rises
+    (direction 1) or falls (direction -1), by Newton's method, bisecting wherever a
+    Newton step would leave the bracket.
+    """
+    x = (low + high) / 2
+    # Sites stop moving once settled, so each result is independent of the others
+    active = np.ones(len(x), dtype=bool)
+    for _ in range(_MAX_ITERATIONS):
+        value, slope = sun.height(x, sin_lat, cos_lat, lon)
+        value, slope = value * direction, slope * direction
+        # The bracket always has the Sun below the horizon at low and above at high
+        below = value < 0
+        low = np.where(below, x, low)
+        high = np.where(below, high, x)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = x - value / slope
+        inside = (newton > low) & (newton < high)
+        step = np.where(active, np.where(inside, newton, (low + high) / 2) - x, 0.0)
+        x = x + step
+        active &= np.abs(step) >= _SETTLED_STEP
+        if not active.any():
+            break
+    return x
+
+
+def _transit(sun, after, lon):
+    """Finds the first time after each sunrise at which the Sun's local hour angle is 0."""
+    a, b, c = sun.hour_angle
+    # The next whole turn of the local hour angle after sunrise
+    turn = np.ceil((a + after * (b + after * c) + lon) / 360) * 360 - lon
+    x = after
+    for _ in range(3):
+        x = x - (a + x * (b + x * c) - turn) / (b + 2 * c * x)
+    return x
+
+
+def events_list(sunrise, zenith, sunset, index):
+    """
+    Returns one site's events from solar_events_array in the form returned by
+    calculate_observer_events: [sunrise, zenith, sunset] as floats, or [].
+    """
+    if math.isnan(sunrise[index]):
+        return []
+    return [float(sunrise[index]), float(zenith[index]), float(sunset[index])]
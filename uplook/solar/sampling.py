@@ -0,0 +1,169 @@
+import math
+
+import ephem
+
+from .refraction import refraction_table, refract_deg
+
+# Largest difference (degrees) allowed between an interpolated elevation and the
+# exact pyephem value, half the 0.01° the profiles are rounded to. Checked in the tests.
+ERROR_BOUND_DEG = 0.005
+
+# Degree of the Chebyshev polynomial fitted to each segment of the day
+_DEGREE = 8
+# The day is first split into this many segments, which are halved wherever a fit
+# misses the error bound
+_SEGMENTS = 4
+# Segments with this many samples or fewer are computed exactly, as a fit would cost
+# about as many pyephem calls
+_EXACT_SAMPLES = _DEGREE + 4
+
+
+def exact_elevation(observer, sun, day, minute):
+    """
+    Returns the solar elevation (degrees) a number of minutes after the start of day.
+
+    Args:
+        observer (ephem.Observer): Observer for the location (its date is changed)
+        sun (ephem.Sun): Sun body to compute
+        day (ephem.Date): Midnight UTC at the start of the day
+        minute (float): Minutes after midnight
+    """
+    observer.date = day + minute * ephem.minute
+    sun.compute(observer)
+    return math.degrees(sun.alt)
+
+
+def _chebyshev_fit(function, start, end, degree):
+    """
+    Returns the coefficients of the Chebyshev interpolant of function on [start, end],
+    fitted at degree + 1 Chebyshev nodes.
+    """
+    count = degree + 1
+    middle = (start + end) / 2
+    half = (end - start) / 2
+    angles = [math.pi * (k + 0.5) / count for k in range(count)]
+    values = [function(middle + half * math.cos(angle)) for angle in angles]
+
+    coefficients = []
+    for j in range(count):
+        total = sum(value * math.cos(j * angle) for value, angle in zip(values, angles))
+        coefficients.append(total * (2 if j else 1) / count)
+    return coefficients
+
+
+def _chebyshev_eval(coefficients, start, end, t):
+    """Evaluates a Chebyshev series on [start, end] at t with Clenshaw's recurrence."""
+    x = (2 * t - start - end) / (end - start)
+    x2 = 2 * x
+    b1 = b2 = 0.0
+    for c in reversed(coefficients[1:]):
+        b1, b2 = c + x2 * b1 - b2, b1
+    return coefficients[0] + x * b1 - b2
+
+
+def _chebyshev_to_power(coefficients):
+    """
+    Converts a Chebyshev series into ordinary polynomial coefficients (lowest power
+    first), which are quicker to evaluate at many points.
+    """
+    power = [0.0] * len(coefficients)
+    previous, current = [1.0], [0.0, 1.0]  # T0 and T1
+    for j, c in enumerate(coefficients):
+        if j == 0:
+            term = previous
+        elif j == 1:
+            term = current
+        else:
+            # T(j) = 2x T(j-1) - T(j-2)
+            term = [0.0] + [2 * a for a in current]
+            for i, a in enumerate(previous):
+                term[i] -= a
+            previous, current = current, term
+        for i, a in enumerate(term):
+            power[i] += c * a
+    return power
+
+
+def sample_elevations(observer, sun, day, minutes, tolerance=ERROR_BOUND_DEG):
+    """
+    Calculates solar elevations at many times of one day with far fewer pyephem calls
+    than samples.
+
+    Refraction bends the elevation sharply near the horizon, so the smooth part, the
+    sine of the unrefracted altitude, is interpolated and pyephem's refraction is
+    applied afterwards from a table. The day is split into segments, and each is
+    fitted with a Chebyshev polynomial through a few exact pyephem positions. Each fit
+    is checked against exact positions between its nodes, and segments whose fit
+    misses the tolerance are halved and fitted again, down to segments so short that
+    their samples are simply computed exactly.
+
+    Args:
+        observer (ephem.Observer): Observer for the location (its date is changed)
+        sun (ephem.Sun): Sun body to compute
+        day (ephem.Date): Midnight UTC at the start of the day
+        minutes (list): Sorted sample times, in minutes after midnight (0 <= m < 1440)
+        tolerance (float): Largest error allowed, in degrees
+
+    Returns:
+        list: The elevation in degrees at each sample time
+    """
+    table = refraction_table(observer.pressure, observer.temp)
+
+    unrefracted = observer.copy()
+    unrefracted.pressure = 0
+
+    def sin_true(minute):
+        unrefracted.date = day + minute * ephem.minute
+        sun.compute(unrefracted)
+        return math.sin(sun.alt)
+
+    def fitted(coefficients, start, end, samples):
+        power = _chebyshev_to_power(coefficients)[::-1]
+        scale = 2 / (end - start)
+        offset = (start + end) / 2
+        results = []
+        for minute in samples:
+            x = (minute - offset) * scale
+            s = 0.0
+            for c in power:
+                s = s * x + c
+            true_deg = math.degrees(math.asin(-1.0 if s < -1.0 else 1.0 if s > 1.0 else s))
+            results.append(refract_deg(true_deg, table))
+        return results
+
+    # A sine error of e moves the altitude by at most about e / cos(altitude), so
+    # fits are held well inside the tolerance
+    sine_tolerance = math.radians(tolerance) / 4
+
+    elevations = []
+    width = 1440 / _SEGMENTS
+    stack = [(1440 - width * (i + 1), 1440 - width * i) for i in range(_SEGMENTS)]
+    index = 0
+
+    # Depth first, earliest segment on top, so the samples come out in order
+    while stack:
+        start, end = stack.pop()
+        first = index
+        while index < len(minutes) and (minutes[index] < end or end == 1440):
+            index += 1
+        samples = minutes[first:index]
+
+        if len(samples) <= _EXACT_SAMPLES:
+            elevations.extend(exact_elevation(observer, sun, day, minute) for minute in samples)
+            continue
+
+        coefficients = _chebyshev_fit(sin_true, start, end, _DEGREE)
+        # Check the fit between the outer nodes and the ends, where it is least
+        # constrained, and off-centre in the middle
+        span = end - start
+        checks = (start + span * 0.005, start + span * 0.53, end - span * 0.005)
+        if abs(coefficients[-1]) <= sine_tolerance and all(
+            abs(_chebyshev_eval(coefficients, start, end, t) - sin_true(t)) <= sine_tolerance for t in checks
+        ):
+            elevations.extend(fitted(coefficients, start, end, samples))
+        else:
+            index = first
+            middle = (start + end) / 2
+            stack += [(middle, end), (start, middle)]
+
+    return elevations
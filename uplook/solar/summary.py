@@ -1,8 +1,50 @@
-def get_solar_summary(daily_summary, lon, lat, date_str):
+from .context import SolarDay
+from .polar import NORMAL, POLAR_DAY, POLAR_NIGHT
+
+
+# How a day without a sunrise or sunset is described, by its state
+_NO_EVENTS = {
+    NORMAL: "No sunrise or sunset to report today!",
+    POLAR_DAY: "Polar day: the sun does not set today",
+    POLAR_NIGHT: "Polar night: the sun does not rise today",
+}
+
+
+def get_solar_summary(daily_summary, lon=None, lat=None, date_str=None, state=NORMAL):
+    """
+    Renders the sunrise, zenith and sunset times as a brief summary.
+
+    daily_summary may be a SolarDay, in which case its summary is computed here and
+    its location, date and state are used. Days without events are described by their
+    state (normal, polar day or polar night).
+    """
+    if isinstance(daily_summary, SolarDay):
+        solar_day = daily_summary
+        lon, lat, date_str = solar_day.longitude, solar_day.latitude, solar_day.date_str
+        daily_summary = solar_day.summary
+        if not daily_summary:
+            state = solar_day.state
     lines = []
     lines.append(f"Solar profile for {date_str} at latitude {lat}, longitude {lon}")
     if (len(daily_summary) == 0):
-        lines.append("No sunrise or sunset to report today!")
+        lines.append(_NO_EVENTS[state])
     else:
         lines.append(f"Sunrise: {daily_summary[0]}, Zenith: {daily_summary[1]}, Sunset: {daily_summary[2]}")
     return lines
+
+def get_solar_summary_range_header(lon, lat, start_str, end_str):
+    lines = []
+    lines.append(f"Solar profile from {start_str} to {end_str} at latitude {lat}, longitude {lon}")
+    lines.append("{:<10} {:>7} {:>7} {:>7}".format("Date", "Sunrise", "Zenith", "Sunset"))
+    lines.append("-" * 34)
+    return lines
+
+def get_solar_summary_range_row(date_str, daily_summary, state=NORMAL):
+    if (len(daily_summary) == 0):
+        if state != NORMAL:
+            return ["{:<10} {:>23}".format(date_str, state)]
+        return ["{:<10} {:>7} {:>7} {:>7}".format(date_str, "--", "--", "--")]
+    return ["{:<10} {:>7} {:>7} {:>7}".format(date_str, *daily_summary)]
+
+def get_solar_summary_range_footer():
+    return ["-" * 34]
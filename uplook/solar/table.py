@@ -1,16 +1,28 @@
+from .context import SolarDay
+
+
 def get_solar_table(daily_profile):
     """
     Renders the solar elevation profile as a simple ASCII table.
+
+    daily_profile may be a SolarDay, in which case its profile is computed here.
     """
+    return list(iter_solar_table(daily_profile))
 
-    lines = []
+
+def iter_solar_table(daily_profile):
+    """
+    Generates the same lines as get_solar_table one at a time, so that long
+    (e.g. per-minute) profiles are written out without building the whole table.
+    """
+    if isinstance(daily_profile, SolarDay):
+        daily_profile = daily_profile.profile
 
     # Print the table header
-    lines.append("{:<10} {:>10}".format("Time (UTC)", "Angle (Deg)"))
-    lines.append("-" * 21)
+    yield "{:<10} {:>10}".format("Time (UTC)", "Angle (Deg)")
+    yield "-" * 21
 
     # Print the data rows
     for entry in daily_profile:
-        lines.append("{:<10} {:>10.2f}".format(entry["time"], entry["angle_deg"]))
-    lines.append("-" * 21)
-    return lines
+        yield "{:<10} {:>10.2f}".format(entry["time"], entry["angle_deg"])
+    yield "-" * 21
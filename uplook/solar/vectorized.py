@@ -0,0 +1,134 @@
+from datetime import datetime
+
+import numpy as np
+
+from .profile import SolarProfile
+
+# Largest difference (degrees) between solar_elevation_array and the pyephem path
+# (calculate_solar_elevation) for dates from 1900 to 2100 at any latitude, with the
+# Sun above -1°. Below that, pyephem's refraction model stretches differences in the
+# true altitude, to within BELOW_HORIZON_TOLERANCE_DEG. Checked in the tests; see
+# bench/bench_engines.py for the full comparison.
+ELEVATION_TOLERANCE_DEG = 0.02
+BELOW_HORIZON_TOLERANCE_DEG = 0.04
+
+# pyephem's default atmosphere, used for its refraction correction
+_PRESSURE_MBAR = 1010.0
+_TEMPERATURE_C = 15.0
+
+_UNIX_EPOCH_JD = 2440587.5
+_J2000_JD = 2451545.0
+
+
+def _to_julian_date(timestamps):
+    """Converts anything numpy can read as datetime64 (UTC) into Julian dates."""
+    seconds = np.asarray(timestamps, dtype='datetime64[s]').astype(np.int64)
+    return seconds / 86400.0 + _UNIX_EPOCH_JD
+
+
+def _unrefract_deg(apparent):
+    """
+    Converts apparent altitudes to true altitudes using the same piecewise formula
+    as pyephem (libastro's unrefract), including its blend between 14.5° and 15.5°.
+    """
+    apparent = np.asarray(apparent, dtype=float)
+
+    # Below 15 degrees
+    a = ((2e-5 * apparent + 1.96e-2) * apparent + 1.594e-1) * _PRESSURE_MBAR
+    b = (273 + _TEMPERATURE_C) * ((8.45e-2 * apparent + 5.05e-1) * apparent + 1)
+    r_low = a / b
+    true_low = np.where((apparent < 0) & (r_low < 0), apparent, apparent - r_low)
+
+    # Above 15 degrees (guard the tangent so the low branch never sees a divide by zero)
+    tan_alt = np.tan(np.radians(np.maximum(apparent, 1.0)))
+    r_high = np.degrees(7.888888e-5 * _PRESSURE_MBAR / ((273 + _TEMPERATURE_C) * tan_alt))
+    true_high = apparent - r_high
+
+    blend = np.clip(apparent - 14.5, 0.0, 1.0)
+    return true_low + (true_high - true_low) * blend
+
+
+def _refract_deg(true_alt, iterations=6):
+    """
+    Converts true altitudes to apparent altitudes by inverting _unrefract_deg with
+    the secant method, as pyephem does, but over the whole array at once.
+    """
+    true_alt = np.asarray(true_alt, dtype=float)
+
+    a0 = true_alt
+    f0 = _unrefract_deg(a0) - true_alt
+    a1 = true_alt + 0.8 * (true_alt - _unrefract_deg(true_alt))
+    for _ in range(iterations):
+        f1 = _unrefract_deg(a1) - true_alt
+        slope = f1 - f0
+        step = np.divide(f1 * (a1 - a0), slope, out=np.zeros_like(f1), where=slope != 0)
+        a0, f0 = a1, f1
+        a1 = a1 - step
+    return a1
+
+
+def solar_elevation_array(timestamps, longitude, latitude):
+    """
+    Calculates solar angles of elevation for arrays of UTC timestamps and locations
+    in a single vectorized pass.
+
+    The solar position uses the low precision formulae from the Astronomical Almanac,
+    followed by pyephem's refraction model, so results agree with
+    calculate_solar_elevation to within ELEVATION_TOLERANCE_DEG (or
+    BELOW_HORIZON_TOLERANCE_DEG with the Sun below -1°) from 1900 to 2100.
+
+    Args:
+        timestamps: UTC timestamps (datetime64, datetime or ISO strings), scalar or array.
+        longitude: Longitude(s) in decimal degrees, east positive.
+        latitude: Latitude(s) in decimal degrees, north positive.
+
+    Returns:
+        numpy.ndarray: Elevations in degrees, broadcast over all three inputs.
+    """
+    jd = _to_julian_date(timestamps)
+    lon = np.asarray(longitude, dtype=float)
+    lat = np.radians(np.asarray(latitude, dtype=float))
+
+    # 1. Ecliptic coordinates of the Sun
+    n = jd - _J2000_JD
+    mean_longitude = np.mod(280.460 + 0.9856474 * n, 360.0)
+    mean_anomaly = np.radians(np.mod(357.528 + 0.9856003 * n, 360.0))
+    ecliptic_longitude = np.radians(
+        mean_longitude + 1.915 * np.sin(mean_anomaly) + 0.020 * np.sin(2 * mean_anomaly)
+    )
+    obliquity = np.radians(23.439 - 0.0000004 * n)
+
+    # 2. Equatorial coordinates
+    right_ascension = np.degrees(np.arctan2(
+        np.cos(obliquity) * np.sin(ecliptic_longitude), np.cos(ecliptic_longitude)
+    ))
+    declination = np.arcsin(np.sin(obliquity) * np.sin(ecliptic_longitude))
+
+    # 3. Local hour angle from Greenwich mean sidereal time
+    sidereal_time = 280.46061837 + 360.98564736629 * n
+    hour_angle = np.radians(sidereal_time + lon - right_ascension)
+
+    # 4. Horizontal coordinates
+    sin_elevation = (np.sin(declination) * np.sin(lat)
+                     + np.cos(declination) * np.cos(lat) * np.cos(hour_angle))
+    true_elevation = np.degrees(np.arcsin(np.clip(sin_elevation, -1.0, 1.0)))
+
+    return _refract_deg(true_elevation)
+
+
+def calculate_daily_solar_profile_vectorized(longitude, latitude, date_str, interval=60, digits=2):
+    """
+    Generates the same profile as calculate_daily_solar_profile, but computes every
+    sample in one call to solar_elevation_array. The profile is returned as a
+    SolarProfile, with elevations rounded to `digits` places (None for full precision).
+    """
+    day = datetime.strptime(date_str.replace('/', '-'), "%Y-%m-%d")
+    start = np.datetime64(day.strftime("%Y-%m-%d"), 's')
+    minutes = np.arange(0, 24 * 60, interval)
+    timestamps = start + minutes * np.timedelta64(60, 's')
+
+    angles = solar_elevation_array(timestamps, longitude, latitude)
+
+    if digits is None:
+        return SolarProfile(minutes.tolist(), angles.tolist())
+    return SolarProfile(minutes.tolist(), [round(float(angle), digits) for angle in angles])
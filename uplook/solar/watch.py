@@ -0,0 +1,82 @@
+import sys
+import time
+from datetime import datetime, UTC
+
+from .chart import SolarChart
+from .summary import get_solar_summary
+
+# ANSI escape sequences
+_CLEAR = "\x1b[H\x1b[2J"
+_HIDE_CURSOR = "\x1b[?25l"
+_SHOW_CURSOR = "\x1b[?25h"
+
+
+def _move(line, offset):
+    """Moves the cursor to a 0-based line and offset from the top left of the screen."""
+    return f"\x1b[{line + 1};{offset + 1}H"
+
+
+def _now():
+    return datetime.now(UTC)
+
+
+def watch_solar_chart(make_day, chart_rows, data_char, current_char, width=None, stream=None, clock=_now,
+                      sleep=time.sleep, ticks=None):
+    """
+    Keeps a solar chart on a terminal up to date, for display on a wall monitor.
+
+    The summary and chart for the current UTC date are computed and drawn once.
+    Then, at the start of every minute, if the current time has moved into another
+    column, only the two cells that changed are redrawn, with ANSI cursor movement:
+    the old mark goes back to data_char and the new one becomes current_char. The
+    profile is only computed again when the date rolls over, so a refresh costs a
+    clock reading and a bisection.
+
+    Args:
+        make_day: Function of a 'YYYY-MM-DD' date returning the SolarDay to chart
+        chart_rows, data_char, current_char, width: As for get_solar_chart
+        stream: Terminal to draw on (defaults to stdout)
+        clock: Function returning the current time as a UTC datetime
+        sleep: Function sleeping for a number of seconds
+        ticks (int): Number of refreshes before returning (defaults to running
+            until interrupted)
+    """
+    stream = stream or sys.stdout
+    shown_date = chart = current = None
+    header, bottom = [], 0
+    stream.write(_HIDE_CURSOR)
+    try:
+        tick = 0
+        while ticks is None or tick < ticks:
+            now = clock()
+            date_str = now.date().isoformat()
+            minute = now.hour * 60 + now.minute
+            if date_str != shown_date:
+                solar_day = make_day(date_str)
+                header = get_solar_summary(solar_day)
+                chart = SolarChart(solar_day, chart_rows, data_char, current_char, width)
+                current = chart.column_at(minute)
+                lines = [*header, *chart.lines(current)]
+                stream.write(_CLEAR + "\n".join(lines) + "\n")
+                shown_date, bottom = date_str, len(lines)
+            else:
+                column = chart.column_at(minute)
+                if column != current:
+                    updates = []
+                    for changed, char in ((current, data_char), (column, current_char)):
+                        cell = chart.cell(changed)
+                        if cell is not None:
+                            line, offset = cell
+                            updates.append(_move(len(header) + line, offset) + char)
+                    if updates:
+                        # Leave the cursor below the chart, as after a full redraw
+                        stream.write("".join(updates) + _move(bottom, 0))
+                    current = column
+            stream.flush()
+            tick += 1
+            if ticks is None or tick < ticks:
+                # Wake at the start of the next minute
+                sleep(60 - now.second - now.microsecond / 1e6)
+    finally:
+        stream.write(_SHOW_CURSOR)
+        stream.flush()
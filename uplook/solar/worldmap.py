@@ -0,0 +1,129 @@
+import numpy as np
+
+from .analytic import julian_date, sun_coordinates, sidereal_time
+from .refraction import TABLE_LOW_DEG, TABLE_STEP_DEG, refraction_table
+
+# Map characters by elevation, from the highest band down: each applies at or above
+# its lower limit (degrees), and cells below every limit (night) are blank
+MAP_BANDS = [
+    (30.0, '#'),
+    (10.0, '+'),
+    (0.0, '-'),
+    (-6.0, ':'),     # Civil twilight
+    (-18.0, '.'),    # Nautical and astronomical twilight
+]
+
+# Horizontal parallax of the Sun, in degrees
+_PARALLAX_DEG = 0.00244
+
+
+def solar_elevation_grid(date_str, time_str, lon_step, lat_step=None):
+    """
+    Calculates the solar elevation at the centre of every cell of a whole-world
+    longitude/latitude grid at one instant, in one vectorized pass.
+
+    The Sun's position is the same for every cell, so it is calculated once with the
+    analytic formulae (see analytic.py); only the hour angle and altitude are
+    computed per cell, followed by pyephem's refraction from a table. Elevations
+    agree with calculate_solar_elevation as closely as the 'noaa' engine does.
+
+    Args:
+        date_str (str): The date, 'YYYY-MM-DD' or 'YYYY/MM/DD'
+        time_str (str): UTC time, 'HH:MM'
+        lon_step (float): Width of each cell in degrees of longitude
+        lat_step (float): Height of each cell in degrees of latitude (defaults to lon_step)
+
+    Returns:
+        tuple: (longitudes, latitudes, elevations): the cell centres from west to east
+               and from north to south, and a (latitudes, longitudes) array of
+               elevations in degrees
+    """
+    lat_step = lon_step if lat_step is None else lat_step
+    hours, minutes = (int(part) for part in time_str.split(':'))
+    jd = julian_date(date_str) + (hours * 60 + minutes) / 1440
+
+    longitudes = np.arange(-180 + lon_step / 2, 180, lon_step)
+    latitudes = np.arange(90 - lat_step / 2, -90, -lat_step)
+
+    declination, right_ascension, equinoxes = sun_coordinates(jd)
+    dec = np.radians(declination)
+    hour_angle = np.radians(sidereal_time(jd) + equinoxes - right_ascension + longitudes)
+    lat = np.radians(latitudes)[:, None]
+
+    sin_alt = np.sin(dec) * np.sin(lat) + np.cos(dec) * np.cos(lat) * np.cos(hour_angle)
+    altitude = np.arcsin(np.clip(sin_alt, -1.0, 1.0))
+    true_elevation = np.degrees(altitude) - _PARALLAX_DEG * np.cos(altitude)
+    return longitudes, latitudes, _refract(true_elevation)
+
+
+def _refract(true_elevation):
+    """Applies pyephem's refraction to an array of true altitudes, as refract_deg does."""
+    table = np.asarray(refraction_table())
+    steps = TABLE_LOW_DEG + TABLE_STEP_DEG * np.arange(len(table))
+    return np.where(true_elevation < TABLE_LOW_DEG, true_elevation, np.interp(true_elevation, steps, table))
+
+
+def subsolar_point(date_str, time_str):
+    """Returns the (longitude, latitude) where the Sun is overhead at an instant."""
+    hours, minutes = (int(part) for part in time_str.split(':'))
+    jd = julian_date(date_str) + (hours * 60 + minutes) / 1440
+    declination, right_ascension, equinoxes = sun_coordinates(jd)
+    longitude = (right_ascension - sidereal_time(jd) - equinoxes + 180) % 360 - 180
+    return longitude, declination
+
+
+def get_solar_map(date_str, time_str, resolution, current_char='O'):
+    """
+    Renders a world map of where the sun is up, and how high, at one instant.
+
+    Returns:
+        list: The lines of the map
+    """
+    return list(iter_solar_map(date_str, time_str, resolution, current_char))
+
+
+def iter_solar_map(date_str, time_str, resolution, current_char='O'):
+    """
+    Generates the lines of a world map of solar elevation at one instant, one column
+    per `resolution` degrees of longitude and one row per twice that of latitude
+    (terminal characters are about twice as tall as they are wide). Each cell is
+    shaded by the band of MAP_BANDS its elevation falls in, and the cell with the
+    Sun overhead is marked with current_char.
+    """
+    longitudes, latitudes, elevations = solar_elevation_grid(date_str, time_str, resolution, 2 * resolution)
+
+    cells = shade_elevations(elevations)
+
+    sun_lon, sun_lat = subsolar_point(date_str, time_str)
+    row = min(int((90 - sun_lat) / (2 * resolution)), len(latitudes) - 1)
+    column = min(int((sun_lon + 180) / resolution), len(longitudes) - 1)
+    cells[row, column] = current_char
+
+    width = len(longitudes)
+    yield f"Solar elevation map for {date_str} {time_str} UTC"
+    yield "    +" + "-" * width + "+"
+    # Label the rows that start at the equator and every 30° of latitude
+    labelled = {}
+    for latitude in range(60, -90, -30):
+        labelled.setdefault(min(int((90 - latitude) / (2 * resolution)), len(latitudes) - 1), latitude)
+    for index, line in enumerate(cells):
+        latitude = labelled.get(index)
+        label = "" if latitude is None else f"{abs(latitude)}°{'N' if latitude > 0 else 'S' if latitude < 0 else ''}"
+        yield f"{label:>4}|" + "".join(line) + "|"
+    yield "    +" + "-" * width + "+"
+    yield "    " + band_legend() + f"  {current_char} overhead"
+
+
+def shade_elevations(elevations):
+    """
+    Returns an array of the MAP_BANDS character for each elevation (degrees) in an
+    array, all in one pass.
+    """
+    limits = np.array([limit for limit, _ in reversed(MAP_BANDS)])
+    shades = np.array([' '] + [char for _, char in reversed(MAP_BANDS)])
+    return shades[np.searchsorted(limits, elevations, side='right')]
+
+
+def band_legend():
+    """Returns a one-line key to the MAP_BANDS characters."""
+    return "  ".join(f"{char} {limit:g}°+" for limit, char in MAP_BANDS)
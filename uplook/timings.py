@@ -0,0 +1,239 @@
+import inspect
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import ephem
+
+# pyephem Observer methods counted as calls (each is an iterative search)
+_OBSERVER_SEARCHES = (
+    'next_rising', 'previous_rising', 'next_setting', 'previous_setting',
+    'next_transit', 'previous_transit', 'next_antitransit', 'previous_antitransit',
+)
+# pyephem module functions counted as calls
+_EPHEM_FUNCTIONS = ('previous_new_moon', 'next_new_moon')
+
+# The Timings being recorded by record(), if any
+_current = None
+
+
+class Timings:
+    """
+    Wall and CPU time spent in named stages, and the number of pyephem calls made.
+
+    Stage times are exclusive: time spent in a stage entered from inside another one
+    is charged to the inner stage only, so the stages never count anything twice.
+
+    Work done in processes forked while recording (e.g. a batch's process pool) is
+    included: each child writes its own figures to a spool directory, and report()
+    adds them in.
+    """
+
+    def __init__(self, spool=None):
+        self.started = (time.perf_counter(), time.process_time())
+        self.stages = {}
+        self.ephem_calls = {}
+        self._stack = []
+        self._parent_pid = self._pid = os.getpid()
+        self._spool = spool
+
+    def _own(self):
+        # In a forked child, start again from nothing, as the parent reports its own
+        pid = os.getpid()
+        if pid != self._pid:
+            self.stages, self.ephem_calls, self._stack, self._pid = {}, {}, [], pid
+
+    def add(self, name, wall, cpu, calls=1):
+        """Adds time measured elsewhere to a stage."""
+        totals = self.stages.setdefault(name, [0.0, 0.0, 0])
+        totals[0] += wall
+        totals[1] += cpu
+        totals[2] += calls
+
+    def count(self, name, calls=1):
+        """Counts a pyephem call."""
+        self._own()
+        self.ephem_calls[name] = self.ephem_calls.get(name, 0) + calls
+
+    @contextmanager
+    def stage(self, name):
+        """Times the body of a with statement as one call of a stage."""
+        self._own()
+        now = time.perf_counter(), time.process_time()
+        if self._stack:
+            self._charge(self._stack[-1], now, calls=0)
+        self._stack.append([name, *now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter(), time.process_time()
+            self._charge(self._stack.pop(), now, calls=1)
+            if self._stack:
+                # The outer stage resumes from here
+                self._stack[-1][1:] = now
+            elif self._pid != self._parent_pid and self._spool is not None:
+                self._write_spool()
+
+    def _charge(self, frame, now, calls):
+        name, wall, cpu = frame
+        self.add(name, now[0] - wall, now[1] - cpu, calls)
+        frame[1:] = now
+
+    def timed(self, function, name):
+        """
+        Returns a wrapper around function that times every call as a stage. Calls to
+        a generator function are timed across every step of the generator, leaving out
+        the time its consumer spends between steps.
+        """
+        if inspect.isgeneratorfunction(function):
+            @wraps(function)
+            def timed_generator(*args, **kwargs):
+                return self.iter_stage(name, function(*args, **kwargs))
+            return timed_generator
+
+        @wraps(function)
+        def timed_function(*args, **kwargs):
+            with self.stage(name):
+                return function(*args, **kwargs)
+        return timed_function
+
+    def iter_stage(self, name, iterable):
+        """Yields from iterable, timing the production of each item as a stage."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def _write_spool(self):
+        path = os.path.join(self._spool, f"{self._pid}.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump({"stages": self.stages, "ephem_calls": self.ephem_calls}, f)
+        os.replace(path + ".tmp", path)
+
+    def report(self):
+        """
+        Returns the figures recorded so far, including those of forked children.
+
+        Returns:
+            dict: {"wall_s", "cpu_s"} since recording started, "stages" with the
+                  "wall_s", "cpu_s" and "calls" of each stage, and "ephem_calls"
+                  with the number of each kind of pyephem call
+        """
+        stages = {name: list(totals) for name, totals in self.stages.items()}
+        ephem_calls = dict(self.ephem_calls)
+        if self._spool is not None and os.path.isdir(self._spool):
+            for entry in sorted(os.listdir(self._spool)):
+                if not entry.endswith(".json"):
+                    continue
+                with open(os.path.join(self._spool, entry)) as f:
+                    child = json.load(f)
+                for name, totals in child["stages"].items():
+                    stages[name] = [a + b for a, b in zip(stages.get(name, [0.0, 0.0, 0]), totals)]
+                for name, calls in child["ephem_calls"].items():
+                    ephem_calls[name] = ephem_calls.get(name, 0) + calls
+
+        wall, cpu = self.started
+        return {
+            "wall_s": round(time.perf_counter() - wall, 6),
+            "cpu_s": round(time.process_time() - cpu, 6),
+            "stages": {
+                name: {"wall_s": round(wall_s, 6), "cpu_s": round(cpu_s, 6), "calls": calls}
+                for name, (wall_s, cpu_s, calls) in stages.items()
+            },
+            "ephem_calls": dict(sorted(ephem_calls.items())),
+        }
+
+
+@contextmanager
+def record(targets=()):
+    """
+    Records stage timings and pyephem calls for the duration of a with statement.
+
+    Each target is (owner, attribute, stage): the function owner.attribute (a
+    module function or a method) is replaced by one timing its calls as the stage,
+    and put back afterwards. pyephem's Observer, Sun and Moon and its new moon
+    searches are likewise replaced by counting versions. Nothing is replaced outside
+    the with statement, so code that isn't being recorded runs untouched.
+
+    Args:
+        targets: (owner, attribute, stage) tuples
+
+    Yields:
+        Timings: The figures being recorded
+    """
+    global _current
+    spool = tempfile.mkdtemp(prefix="uplook-timings-")
+    timings = Timings(spool)
+    previous = _current
+    # Saved as stored, so that e.g. a staticmethod goes back as a staticmethod
+    patches = [(owner, attribute, inspect.getattr_static(owner, attribute)) for owner, attribute, _ in targets]
+    patches += [(ephem, name, getattr(ephem, name)) for name in ('Observer', 'Sun', 'Moon', *_EPHEM_FUNCTIONS)]
+    try:
+        for (owner, attribute, stage), (_, _, stored) in zip(targets, patches):
+            if isinstance(stored, (staticmethod, classmethod)):
+                setattr(owner, attribute, type(stored)(timings.timed(stored.__func__, stage)))
+            else:
+                setattr(owner, attribute, timings.timed(stored, stage))
+        ephem.Observer, ephem.Sun, ephem.Moon = _CountedObserver, _CountedSun, _CountedMoon
+        for name in _EPHEM_FUNCTIONS:
+            setattr(ephem, name, _counted(getattr(ephem, name), name))
+        _current = timings
+        yield timings
+    finally:
+        _current = previous
+        for owner, attribute, original in reversed(patches):
+            setattr(owner, attribute, original)
+        # The report has to be taken inside the with statement to include children
+        shutil.rmtree(spool, ignore_errors=True)
+        timings._spool = None
+
+
+def _count(name):
+    if _current is not None:
+        _current.count(name)
+
+
+def _counted(function, name):
+    @wraps(function)
+    def counted(*args, **kwargs):
+        _count(name)
+        return function(*args, **kwargs)
+    return counted
+
+
+class _CountedObserver(ephem.Observer):
+    def __init__(self, *args, **kwargs):
+        _count('Observer')
+        super().__init__(*args, **kwargs)
+
+
+for _name in _OBSERVER_SEARCHES:
+    setattr(_CountedObserver, _name, _counted(getattr(ephem.Observer, _name), f"Observer.{_name}"))
+
+
+class _CountedSun(ephem.Sun):
+    def __init__(self, *args, **kwargs):
+        _count('Sun')
+        super().__init__(*args, **kwargs)
+
+    def compute(self, *args, **kwargs):
+        _count('Sun.compute')
+        return super().compute(*args, **kwargs)
+
+
+class _CountedMoon(ephem.Moon):
+    def __init__(self, *args, **kwargs):
+        _count('Moon')
+        super().__init__(*args, **kwargs)
+
+    def compute(self, *args, **kwargs):
+        _count('Moon.compute')
+        return super().compute(*args, **kwargs)
@@ -1,27 +1,74 @@
 import argparse
+import json
+import os
+import re
+import sys
+import time
 from datetime import datetime, UTC
-from solar.elevation import calculate_daily_solar_profile, calculate_daily_solar_summary
-from solar.chart import get_solar_chart
-from solar.summary import get_solar_summary
-from solar.table import get_solar_table
-from lunar.phase import get_moon_phase
-from lunar.summary import get_lunar_summary
-from lunar.image import get_lunar_phase
-
-def print_lines(lines):
+
+if not __package__:
+    # Run as a script: import the uplook package from the directory above, rather
+    # than this directory, where 'uplook' would be this file
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from uplook.export import FORMATS
+
+# The solar, lunar, cache, export, service and timing modules are imported by the
+# functions that use them, so that each run only loads what its subcommand and
+# output type need: a one-shot lunar summary never imports the solar modules,
+# asyncio or the process pool. test_startup.py checks this.
+
+# Output is written in blocks of about this many characters
+_WRITE_BLOCK = 64 * 1024
+# Buffered output is written at least this often (seconds), so slow runs still show progress
+_WRITE_DELAY = 0.2
+
+def print_lines(lines, stream=None):
+    """
+    Writes lines as they are generated, grouped into large blocks rather than one
+    write per line. The first line is written straight away, so output starts as
+    soon as it is available.
+    """
+    stream = stream or sys.stdout
+    block = []
+    size = 0
+    last_write = None
     for line in lines:
-        print(line)
+        block.append(line)
+        size += len(line) + 1
+        now = time.monotonic()
+        if last_write is None or size >= _WRITE_BLOCK or now - last_write >= _WRITE_DELAY:
+            stream.write("\n".join(block) + "\n")
+            stream.flush()
+            block = []
+            size = 0
+            last_write = now
+    if block:
+        stream.write("\n".join(block) + "\n")
+        stream.flush()
+
+class QueryError(ValueError):
+    """Raised for a service query that the command line would reject."""
 
-def setup_arg_parser():
+class QueryArgumentParser(argparse.ArgumentParser):
     """
-    Sets up the argument parser with 'solar' and 'lunar' subparsers
+    An argument parser that raises QueryError instead of exiting, naming options
+    as query fields ('lon' rather than '--lon')
+    """
+    def error(self, message):
+        raise QueryError(re.sub(r"(?<![\w-])--(?=\w)", "", message))
+
+def setup_arg_parser(parser_class=argparse.ArgumentParser, command=None):
+    """
+    Sets up the argument parser with 'solar', 'lunar' and 'serve' subparsers, or
+    only the subparser for command if one is given
     """
     # 1. Main Parser Setup
-    parser = argparse.ArgumentParser(
+    parser = parser_class(
         description="Calculate and output solar and/or lunar data"
     )
 
-    # Arguments common to both solar and lunar commands (only --date is common)
+    # Arguments common to both solar and lunar commands (the date or date range)
     common_parser = argparse.ArgumentParser(add_help=False)
     common_parser.add_argument(
         '--date',
@@ -29,120 +76,779 @@ def setup_arg_parser():
         default=None,
         help="Optional: Date in YYYY-MM-DD format. Defaults to today's UTC date."
     )
-
-    # 2. Subparser Initialization
-    subparsers = parser.add_subparsers(
-        dest='command',
-        required=True,
-        help='The subcommand to run (solar or lunar)'
-    )
-
-    # 3. Solar Subparser
-    solar_parser = subparsers.add_parser(
-        'solar',
-        parents=[common_parser],  # Inherit --date
-        help='Calculate and output hourly solar elevation data.'
-    )
-    # --- Location is REQUIRED for Solar calculations ---
-    solar_parser.add_argument(
-        '--lon',
-        type=float,
-        required=True,
-        help="The longitude of the location in decimal degrees (e.g., -0.12)."
-    )
-    solar_parser.add_argument(
-        '--lat',
-        type=float,
-        required=True,
-        help="The latitude of the location in decimal degrees (e.g., 51.51)."
-    )
-    # --- Solar Output Configuration ---
-    solar_parser.add_argument(
-        '--type',
+    common_parser.add_argument(
+        '--start',
         type=str,
-        required=False,
-        default='summary',
-        choices=['chart', 'summary', 'table'],
-        help='Output type, one of: chart, table or summary'
+        default=None,
+        help="Optional: First date of a date range in YYYY-MM-DD format (requires --end)."
     )
-    solar_parser.add_argument(
-        '--rows',
-        type=int,
-        default=5,
-        help="The vertical height of the chart in rows (default: 5)."
+    common_parser.add_argument(
+        '--end',
+        type=str,
+        default=None,
+        help="Optional: Last date of a date range in YYYY-MM-DD format (requires --start)."
     )
-    solar_parser.add_argument(
-        '--data-char',
+    common_parser.add_argument(
+        '--format',
         type=str,
-        default='.',
-        help="The character used to mark the sun's position (default: '.')."
+        default='text',
+        choices=['text', *FORMATS],
+        help="Output format, one of: text, csv, json, npy, npz (default: 'text'). The machine formats "
+             "write full precision columns instead of the rendered output."
     )
-    solar_parser.add_argument(
-        '--current-char',
+    common_parser.add_argument(
+        '--output',
         type=str,
-        default='O',
-        help="The character used to mark the current hour (default: 'O')."
+        default='-',
+        help="File to write to, or '-' for stdout (default: '-')."
     )
 
-    # 4. Lunar Subparser
-    lunar_parser = subparsers.add_parser(
-        'lunar',
-        parents=[common_parser],  # Inherit --date
-        help='Calculate and output the Moon phase for a given date.'
-    )
-    # --- Lunar Output Configuration ---
-    lunar_parser.add_argument(
-        '--type',
+    # Result cache and timing arguments, shared by every command
+    cache_parser = argparse.ArgumentParser(add_help=False)
+    cache_parser.add_argument(
+        '--cache-dir',
         type=str,
-        required=False,
-        default='summary',
-        choices=['image', 'summary', 'combined'],
-        help='Output type, one of: image, summary, combined'
+        default=os.environ.get('UPLOOK_CACHE_DIR'),
+        help="Optional: Directory for a persistent result cache (default: $UPLOOK_CACHE_DIR, or no cache)."
     )
-    lunar_parser.add_argument(
-        '--char',
-        type=str,
-        default='#',
-        help="The character used for the moon image (default: '#')."
+    cache_parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=100000,
+        help="Maximum number of results kept in the cache (default: 100000)."
+    )
+    cache_parser.add_argument(
+        '--cache-precision',
+        type=int,
+        default=4,
+        help="Decimal places longitude and latitude are rounded to in cache keys; closer sites share results (default: 4)."
+    )
+    cache_parser.add_argument(
+        '--memory-cache-size',
+        type=int,
+        default=0,
+        help="Maximum number of results kept in an in-memory cache, in front of any --cache-dir cache (default: 0, no memory cache)."
+    )
+    cache_parser.add_argument(
+        '--memory-cache-mb',
+        type=float,
+        default=64,
+        help="Maximum estimated size of the in-memory cache in megabytes (default: 64)."
+    )
+    cache_parser.add_argument(
+        '--cache-stats',
+        action='store_true',
+        help="Write cache hit/miss statistics to stderr as JSON."
+    )
+    cache_parser.add_argument(
+        '--timings',
+        action='store_true',
+        help="Write the wall and CPU time of each stage, and the number of pyephem calls, to stderr as JSON."
     )
 
+    # 2. Subparser Initialization
+    subparsers = parser.add_subparsers(
+        dest='command',
+        required=True,
+        help='The subcommand to run (solar, lunar or serve)'
+    )
+
+    # 3. Solar Subparser
+    if command in (None, 'solar'):
+        solar_parser = subparsers.add_parser(
+            'solar',
+            parents=[common_parser, cache_parser],  # Inherit --date and the cache options
+            help='Calculate and output hourly solar elevation data.'
+        )
+        # --- Location is REQUIRED for Solar calculations (either --lon/--lat or --sites) ---
+        solar_parser.add_argument(
+            '--lon',
+            type=float,
+            help="The longitude of the location in decimal degrees (e.g., -0.12)."
+        )
+        solar_parser.add_argument(
+            '--lat',
+            type=float,
+            help="The latitude of the location in decimal degrees (e.g., 51.51)."
+        )
+        solar_parser.add_argument(
+            '--sites',
+            type=str,
+            default=None,
+            help="Optional: CSV (lon,lat header) or JSON-lines file of sites to process in one run, or '-' for stdin."
+        )
+        solar_parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help="Number of worker processes used with --sites (default: CPU count)."
+        )
+        solar_parser.add_argument(
+            '--checkpoint',
+            type=str,
+            default=None,
+            help="Optional: File recording the progress of --sites with --start/--end, so an interrupted run resumes where it stopped."
+        )
+        # --- Solar Output Configuration ---
+        solar_parser.add_argument(
+            '--type',
+            type=str,
+            required=False,
+            default='summary',
+            choices=['chart', 'heatmap', 'map', 'summary', 'table'],
+            help='Output type, one of: chart, heatmap, map, table or summary'
+        )
+        solar_parser.add_argument(
+            '--rows',
+            type=int,
+            default=5,
+            help="The vertical height of the chart in rows (default: 5)."
+        )
+        solar_parser.add_argument(
+            '--data-char',
+            type=str,
+            default='.',
+            help="The character used to mark the sun's position (default: '.')."
+        )
+        solar_parser.add_argument(
+            '--current-char',
+            type=str,
+            default='O',
+            help="The character used to mark the current hour (default: 'O')."
+        )
+        solar_parser.add_argument(
+            '--time',
+            type=str,
+            default=None,
+            help="UTC time for --type map, in HH:MM format (default: now)."
+        )
+        solar_parser.add_argument(
+            '--resolution',
+            type=float,
+            default=5.0,
+            help="Degrees of longitude per column of --type map; each row covers twice as much latitude (default: 5)."
+        )
+        solar_parser.add_argument(
+            '--width',
+            type=int,
+            default=73,
+            help="Width in characters of the --type chart plot, or number of columns in --type heatmap (default: 73)."
+        )
+        solar_parser.add_argument(
+            '--watch',
+            action='store_true',
+            help="Keep --type chart on screen, moving the current time marker every minute and following the UTC date, until interrupted."
+        )
+        solar_parser.add_argument(
+            '--engine',
+            type=str,
+            default='ephem',
+            choices=['ephem', 'noaa', 'numpy'],
+            help="Engine used for the elevation profile, one of: ephem, noaa, numpy (default: 'ephem')."
+        )
+        solar_parser.add_argument(
+            '--interval',
+            type=int,
+            default=60,
+            help="Minutes between elevation profile samples, e.g. 1 for a per-minute profile (default: 60)."
+        )
+
+    # 4. Lunar Subparser
+    if command in (None, 'lunar'):
+        lunar_parser = subparsers.add_parser(
+            'lunar',
+            parents=[common_parser, cache_parser],  # Inherit --date and the cache options
+            help='Calculate and output the Moon phase for a given date.'
+        )
+        # --- Lunar Output Configuration ---
+        lunar_parser.add_argument(
+            '--type',
+            type=str,
+            required=False,
+            default='summary',
+            choices=['image', 'summary', 'combined'],
+            help='Output type, one of: image, summary, combined'
+        )
+        lunar_parser.add_argument(
+            '--char',
+            type=str,
+            default='#',
+            help="The character used for the moon image (default: '#')."
+        )
+
+    # 5. Serve Subparser
+    if command in (None, 'serve'):
+        serve_parser = subparsers.add_parser(
+            'serve',
+            parents=[cache_parser],
+            help='Serve solar and lunar queries over HTTP/JSON on localhost, or as JSON lines on stdin/stdout.'
+        )
+        serve_parser.add_argument(
+            '--stdio',
+            action='store_true',
+            help="Read one JSON query per line on stdin and write one JSON response per line on stdout, instead of serving HTTP."
+        )
+        serve_parser.add_argument(
+            '--host',
+            type=str,
+            default='127.0.0.1',
+            help="The address to listen on (default: 127.0.0.1)."
+        )
+        serve_parser.add_argument(
+            '--port',
+            type=int,
+            default=8765,
+            help="The port to listen on (default: 8765)."
+        )
+        serve_parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help="Number of worker processes (default: CPU count)."
+        )
+        serve_parser.add_argument(
+            '--max-concurrency',
+            type=int,
+            default=None,
+            help="Maximum number of queries running at once (default: the number of workers)."
+        )
+        serve_parser.add_argument(
+            '--max-queue',
+            type=int,
+            default=100,
+            help="Maximum number of queries waiting to run before new ones are rejected (default: 100)."
+        )
+
     return parser
 
-def main():
-    parser = setup_arg_parser()
-    args = parser.parse_args()
+def render_solar(args, solar_day):
+    """
+    Generates the solar output for one site in the requested output type
+    """
+    from uplook.solar.summary import get_solar_summary
+    yield from get_solar_summary(solar_day)
+    match args.type:
+        case 'chart':
+            from uplook.solar.chart import iter_solar_chart
+            yield from iter_solar_chart(solar_day, args.rows, args.data_char, args.current_char, width=args.width)
+        case 'table':
+            from uplook.solar.table import iter_solar_table
+            yield from iter_solar_table(solar_day)
+
+def render_lunar(args, phase_name, fraction, date_used):
+    """
+    Generates the lunar output for one date in the requested output type
+    """
+    from uplook.lunar.image import get_lunar_phase
+    from uplook.lunar.summary import get_lunar_summary
+    match args.type:
+        case 'image':
+            yield from get_lunar_phase(phase_name, char=args.char)
+        case 'summary':
+            yield from get_lunar_summary(phase_name, fraction, date_used)
+        case 'combined':
+            yield from get_lunar_summary(phase_name, fraction, date_used)
+            yield from get_lunar_phase(phase_name, char=args.char)
+
+def load_sites(path):
+    from uplook.solar.batch import read_sites
+    if path == '-':
+        return read_sites(sys.stdin)
+    with open(path, newline='') as f:
+        return read_sites(f)
+
+def cached(cache, kind, compute, *args):
+    """
+    Calls compute(*args), going through the result cache when one is in use
+    """
+    if cache is None:
+        return compute(*args)
+    return cache.get_or_compute(kind, compute, *args)
+
+def validate_args(parser, args):
+    """
+    Checks the combinations of solar and lunar arguments that argparse can't
+    """
+    # Service queries can't use --sites, so their errors don't offer it
+    sites_or = "" if isinstance(parser, QueryArgumentParser) else "--sites or "
+    if args.command == 'solar' and args.type == 'map':
+        if args.sites is not None or args.start is not None:
+            parser.error(f"--type map cannot be combined with {sites_or}--start/--end")
+        if args.time is not None and not _is_time(args.time):
+            parser.error("--time must be in HH:MM format")
+        if not 0.1 <= args.resolution <= 30:
+            parser.error("--resolution must be between 0.1 and 30 degrees")
+    elif args.command == 'solar' and args.type == 'heatmap' and (args.sites is not None or args.start is not None):
+        parser.error(f"--type heatmap cannot be combined with {sites_or}--start/--end")
+    elif args.command == 'solar' and args.sites is None and (args.lon is None or args.lat is None):
+        if isinstance(parser, QueryArgumentParser):
+            parser.error("solar requires --lon and --lat")
+        parser.error("solar requires either --lon and --lat, or --sites")
+    if (args.start is None) != (args.end is None):
+        parser.error("--start and --end must be used together")
+    if args.start is not None:
+        start, end = _parse_date(args.start), _parse_date(args.end)
+        if start is None or end is None:
+            parser.error("--start and --end must be dates in YYYY-MM-DD format")
+        if start > end:
+            parser.error("--start must not be after --end")
+    if args.command == 'solar' and args.checkpoint is not None and (args.sites is None or args.start is None):
+        parser.error("--checkpoint requires --sites and --start/--end")
+    if args.command == 'solar' and args.watch:
+        if args.type != 'chart' or args.sites is not None or args.start is not None:
+            parser.error("--watch requires --type chart with --lon and --lat")
+        if args.date is not None:
+            parser.error("--watch always shows the current UTC date, so cannot be combined with --date")
+        if args.format != 'text' or args.output != '-':
+            parser.error("--watch draws on the terminal, so cannot be combined with --format or --output")
+    if args.command == 'solar' and args.sites is not None and (args.lon is not None or args.lat is not None):
+        parser.error("--lon/--lat cannot be combined with --sites")
+    if args.command == 'solar' and not 1 <= args.interval <= 1440:
+        parser.error("--interval must be between 1 and 1440 minutes")
+    if args.command == 'solar' and args.width < 1:
+        parser.error("--width must be at least 1")
+
+def validate_cache_args(parser, args):
+    """
+    Checks the cache options, shared by every command
+    """
+    if not 0 <= args.cache_precision <= 10:
+        parser.error("--cache-precision must be between 0 and 10 decimal places")
+    if args.memory_cache_size < 0:
+        parser.error("--memory-cache-size must not be negative")
+    if args.memory_cache_mb <= 0:
+        parser.error("--memory-cache-mb must be positive")
+
+def _parse_date(date_str):
+    try:
+        return datetime.strptime(date_str.replace('/', '-'), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+def _is_time(time_str):
+    try:
+        datetime.strptime(time_str, "%H:%M")
+    except ValueError:
+        return False
+    return True
 
+def get_time_used(args):
+    if args.time is None:
+        return datetime.now(UTC).strftime("%H:%M")
+    return args.time
+
+def _year_of(date_str):
+    return int(date_str.replace('/', '-').split('-')[0])
+
+def get_date_used(args):
     if args.date is None:
         today_utc = datetime.now(UTC)
-        date_used = today_utc.strftime("%Y-%m-%d")
+        return today_utc.strftime("%Y-%m-%d")
+    return args.date
+
+def timed_stages():
+    """
+    Returns the functions timed by --timings, as (owner, attribute, stage) targets
+    for timings.record. Map and heatmap output is computed and rendered in one go, so
+    it all counts as render.
+    """
+    # The functions are replaced in their own modules, which works because their
+    # callers here import them at the time of the call
+    from uplook.lunar import phase
+    from uplook.solar import daterange
+    from uplook.solar.context import SolarDay
+    return [
+        (SolarDay, '_compute_profile', 'compute profile'),
+        (SolarDay, '_compute_events', 'compute summary'),
+        (daterange, 'calculate_solar_summary_range', 'compute summary'),
+        (daterange, 'calculate_solar_events_range', 'compute summary'),
+        (phase, 'get_moon_phase', 'moon phase'),
+        (phase, 'previous_new_moon', 'previous new moon'),
+    ]
+
+def main():
+    started = time.perf_counter(), time.process_time()
+    # Only the chosen subcommand's options are set up, unless there isn't one yet
+    # (e.g. for --help)
+    command = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] in ('solar', 'lunar', 'serve') else None
+    parser = setup_arg_parser(command=command)
+    args = parser.parse_args()
+
+    validate_cache_args(parser, args)
+    if args.command == 'serve':
+        run_service(args)
+        return
+
+    validate_args(parser, args)
+    if args.timings:
+        parsed = time.perf_counter() - started[0], time.process_time() - started[1]
+        from uplook import timings
+        with timings.record(timed_stages()) as recorded:
+            recorded.started = started
+            recorded.add('parse', *parsed)
+            try:
+                run(parser, args, recorded)
+            finally:
+                print(json.dumps(recorded.report()), file=sys.stderr)
     else:
-        date_used = args.date
+        run(parser, args)
+
+def run(parser, args, recorded=None):
+    """
+    Runs a solar or lunar command, timing its output as the render stage when
+    recorded (a timings.Timings) is given
+    """
+    date_used = get_date_used(args)
+
+    sites = None
+    if args.command == 'solar' and args.sites is not None:
+        from uplook.solar.batch import SiteError
+        try:
+            sites = load_sites(args.sites)
+        except (SiteError, OSError) as e:
+            parser.error(f"--sites {args.sites}: {e}")
+
+    cache = open_cache(args)
+    checkpoint_error = ()
+    if args.command == 'solar' and args.checkpoint is not None:
+        from uplook.executor import CheckpointError as checkpoint_error
+    try:
+        if args.command == 'solar' and args.watch:
+            watch_chart(args, cache)
+        elif args.format == 'text':
+            lines = generate_lines(args, date_used, cache, sites)
+            print_lines(lines if recorded is None else recorded.iter_stage('render', lines))
+        elif recorded is None:
+            from uplook.export import write_table
+            write_table(args.output, generate_columns(args, date_used, cache, sites), args.format)
+        else:
+            from uplook.export import write_table
+            with recorded.stage('render'):
+                write_table(args.output, generate_columns(args, date_used, cache, sites), args.format)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head): stop quietly, and point stdout
+        # at devnull so that the interpreter's final flush doesn't fail again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    except checkpoint_error as e:
+        parser.error(f"--checkpoint {e}")
+    except KeyboardInterrupt:
+        if not checkpoint_error:
+            raise
+        print(f"Interrupted: run the same command again to resume from {args.checkpoint}", file=sys.stderr)
+        sys.exit(130)
+    else:
+        if checkpoint_error:
+            # Everything was written, so there is nothing left to resume
+            os.remove(args.checkpoint)
+    finally:
+        if cache is not None:
+            if args.cache_stats:
+                print(json.dumps(cache.stats()), file=sys.stderr)
+            cache.close()
+
+def watch_chart(args, cache):
+    """
+    Keeps the chart on screen, redrawing the cells that change every minute, until
+    interrupted (--watch)
+    """
+    from uplook.solar.context import SolarDay
+    from uplook.solar.watch import watch_solar_chart
 
-    if (args.command == 'lunar'):
+    def make_day(date_str):
+        return SolarDay(args.lon, args.lat, date_str, engine=args.engine, interval=args.interval, cache=cache)
+
+    try:
+        watch_solar_chart(make_day, args.rows, args.data_char, args.current_char, args.width)
+    except KeyboardInterrupt:
+        pass
+
+def open_cache(args, autocommit=False):
+    """
+    Opens the result caches asked for by the cache options: a ResultCache with
+    --cache-dir, behind a MemoryCache with --memory-cache-size.
+
+    Returns:
+        The cache to go through, or None if there is none
+    """
+    cache = None
+    if args.cache_dir is not None:
+        from uplook.cache import ResultCache
+        cache = ResultCache(args.cache_dir, max_entries=args.cache_size, precision=args.cache_precision, autocommit=autocommit)
+    if args.memory_cache_size > 0:
+        from uplook.cache import MemoryCache
+        cache = MemoryCache(
+            args.memory_cache_size, int(args.memory_cache_mb * 2**20), precision=args.cache_precision, backing=cache
+        )
+    return cache
+
+def generate_lines(args, date_used, cache, sites=None):
+    """
+    Generates the output lines for a solar or lunar command. sites is the list
+    already read from --sites, if given.
+    """
+    if (args.command == 'lunar') and args.start is not None:
+        # Render a phase calendar, one row per day, from a single lunation table
+        from uplook.lunar.phase import build_lunation_table, get_moon_phase
+        from uplook.lunar.summary import get_lunar_calendar_header, get_lunar_calendar_row, get_lunar_calendar_footer
+        from uplook.solar.daterange import iter_dates
+        dates = list(iter_dates(args.start, args.end))
+        yield from get_lunar_calendar_header(args.start, args.end)
+        if dates:
+            lunations = build_lunation_table(dates[0], dates[-1])
+            for day in dates:
+                phase_name, fraction = get_moon_phase(day, lunations)
+                yield from get_lunar_calendar_row(phase_name, fraction, day)
+        yield from get_lunar_calendar_footer()
+
+    elif (args.command == 'lunar'):
         # Render lunar data
-        phase_name, fraction = get_moon_phase(date_used)
-        lunar_lines = []
-        match args.type:
-            case 'image':
-                lunar_lines = get_lunar_phase(phase_name, char=args.char)
-            case 'summary':
-                lunar_lines = get_lunar_summary(phase_name, fraction, date_used)
-            case 'combined':
-                lunar_lines = get_lunar_summary(phase_name, fraction, date_used)
-                lunar_lines = lunar_lines + get_lunar_phase(phase_name, char=args.char)
-        print_lines(lunar_lines)
+        from uplook.lunar.phase import get_moon_phase
+        phase_name, fraction = cached(cache, 'phase', get_moon_phase, date_used)
+        yield from render_lunar(args, phase_name, fraction, date_used)
 
     elif (args.command == 'solar'):
-        # Render solar data
-        daily_profile = calculate_daily_solar_profile(args.lon, args.lat, date_used)
-        daily_summary = calculate_daily_solar_summary(args.lon, args.lat, date_used)
-        solar_summary_output = get_solar_summary(daily_summary, args.lon, args.lat, date_used)
-        match args.type:
-            case 'chart':
-                solar_summary_output = solar_summary_output + get_solar_chart(daily_profile, args.rows, args.data_char, args.current_char)
-            case 'table':
-                solar_summary_output = solar_summary_output + get_solar_table(daily_profile)
-        print_lines(solar_summary_output)
+        if args.type == 'map':
+            # Imported here so that the other solar output never loads numpy
+            from uplook.solar.worldmap import iter_solar_map
+            yield from iter_solar_map(date_used, get_time_used(args), args.resolution, args.current_char)
+            return
+
+        if args.type == 'heatmap':
+            from uplook.solar.heatmap import iter_solar_heatmap
+            yield from iter_solar_heatmap(args.lon, args.lat, _year_of(date_used), args.interval, args.width)
+            return
+
+        from uplook.solar.context import SolarDay
+
+        if args.sites is not None and args.start is not None:
+            # Stream a table of solar events per site, each day's row in date order
+            from itertools import islice
+            from uplook.solar.batch import calculate_sites_range
+            from uplook.solar.daterange import iter_dates
+            from uplook.solar.elevation import format_events
+            from uplook.solar.polar import NORMAL, classify_date
+            from uplook.solar.summary import get_solar_summary_range_header, get_solar_summary_range_row, get_solar_summary_range_footer
+            days = sum(1 for _ in iter_dates(args.start, args.end))
+            results = calculate_sites_range(sites, args.start, args.end, workers=args.workers, checkpoint=args.checkpoint)
+            for lon, lat in sites:
+                yield from get_solar_summary_range_header(lon, lat, args.start, args.end)
+                for _, _, day, events in islice(results, days):
+                    state = classify_date(lat, day) if not events else NORMAL
+                    yield from get_solar_summary_range_row(day, format_events(events), state)
+                yield from get_solar_summary_range_footer()
+            return
+
+        if args.sites is not None:
+            # Render solar data for every site, in input order
+            from uplook.solar.batch import calculate_sites
+            results = calculate_sites(sites, date_used, engine=args.engine, interval=args.interval, workers=args.workers, cache=cache)
+            for (lon, lat), (daily_summary, daily_profile) in zip(sites, results):
+                solar_day = SolarDay(lon, lat, date_used, engine=args.engine, interval=args.interval, summary=daily_summary, profile=daily_profile)
+                yield from render_solar(args, solar_day)
+            return
+
+        if args.start is not None:
+            # Stream one row of solar events per day in the range
+            from uplook.solar.daterange import calculate_solar_summary_range
+            from uplook.solar.polar import NORMAL, classify_date
+            from uplook.solar.summary import get_solar_summary_range_header, get_solar_summary_range_row, get_solar_summary_range_footer
+            yield from get_solar_summary_range_header(args.lon, args.lat, args.start, args.end)
+            for day, daily_summary in calculate_solar_summary_range(args.lon, args.lat, args.start, args.end):
+                state = classify_date(args.lat, day) if not daily_summary else NORMAL
+                yield from get_solar_summary_range_row(day, daily_summary, state)
+            yield from get_solar_summary_range_footer()
+            return
+
+        # Render solar data, computing only what the output type needs
+        solar_day = SolarDay(args.lon, args.lat, date_used, engine=args.engine, interval=args.interval, cache=cache)
+        yield from render_solar(args, solar_day)
+
+def generate_columns(args, date_used, cache, sites=None):
+    """
+    Builds the full precision export columns for a solar or lunar command: lunar
+    phases, solar event times for --type summary and date ranges, or solar
+    elevation samples for the other solar types.
+    """
+    if args.command == 'lunar':
+        from uplook.lunar.columns import phase_columns
+        from uplook.lunar.phase import build_lunation_table, get_moon_phase
+        from uplook.solar.daterange import iter_dates
+        if args.start is None:
+            phase_name, fraction = cached(cache, 'phase', get_moon_phase, date_used)
+            return phase_columns([(date_used, phase_name, fraction)])
+        dates = list(iter_dates(args.start, args.end))
+        lunations = build_lunation_table(dates[0], dates[-1]) if dates else None
+        return phase_columns((day, *get_moon_phase(day, lunations)) for day in dates)
+
+    from uplook.solar.columns import event_columns, grid_columns, profile_columns
+
+    if args.type == 'map':
+        from uplook.solar.worldmap import solar_elevation_grid
+        return grid_columns(*solar_elevation_grid(date_used, get_time_used(args), args.resolution))
+
+    if args.type == 'heatmap':
+        from uplook.solar.heatmap import heatmap_profiles
+        profiles = heatmap_profiles(args.lon, args.lat, _year_of(date_used), args.interval)
+        return profile_columns((args.lon, args.lat, day, profile) for day, profile in profiles)
+
+    if args.start is not None and sites is not None:
+        from uplook.solar.batch import calculate_sites_range
+        return event_columns(calculate_sites_range(sites, args.start, args.end, workers=args.workers, checkpoint=args.checkpoint))
+
+    if args.start is not None:
+        from uplook.solar.daterange import calculate_solar_events_range
+        events = calculate_solar_events_range(args.lon, args.lat, args.start, args.end)
+        return event_columns((args.lon, args.lat, day, day_events) for day, day_events in events)
+
+    if sites is None:
+        from uplook.solar.context import SolarDay
+        solar_day = SolarDay(args.lon, args.lat, date_used, engine=args.engine, interval=args.interval, precise=True, cache=cache)
+        if args.type == 'summary':
+            return event_columns([(args.lon, args.lat, date_used, solar_day.events)])
+        return profile_columns([(args.lon, args.lat, date_used, solar_day.profile)])
+
+    from uplook.solar.batch import calculate_sites
+    results = calculate_sites(
+        sites, date_used, engine=args.engine, interval=args.interval, workers=args.workers, cache=cache, precise=True
+    )
+    if args.type == 'summary':
+        return event_columns((lon, lat, date_used, events) for (lon, lat), (events, _) in zip(sites, results))
+    return profile_columns((lon, lat, date_used, profile) for (lon, lat), (_, profile) in zip(sites, results))
+
+# Options that only make sense for the process running the service, not per query
+_SERVICE_ONLY_OPTIONS = {
+    'sites', 'workers', 'checkpoint', 'watch', 'cache_dir', 'cache_size', 'cache_precision', 'memory_cache_size', 'memory_cache_mb',
+    'cache_stats', 'timings', 'format', 'output', 'help',
+}
+
+# The result cache(s) of a service worker process, kept warm between queries
+_worker_cache = None
+# Whether a service worker process reports the timings of each query
+_worker_timings = False
+
+def init_worker(cache_args, stdout_to_stderr=False, report_timings=False):
+    """
+    Sets up a service worker process, opening the result caches asked for by the
+    cache options in cache_args (see open_cache).
+    With stdout_to_stderr, anything the calculations print goes to stderr, keeping
+    stdout for responses. With report_timings, the timings of each query are
+    written to stderr as JSON.
+    """
+    global _worker_cache, _worker_timings
+    _worker_timings = report_timings
+    if stdout_to_stderr:
+        sys.stdout = sys.stderr
+    # Workers share the cache file, so commit every result as it is written
+    _worker_cache = open_cache(cache_args, autocommit=True)
+
+def parse_query(query):
+    """
+    Parses a query dict, such as {"command": "solar", "lon": -0.12, "lat": 51.51,
+    "type": "chart"}, with the same rules as the command line.
+
+    Raises:
+        QueryError: If the command line would reject the equivalent arguments
+    """
+    query = dict(query)
+    command = query.pop('command', None)
+    if command not in ('solar', 'lunar'):
+        raise QueryError("command must be 'solar' or 'lunar'")
+
+    argv = [command]
+    for key, value in query.items():
+        option = key.replace('-', '_')
+        if option in _SERVICE_ONLY_OPTIONS:
+            raise QueryError(f"'{key}' is not supported in queries")
+        if value is not None:
+            argv += [f"--{option.replace('_', '-')}", str(value)]
+
+    parser = setup_arg_parser(QueryArgumentParser, command=command)
+    args = parser.parse_args(argv)
+    validate_args(parser, args)
+    return args
+
+def answer_query(query):
+    """
+    Answers one service query with the rendered output lines, plus the underlying
+    results for single-date queries.
+
+    Returns:
+        dict: The response; it has an "error" key if the query was rejected
+    """
+    if not _worker_timings:
+        return _answer_query(query)
+
+    from uplook import timings
+    with timings.record(timed_stages()) as recorded:
+        response = _answer_query(query, recorded)
+        report = recorded.report()
+    print(json.dumps({"query": query, **report}), file=sys.stderr, flush=True)
+    return response
+
+def _answer_query(query, recorded=None):
+    try:
+        if recorded is None:
+            args = parse_query(query)
+        else:
+            with recorded.stage('parse'):
+                args = parse_query(query)
+    except QueryError as e:
+        return {"error": str(e)}
+
+    def render(lines):
+        return list(lines if recorded is None else recorded.iter_stage('render', lines))
+
+    date_used = get_date_used(args)
+    response = {"command": args.command}
+
+    if args.start is None and args.command == 'solar' and args.type not in ('map', 'heatmap'):
+        from uplook.solar.context import SolarDay
+        solar_day = SolarDay(args.lon, args.lat, date_used, engine=args.engine, interval=args.interval, cache=_worker_cache)
+        response["lines"] = render(render_solar(args, solar_day))
+        response["summary"] = solar_day.summary
+        response["state"] = solar_day.state
+        if args.type != 'summary':
+            response["profile"] = list(solar_day.profile)
+    elif args.start is None and args.command == 'lunar':
+        from uplook.lunar.phase import get_moon_phase
+        phase_name, fraction = cached(_worker_cache, 'phase', get_moon_phase, date_used)
+        response["lines"] = render(render_lunar(args, phase_name, fraction, date_used))
+        response["phase"] = phase_name
+        response["fraction"] = fraction
+    else:
+        response["lines"] = render(generate_lines(args, date_used, _worker_cache))
+    return response
+
+def run_service(args):
+    """
+    Runs the HTTP/JSON query service, or the JSON-lines service with --stdio, until
+    interrupted
+    """
+    import asyncio
+    from uplook.serve import QueryService, serve, serve_lines
+
+    service = QueryService(
+        answer_query,
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        max_queue=args.max_queue,
+        initializer=init_worker,
+        initargs=(args, args.stdio, args.timings)
+    )
+
+    def ready(address):
+        print(f"Serving on http://{address[0]}:{address[1]} with {service.workers} workers", file=sys.stderr)
+
+    try:
+        if args.stdio:
+            asyncio.run(serve_lines(service))
+        else:
+            asyncio.run(serve(service, args.host, args.port, ready=ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()